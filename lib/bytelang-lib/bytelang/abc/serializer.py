@@ -1,10 +1,13 @@
+import struct
 from abc import ABC
 from abc import abstractmethod
+from typing import Optional
 from typing import Sequence
 
 from rs.result import Result
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import catch
 
 type _serializable = int | float | str
 type _serializable = Sequence[_serializable] | _serializable
@@ -16,10 +19,27 @@ Serializable = _serializable
 class Serializer[T: Serializable](ABC):
     """Serializer - упаковка, распаковка данных"""
 
-    @abstractmethod
     def read(self, stream: InputStream) -> Result[T, str]:
         """Считать значение из потока"""
+        return catch(self.read_raw, stream)
 
-    @abstractmethod
     def write(self, stream: OutputStream, value: T) -> Result[None, str]:
         """Записать значение в поток"""
+        return catch(self.write_raw, stream, value)
+
+    @abstractmethod
+    def read_raw(self, stream: InputStream) -> T:
+        """Считать значение из потока (BytelangError при ошибке)"""
+
+    @abstractmethod
+    def write_raw(self, stream: OutputStream, value: T) -> None:
+        """Записать значение в поток (BytelangError при ошибке)"""
+
+    def getStructFormat(self) -> Optional[str]:
+        """Формат struct, если значение упаковывается как одно плоское поле фиксированного размера"""
+        return None
+
+    def getStaticSize(self) -> Optional[int]:
+        """Размер упакованного значения, если он не зависит от значения (None - переменный)"""
+        fmt = self.getStructFormat()
+        return None if fmt is None else struct.calcsize(f"<{fmt}")
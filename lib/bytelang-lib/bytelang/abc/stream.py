@@ -1,24 +1,132 @@
+from __future__ import annotations
+
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Buffer
+from contextlib import nullcontext
+from typing import ContextManager
 
 from rs.result import Result
+from bytelang.exceptions import BytelangError
+from bytelang.exceptions import catch
 
 
 class InputStream(ABC):
     """Абстрактный поток ввода (чтения)"""
 
-    @abstractmethod
     def read(self, size: int) -> Result[bytes, str]:
         """Считать данные из потока ввода"""
+        return catch(self.read_raw, size)
+
+    def read_view(self, size: int) -> Result[Buffer, str]:
+        """Считать данные без промежуточной копии (см. read_view_raw)"""
+        return catch(self.read_view_raw, size)
+
+    def readinto(self, buffer: bytearray | memoryview) -> Result[int, str]:
+        """Считать данные в готовый буфер, вернуть количество считанных байт"""
+        return catch(self.readinto_raw, buffer)
+
+    def read_some(self, max_size: int) -> Result[bytes, str]:
+        """Считать от 1 до max_size байт (см. read_some_raw)"""
+        return catch(self.read_some_raw, max_size)
+
+    @abstractmethod
+    def read_raw(self, size: int) -> bytes:
+        """Считать данные из потока ввода (BytelangError при ошибке)"""
+
+    def read_view_raw(self, size: int) -> Buffer:
+        """
+        Считать данные без промежуточной копии, если поток это позволяет.
+        Возвращённый буфер действителен только до следующего чтения из потока.
+        """
+        return self.read_raw(size)
+
+    def readinto_raw(self, buffer: bytearray | memoryview) -> int:
+        """Считать данные в готовый буфер, вернуть количество считанных байт"""
+        data = self.read_raw(len(buffer))
+        size = len(data)
+        memoryview(buffer)[:size] = data
+        return size
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        """
+        Считать от 1 до max_size байт за одно обращение к источнику.
+        Блокируется только пока данных нет совсем.
+        """
+        return self.read_raw(1)
+
+    def available(self) -> int:
+        """Количество байт, которые можно считать без блокировки"""
+        return 0
+
+    def resync(self) -> int:
+        """
+        Восстановить выравнивание после ошибки разбора: для потоков с кадрированием
+        отбрасывает остаток текущего кадра. Возвращает количество отброшенных байт
+        """
+        return 0
+
+    def endFrame(self) -> int:
+        """
+        Отметить конец успешно разобранного сообщения: для потоков с кадрированием
+        отбрасывает неразобранный хвост кадра. Возвращает количество отброшенных байт
+        """
+        return 0
 
 
 class OutputStream(ABC):
     """Абстрактный поток вывода (записи)"""
 
-    @abstractmethod
     def write(self, data: bytes) -> Result[None, str]:
         """Записать данные в поток вывода"""
+        return catch(self.write_raw, data)
+
+    @abstractmethod
+    def write_raw(self, data: bytes) -> None:
+        """Записать данные в поток вывода (BytelangError при ошибке)"""
+
+    def frame(self) -> ContextManager[OutputStream]:
+        """
+        Записать кадр целиком: всё, что записано в возвращённый поток внутри блока,
+        уходит как одна неделимая запись (по умолчанию - прямо в этот поток)
+        """
+        return nullcontext(self)
 
 
 class Stream(InputStream, OutputStream, ABC):
     """Поток ввода-вывода"""
+
+
+class AsyncStream(ABC):
+    """Асинхронный поток ввода-вывода (BytelangError при ошибке)"""
+
+    @abstractmethod
+    async def read_some_raw(self, max_size: int) -> bytes:
+        """Дождаться данных и считать от 1 до max_size байт"""
+
+    @abstractmethod
+    def write_raw(self, data: bytes) -> None:
+        """Поставить данные в очередь на отправку без блокировки (допустим вызов из любого потока)"""
+
+    async def drain(self) -> None:
+        """Дождаться отправки данных, поставленных в очередь"""
+
+    def asStream(self) -> Stream:
+        """Синхронный поток записи поверх асинхронного: для отправителей Protocol"""
+        return _AsyncWriteStream(self)
+
+
+class _AsyncWriteStream(Stream):
+    """Синхронная запись в асинхронный поток; чтение идёт через AsyncProtocol"""
+
+    def __init__(self, stream: AsyncStream) -> None:
+        self._stream = stream
+
+    def read_raw(self, size: int) -> bytes:
+        raise BytelangError(f"{self._stream} is read by AsyncProtocol only")
+
+    def write_raw(self, data: bytes) -> None:
+        self._stream.write_raw(data)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._stream}>"
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Final
+from typing import Optional
+
+from rs.result import Result
+from rs.result import err
+from bytelang.abc.stream import AsyncStream
+from bytelang.abc.stream import InputStream
+from bytelang.core.instruction import Instruction
+from bytelang.core.protocol import Protocol
+from bytelang.exceptions import BytelangError
+
+
+@dataclass(frozen=True)
+class Message:
+    """Декодированное входящее сообщение"""
+
+    instruction: Instruction
+    """Инструкция"""
+    value: Any
+    """Аргументы"""
+
+
+class _FrameInputStream(InputStream):
+    """Строгий поток поверх накопленных байт: нехватка данных отмечается, а не дочитывается"""
+
+    def __init__(self, data: memoryview) -> None:
+        self._view: Final = data
+        self.position = 0
+        """Разобрано байт"""
+        self.exhausted = False
+        """Кадр оборван: данных не хватило"""
+
+    def read_view_raw(self, size: int) -> memoryview:
+        end = self.position + size
+
+        if end > len(self._view):
+            self.exhausted = True
+            raise BytelangError(f"Incomplete frame: need {end} bytes, got {len(self._view)}")
+
+        view = self._view[self.position:end]
+        self.position = end
+        return view
+
+    def read_raw(self, size: int) -> bytes:
+        return bytes(self.read_view_raw(size))
+
+
+class AsyncProtocol:
+    """
+    Асинхронный драйвер протокола.
+
+    Входящие кадры читаются из AsyncStream и декодируются описанием Protocol,
+    созданного поверх stream.asStream(): `async for message in driver`.
+    Отправители Protocol при этом ставят кадры в очередь асинхронного потока.
+    """
+
+    def __init__(self, protocol: Protocol, stream: AsyncStream, chunk_size: int = 4096) -> None:
+        self._protocol: Final = protocol
+        self._stream: Final = stream
+        self._chunk_size: Final = chunk_size
+        self._data = bytearray()
+        """Накопленные байты: разобранное удаляется из начала, новое дописывается в конец без копии остатка"""
+        self._offset = 0
+        """Начало неразобранных данных"""
+
+    def __aiter__(self) -> AsyncProtocol:
+        return self
+
+    async def __anext__(self) -> Message:
+        """
+        Дождаться и декодировать следующий кадр.
+        При ошибке декодирования разобранные байты отбрасываются и поднимается BytelangError,
+        после чего итерацию можно продолжить.
+        """
+        while True:
+            message = self._tryDecode()
+
+            if message is not None:
+                return message
+
+            self._append(await self._stream.read_some_raw(self._chunk_size))
+
+    def _append(self, chunk: bytes) -> None:
+        """Отбросить разобранные байты и дописать принятые"""
+        try:
+            if self._offset > 0:
+                del self._data[:self._offset]
+
+            self._data += chunk
+
+        except BufferError:
+            # Срез буфера ещё жив (например, в трассировке ошибки разбора) - размер менять нельзя, нужна копия
+            self._data = self._data[self._offset:] + chunk
+
+        self._offset = 0
+
+    def _tryDecode(self) -> Optional[Message]:
+        if self._offset >= len(self._data):
+            return None
+
+        stream = _FrameInputStream(memoryview(self._data)[self._offset:])
+        metrics = self._protocol.getMetrics()
+        timed = metrics.timings
+        start = perf_counter() if timed else 0.0
+
+        try:
+            instruction, value = self._protocol.decode_raw(stream)
+
+        except BytelangError:
+            if stream.exhausted:
+                return None
+
+            self._offset += max(stream.position, 1)
+            raise
+
+        metrics.getRecorder(instruction.getMetricName()).recordReceive(
+            stream.position,
+            perf_counter() - start if timed else None
+        )
+
+        self._offset += stream.position
+        return Message(instruction, value)
+
+    def handle(self, message: Message) -> Result[None, str]:
+        """Передать сообщение обработчику протокола"""
+        return self._protocol.handle(message.instruction, message.value)
+
+    async def run(self, on_error: Callable[[str], Any]) -> None:
+        """Бесконечно принимать сообщения и передавать их обработчикам"""
+        while True:
+            try:
+                message = await self.__anext__()
+
+            except BytelangError as e:
+                on_error(str(e))
+                continue
+
+            result = self.handle(message)
+
+            if result.is_err():
+                on_error(result.err().unwrap())
+
+    def awaitable[T](self, sender: Callable[[T], Result[None, str]]) -> Callable[[T], Awaitable[Result[None, str]]]:
+        """Обернуть отправителя Protocol: ожидание завершается, когда кадр передан потоку"""
+
+        async def _wrapper(value: T) -> Result[None, str]:
+            result = sender(value)
+
+            if result.is_err():
+                return result
+
+            try:
+                await self._stream.drain()
+
+            except BytelangError as e:
+                return err(str(e))
+
+            return result
+
+        return _wrapper
@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+# noinspection PyPep8Naming
+from struct import error as StructError
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import ClassVar
+from typing import Final
+from typing import Optional
+
+from bytelang.abc.serializer import Serializer
+from bytelang.abc.stream import InputStream
+from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
+from bytelang.impl.serializer.array_ import ArraySerializer
+from bytelang.impl.serializer.arraystring import ArrayStringSerializer
+from bytelang.impl.serializer.bytevector import ByteVectorSerializer
+from bytelang.impl.serializer.struct_ import StructSerializer
+from bytelang.impl.serializer.vector import VectorSerializer
+from bytelang.impl.serializer.void import VoidSerializer
+from bytelang.impl.stream.byte import ByteViewInputStream
+from bytelang.impl.stream.counting import CountingInputStream
+from bytelang.impl.stream.counting import CountingOutputStream
+
+
+class _Emitter:
+    """Генератор тела функции: строки кода, локальные имена и константы пространства имён"""
+
+    def __init__(self, sized: bool = False) -> None:
+        self.sized: Final = sized
+        """Считать прочитанные байты в локальной size"""
+        self.lines: Final = list[str]()
+        self.namespace: Final = dict[str, Any](
+            BytelangError=BytelangError,
+            StructError=StructError,
+            CountingInputStream=CountingInputStream,
+            CountingOutputStream=CountingOutputStream,
+            ByteViewInputStream=ByteViewInputStream,
+            _pack=struct.pack,
+        )
+        self._indent = 1
+        self._counter = 0
+
+    def emit(self, line: str) -> None:
+        """Добавить строку с текущим отступом"""
+        self.lines.append("    " * self._indent + line)
+
+    def indent(self, delta: int) -> None:
+        """Изменить отступ"""
+        self._indent += delta
+
+    def local(self, prefix: str) -> str:
+        """Новое локальное имя"""
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def const(self, prefix: str, value: Any) -> str:
+        """Вынести значение в пространство имён функции"""
+        name = self.local(f"_{prefix}")
+        self.namespace[name] = value
+        return name
+
+    def struct(self, fmt: str) -> struct.Struct:
+        """Little-endian struct для формата"""
+        return struct.Struct(f"<{fmt}")
+
+    @staticmethod
+    def flatFormats(serializers: tuple[Serializer, ...]) -> Optional[str]:
+        """Общий формат struct, если все сериализаторы плоские"""
+        formats = tuple(s.getStructFormat() for s in serializers)
+
+        if len(formats) == 0 or None in formats:
+            return None
+
+        return "".join(formats)
+
+    # Чтение
+
+    def read(self, serializer: Serializer, target: str) -> None:
+        """Сгенерировать чтение значения в переменную target"""
+        fmt = serializer.getStructFormat()
+
+        if fmt is not None:
+            self.readFlat(fmt, target, single=True)
+            return
+
+        match serializer:
+            case VoidSerializer():
+                self.emit(f"{target} = None")
+
+            case StructSerializer(fields=fields):
+                self.readSequence(tuple(fields), target)
+
+            case ArraySerializer(item=item, length=length):
+                self.readSequence((item,) * length, target)
+
+            case VectorSerializer(item=item, length=length_serializer):
+                length = self.local("n")
+                self.readFlat(length_serializer.getStructFormat(), length, single=True)
+                self.readRepeated(item, length, target)
+
+            case ByteVectorSerializer(length=length_serializer):
+                length = self.local("n")
+                self.readFlat(length_serializer.getStructFormat(), length, single=True)
+                self.emit(f"{target} = stream.read_raw({length})")
+                self.countRead(length)
+
+            case ArrayStringSerializer():
+                self.emit(f"{target} = str(stream.read_view_raw({serializer.getLength()}), 'utf-8').rstrip('\\x00')")
+                self.countRead(serializer.getLength())
+
+            case _:
+                name = self.const("s", serializer)
+
+                if not self.sized:
+                    self.emit(f"{target} = {name}.read_raw(stream)")
+                    return
+
+                counter = self.local("counter")
+                self.emit(f"{counter} = CountingInputStream(stream)")
+                self.emit(f"{target} = {name}.read_raw({counter})")
+                self.countRead(f"{counter}.rx_bytes")
+
+    def countRead(self, size: int | str) -> None:
+        """Учесть прочитанные байты (выражение или число)"""
+        if self.sized:
+            self.emit(f"size += {size}")
+
+    def readFlat(self, fmt: str, target: str, *, single: bool) -> None:
+        """Чтение плоской записи одним вызовом struct"""
+        layout = self.struct(fmt)
+        unpack = self.const("unpack", layout.unpack)
+        call = f"{unpack}(stream.read_view_raw({layout.size}))"
+        self.emit(f"{target} = {call}[0]" if single else f"{target} = list({call})")
+        self.countRead(layout.size)
+
+    def readSequence(self, items: tuple[Serializer, ...], target: str) -> None:
+        """Чтение записи известного состава в список"""
+        fmt = self.flatFormats(items)
+
+        if fmt is not None:
+            self.readFlat(fmt, target, single=False)
+            return
+
+        sizes = tuple(item.getStaticSize() for item in items)
+
+        # Состав без полей переменной длины: одно чтение, разбор из памяти
+        if None not in sizes and sum(sizes) > 0:
+            buffer = self.local("b")
+            self.emit(f"{buffer} = stream.read_view_raw({sum(sizes)})")
+            self.emit(f"if len({buffer}) != {sum(sizes)}:")
+            self.emit(f"    raise BytelangError(f'Short read: expected {sum(sizes)} bytes, got {{len({buffer})}}')")
+            self.countRead(sum(sizes))
+            self.decodeSequence(items, target, buffer, 0)
+            return
+
+        names = tuple(self.local("v") for _ in items)
+
+        for item, name in zip(items, names):
+            self.read(item, name)
+
+        self.emit(f"{target} = [{', '.join(names)}]")
+
+    def decode(self, serializer: Serializer, target: str, buffer: str, offset: int) -> None:
+        """Разбор значения статического размера из буфера по известному смещению"""
+        fmt = serializer.getStructFormat()
+
+        if fmt is not None:
+            unpack_from = self.const("unpack_from", self.struct(fmt).unpack_from)
+            self.emit(f"{target} = {unpack_from}({buffer}, {offset})[0]")
+            return
+
+        end = offset + serializer.getStaticSize()
+
+        match serializer:
+            case VoidSerializer():
+                self.emit(f"{target} = None")
+
+            case StructSerializer(fields=fields):
+                self.decodeSequence(tuple(fields), target, buffer, offset)
+
+            case ArraySerializer(item=item, length=length):
+                self.decodeSequence((item,) * length, target, buffer, offset)
+
+            case ArrayStringSerializer():
+                self.emit(f"{target} = str({buffer}[{offset}:{end}], 'utf-8').rstrip('\\x00')")
+
+            case _:
+                name = self.const("s", serializer)
+                self.emit(f"{target} = {name}.read_raw(ByteViewInputStream({buffer}[{offset}:{end}]))")
+
+    def decodeSequence(self, items: tuple[Serializer, ...], target: str, buffer: str, offset: int) -> None:
+        """Разбор записи статического размера из буфера в список"""
+        fmt = self.flatFormats(items)
+
+        if fmt is not None:
+            unpack_from = self.const("unpack_from", self.struct(fmt).unpack_from)
+            self.emit(f"{target} = list({unpack_from}({buffer}, {offset}))")
+            return
+
+        names = tuple(self.local("v") for _ in items)
+
+        for item, name in zip(items, names):
+            self.decode(item, name, buffer, offset)
+            offset += item.getStaticSize()
+
+        self.emit(f"{target} = [{', '.join(names)}]")
+
+    def readRepeated(self, item: Serializer, count: str, target: str) -> None:
+        """Чтение count элементов в список"""
+        fmt = item.getStructFormat()
+
+        if fmt is not None:
+            layout = self.struct(fmt)
+            iter_unpack = self.const("iter_unpack", layout.iter_unpack)
+            self.emit(f"{target} = [x[0] for x in {iter_unpack}(stream.read_view_raw({count} * {layout.size}))]")
+            self.countRead(f"{count} * {layout.size}")
+            return
+
+        value = self.local("v")
+        self.emit(f"{target} = []")
+        self.emit(f"for _ in range({count}):")
+        self.indent(1)
+        self.read(item, value)
+        self.emit(f"{target}.append({value})")
+        self.indent(-1)
+
+    # Запись
+
+    def write(self, serializer: Serializer, value: str) -> None:
+        """Сгенерировать запись значения из переменной value"""
+        fmt = serializer.getStructFormat()
+
+        if fmt is not None:
+            self.writeFlat((serializer,), fmt, (value,))
+            return
+
+        match serializer:
+            case VoidSerializer():
+                pass
+
+            case StructSerializer(fields=fields):
+                self.writeSequence(tuple(fields), value, "Value/fields count mismatch")
+
+            case ArraySerializer(item=item, length=length):
+                self.writeSequence((item,) * length, value, "Array length mismatch")
+
+            case VectorSerializer(item=item, length=length_serializer):
+                self.writeFlat((length_serializer,), length_serializer.getStructFormat(), (f"len({value})",))
+                self.writeRepeated(item, value)
+
+            case ByteVectorSerializer(length=length_serializer):
+                self.writeFlat((length_serializer,), length_serializer.getStructFormat(), (f"len({value})",))
+                self.emitWrite(value)
+
+            case ArrayStringSerializer():
+                encode = self.const("encode", serializer.encode_raw)
+                self.emitWrite(f"{encode}({value})", serializer.getLength())
+
+            case _:
+                name = self.const("s", serializer)
+                counter = self.local("counter")
+                self.emit(f"{counter} = CountingOutputStream(stream)")
+                self.emit(f"{name}.write_raw({counter}, {value})")
+                self.emit(f"size += {counter}.tx_bytes")
+
+    def emitWrite(self, expression: str, size: Optional[int] = None) -> None:
+        """Записать фрагмент и учесть его размер (известный заранее или по факту)"""
+        if size is not None:
+            self.emit(f"write({expression})")
+            self.emit(f"size += {size}")
+            return
+
+        chunk = self.local("c")
+        self.emit(f"{chunk} = {expression}")
+        self.emit(f"write({chunk})")
+        self.emit(f"size += len({chunk})")
+
+    def writeFlat(self, items: tuple[Serializer, ...], fmt: str, values: tuple[str, ...]) -> None:
+        """Запись плоской записи одним вызовом struct"""
+        for item, value in zip(items, values):
+            item_fmt = item.getStructFormat()
+
+            # struct молча дополняет или обрезает bytes
+            if item_fmt.endswith("s"):
+                length = int(item_fmt[:-1])
+                self.emit(f"if len({value}) != {length}:")
+                self.emit(f"    raise BytelangError(f'Invalid ByteArray size (expected: {length}, got: {{len({value})}})')")
+
+        pack = self.const("pack", self.struct(fmt).pack)
+        self.emitWrite(f"{pack}({', '.join(values)})", self.struct(fmt).size)
+
+    def writeSequence(self, items: tuple[Serializer, ...], value: str, mismatch: str) -> None:
+        """Запись записи известного состава"""
+        self.emit(f"if len({value}) != {len(items)}:")
+        self.emit(f"    raise BytelangError(f'{mismatch}: expected {len(items)}, got {{len({value})}}')")
+
+        names = tuple(self.local("v") for _ in items)
+        self.emit(f"{', '.join(names)}, = {value}")
+
+        fmt = self.flatFormats(items)
+
+        if fmt is not None:
+            self.writeFlat(items, fmt, names)
+            return
+
+        for item, name in zip(items, names):
+            self.write(item, name)
+
+    def writeRepeated(self, item: Serializer, value: str) -> None:
+        """Запись всех элементов последовательности"""
+        fmt = item.getStructFormat()
+
+        if fmt is not None and not fmt.endswith("s"):
+            self.emitWrite(f"_pack(f'<{{len({value})}}{fmt}', *{value})")
+            return
+
+        element = self.local("x")
+        self.emit(f"for {element} in {value}:")
+        self.indent(1)
+        self.write(item, element)
+        self.indent(-1)
+
+    def build(self, name: str, signature: str, prologue: tuple[str, ...], errors: str, label: str) -> tuple[Callable, str]:
+        """Собрать функцию: тело оборачивается в перевод ошибок в BytelangError"""
+        body = self.lines or ["    pass"]
+        self.namespace["_label"] = label
+
+        source = "\n".join((
+            f"def {name}({signature}):",
+            *(f"    {line}" for line in prologue),
+            "    try:",
+            *("    " + line for line in body),
+            f"    except ({errors}) as e:",
+            "        raise BytelangError(f'{_label} error: {e}') from e",
+        ))
+
+        exec(compile(source, f"<bytelang {label}>", "exec"), self.namespace)
+        return self.namespace[name], source
+
+
+@dataclass(frozen=True)
+class CompiledCodec[T]:
+    """
+    Сериализатор, скомпилированный в специализированные функции.
+
+    Дерево сериализаторов разворачивается в линейный код один раз:
+    плоские участки читаются и пишутся одним вызовом struct,
+    записи статического размера читаются одним чтением и разбираются из памяти,
+    а неизвестные компилятору сериализаторы вызываются как есть.
+    """
+
+    read_raw: Callable[[InputStream], T]
+    """Считать значение из потока (BytelangError при ошибке)"""
+    read_sized_raw: Callable[[InputStream], tuple[T, int]]
+    """Считать значение и количество прочитанных байт (BytelangError при ошибке)"""
+    write_raw: Callable[[OutputStream, T], int]
+    """Записать значение в поток, вернуть количество записанных байт (BytelangError при ошибке)"""
+    source: str
+    """Сгенерированный код (для отладки)"""
+
+    _cache: ClassVar = OrderedDict[Serializer, "CompiledCodec"]()
+    """
+    Последние скомпилированные сигнатуры (LRU). Кодек ссылается на свой сериализатор,
+    поэтому слабые ключи его не освободили бы - кэш ограничен по размеру
+    """
+    _cache_capacity: ClassVar = 256
+    _cache_lock: ClassVar = Lock()
+
+    @classmethod
+    def compile(cls, serializer: Serializer[T]) -> CompiledCodec[T]:
+        """Скомпилировать сериализатор (результат кэшируется для каждой сигнатуры)"""
+        try:
+            with cls._cache_lock:
+                codec = cls._cache.get(serializer)
+
+                if codec is not None:
+                    cls._cache.move_to_end(serializer)
+                    return codec
+
+        except TypeError:
+            return cls._build(serializer)
+
+        codec = cls._build(serializer)
+
+        with cls._cache_lock:
+            cls._cache[serializer] = codec
+
+            if len(cls._cache) > cls._cache_capacity:
+                cls._cache.popitem(last=False)
+
+        return codec
+
+    @classmethod
+    def _build(cls, serializer: Serializer[T]) -> CompiledCodec[T]:
+        reader = _Emitter()
+        reader.read(serializer, "result")
+        reader.emit("return result")
+        read_raw, read_source = reader.build(
+            "read_raw", "stream", (),
+            "StructError, ValueError", f"Compiled {serializer} read"
+        )
+
+        sized_reader = _Emitter(sized=True)
+        sized_reader.read(serializer, "result")
+        sized_reader.emit("return result, size")
+        read_sized_raw, _ = sized_reader.build(
+            "read_sized_raw", "stream", ("size = 0",),
+            "StructError, ValueError", f"Compiled {serializer} read"
+        )
+
+        writer = _Emitter()
+        writer.write(serializer, "value")
+        writer.emit("return size")
+        write_raw, write_source = writer.build(
+            "write_raw", "stream, value", ("write = stream.write_raw", "size = 0"),
+            "StructError, TypeError, ValueError, AttributeError", f"Compiled {serializer} write"
+        )
+
+        return cls(read_raw, read_sized_raw, write_raw, f"{read_source}\n\n{write_source}")
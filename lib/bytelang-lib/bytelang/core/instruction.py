@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Optional
 
 from rs.result import Result
@@ -6,6 +7,9 @@ from bytelang.abc.serializer import Serializable
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.core.compiler import CompiledCodec
+from bytelang.exceptions import BytelangError
+from bytelang.exceptions import catch
 
 
 @dataclass(frozen=True)
@@ -16,17 +20,49 @@ class Instruction[T: Serializable]:
     signature: Serializer[T]
     name: Optional[str]
 
-    def send(self, stream: OutputStream, value: T) -> Result[None, str]:
-        """Отправить инструкцию с аргументами в поток"""
-        return (
-            stream.write(self.code)
-            .and_then(lambda _: self.signature.write(stream, value))
-            .map_err(lambda e: f"{self.name} send error: {e}")
-        )
+    _codec: CompiledCodec[T] = field(init=False, repr=False, compare=False)
+    """Скомпилированная сигнатура"""
+
+    def __post_init__(self):
+        object.__setattr__(self, "_codec", CompiledCodec.compile(self.signature))
+
+    def send(self, stream: OutputStream, value: T) -> Result[int, str]:
+        """Отправить инструкцию с аргументами в поток, вернуть размер кадра"""
+        return catch(self.send_raw, stream, value)
 
     def receive(self, stream: InputStream) -> Result[T, str]:
         """Принять и десериализовать результат инструкции"""
-        return self.signature.read(stream).map_err(lambda e: f"{self.name} receive error: {e}")
+        return catch(self.receive_raw, stream)
+
+    def send_raw(self, stream: OutputStream, value: T) -> int:
+        """Отправить инструкцию с аргументами в поток, вернуть размер кадра (BytelangError при ошибке)"""
+        try:
+            with stream.frame() as out:
+                out.write_raw(self.code)
+                return len(self.code) + self._codec.write_raw(out, value)
+
+        except BytelangError as e:
+            raise BytelangError(f"{self.name} send error: {e}") from e
+
+    def receive_raw(self, stream: InputStream) -> T:
+        """Принять и десериализовать результат инструкции (BytelangError при ошибке)"""
+        try:
+            return self._codec.read_raw(stream)
+
+        except BytelangError as e:
+            raise BytelangError(f"{self.name} receive error: {e}") from e
+
+    def receive_sized_raw(self, stream: InputStream) -> tuple[T, int]:
+        """Принять результат инструкции и количество прочитанных байт (BytelangError при ошибке)"""
+        try:
+            return self._codec.read_sized_raw(stream)
+
+        except BytelangError as e:
+            raise BytelangError(f"{self.name} receive error: {e}") from e
+
+    def getMetricName(self) -> str:
+        """Имя инструкции в метриках"""
+        return self.name or f"anonymous@{self.code.hex()}"
 
     def __repr__(self) -> str:
         name = self.name or "anonymous"
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import ClassVar
+from typing import Final
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class HistogramStats:
+    """Снимок гистограммы длительностей"""
+
+    count: int
+    """Количество замеров"""
+    total_secs: float
+    """Суммарное время"""
+    max_secs: float
+    """Наибольшая длительность"""
+    buckets: tuple[int, ...]
+    """Количество замеров в корзинах: корзина k - до 2^k мкс"""
+
+    def getMean(self) -> float:
+        """Средняя длительность"""
+        return self.total_secs / self.count if self.count > 0 else 0.0
+
+    def getPercentile(self, q: float) -> float:
+        """Верхняя граница корзины, в которую попадает q-й процентиль (0..1)"""
+        rank = q * self.count
+        seen = 0
+
+        for k, count in enumerate(self.buckets):
+            seen += count
+
+            if count > 0 and seen >= rank:
+                return min((1 << k) * 1e-6, self.max_secs)
+
+        return self.max_secs
+
+
+class _Histogram:
+    """Гистограмма с логарифмическими корзинами: запись - O(1) без выделений"""
+
+    BUCKETS: ClassVar[int] = 24
+    """До 2^23 мкс (~8 с), длиннее - в последнюю корзину"""
+
+    def __init__(self) -> None:
+        self._buckets: Final = [0] * self.BUCKETS
+        self._count = 0
+        self._total_secs = 0.0
+        self._max_secs = 0.0
+
+    def record(self, secs: float) -> None:
+        bucket = int(secs * 1e6).bit_length()
+
+        if bucket >= self.BUCKETS:
+            bucket = self.BUCKETS - 1
+
+        self._buckets[bucket] += 1
+        self._count += 1
+        self._total_secs += secs
+
+        if secs > self._max_secs:
+            self._max_secs = secs
+
+    def snapshot(self) -> HistogramStats:
+        return HistogramStats(self._count, self._total_secs, self._max_secs, tuple(self._buckets))
+
+
+@dataclass(frozen=True)
+class InstructionStats:
+    """Снимок метрик одной инструкции"""
+
+    name: str
+    frames_in: int
+    """Принято кадров"""
+    frames_out: int
+    """Отправлено кадров"""
+    bytes_in: int
+    """Принято байт (с кодом инструкции)"""
+    bytes_out: int
+    """Отправлено байт (с кодом инструкции)"""
+    errors: int
+    """Ошибок разбора, отправки и обработчика"""
+    decode: HistogramStats
+    """Время декодирования кадра"""
+    encode: HistogramStats
+    """Время кодирования и записи кадра"""
+    handler: HistogramStats
+    """Время вызова обработчика (пакетный обработчик - один замер на пакет)"""
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: in {self.frames_in} ({self.bytes_in} B, decode {self.decode.getMean() * 1e6:.1f} us,"
+            f" handler {self.handler.getMean() * 1e6:.1f} us),"
+            f" out {self.frames_out} ({self.bytes_out} B, encode {self.encode.getMean() * 1e6:.1f} us),"
+            f" errors {self.errors}"
+        )
+
+
+class InstructionRecorder:
+    """
+    Накопитель метрик одной инструкции.
+    Все счётчики меняются под блокировкой: приём идёт в потоках чтения (BridgeHub),
+    обработка - в потоке владельца окружения, отправка - из любых потоков.
+    """
+
+    def __init__(self, name: str, lock: Lock) -> None:
+        self._name: Final = name
+        self._lock: Final = lock
+
+        self._frames_in = 0
+        self._frames_out = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._errors = 0
+        self._decode: Final = _Histogram()
+        self._encode: Final = _Histogram()
+        self._handler: Final = _Histogram()
+
+    def recordReceive(self, size: int, decode_secs: Optional[float]) -> None:
+        """Учесть принятый кадр (None - время не замерялось)"""
+        with self._lock:
+            self._frames_in += 1
+            self._bytes_in += size
+
+            if decode_secs is not None:
+                self._decode.record(decode_secs)
+
+    def recordHandle(self, handler_secs: Optional[float], errors: int) -> None:
+        """Учесть вызов обработчика (None - время не замерялось)"""
+        with self._lock:
+            self._errors += errors
+
+            if handler_secs is not None:
+                self._handler.record(handler_secs)
+
+    def recordError(self) -> None:
+        """Учесть ошибку разбора аргументов"""
+        with self._lock:
+            self._errors += 1
+
+    def recordSend(self, size: int, encode_secs: Optional[float]) -> None:
+        """Учесть отправленный кадр (None - время не замерялось)"""
+        with self._lock:
+            self._frames_out += 1
+            self._bytes_out += size
+
+            if encode_secs is not None:
+                self._encode.record(encode_secs)
+
+    def recordSendError(self) -> None:
+        """Учесть неудачную отправку"""
+        with self._lock:
+            self._errors += 1
+
+    def snapshot(self) -> InstructionStats:
+        """Снимок метрик"""
+        with self._lock:
+            return InstructionStats(
+                name=self._name,
+                frames_in=self._frames_in,
+                frames_out=self._frames_out,
+                bytes_in=self._bytes_in,
+                bytes_out=self._bytes_out,
+                errors=self._errors,
+                decode=self._decode.snapshot(),
+                encode=self._encode.snapshot(),
+                handler=self._handler.snapshot(),
+            )
+
+
+class ProtocolMetrics:
+    """
+    Метрики протокола по именам инструкций.
+    Счётчики кадров и байт ведутся всегда, а замеры времени (perf_counter на каждый кадр)
+    заметно замедляют приём, поэтому включаются отдельно и могут переключаться на ходу.
+    """
+
+    def __init__(self, timings: bool = False) -> None:
+        self._lock: Final = Lock()
+        self._recorders: Final = dict[str, InstructionRecorder]()
+
+        self.timings = timings
+        """Замерять время декодирования, кодирования и обработчиков"""
+
+    def getRecorder(self, name: str) -> InstructionRecorder:
+        """Накопитель инструкции (создаётся при первом обращении)"""
+        with self._lock:
+            recorder = self._recorders.get(name)
+
+            if recorder is None:
+                recorder = self._recorders[name] = InstructionRecorder(name, self._lock)
+
+            return recorder
+
+    def getStats(self, name: str) -> Optional[InstructionStats]:
+        """Метрики инструкции (None, если она не зарегистрирована)"""
+        with self._lock:
+            recorder = self._recorders.get(name)
+
+        return None if recorder is None else recorder.snapshot()
+
+    def getAll(self) -> tuple[InstructionStats, ...]:
+        """Метрики всех инструкций"""
+        with self._lock:
+            recorders = tuple(self._recorders.values())
+
+        return tuple(r.snapshot() for r in recorders)
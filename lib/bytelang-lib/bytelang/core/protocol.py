@@ -1,18 +1,44 @@
+from dataclasses import dataclass
+from itertools import groupby
+from time import perf_counter
+from typing import Any
 from typing import Callable
 from typing import Final
 from typing import Iterable
+from typing import Optional
+from typing import Sequence
 
 from rs.result import Result
 from rs.result import err
+from rs.result import ok
 from bytelang.abc.serializer import Serializable
 from bytelang.abc.serializer import Serializer
+from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import Stream
 from bytelang.core.instruction import Instruction
+from bytelang.core.metrics import InstructionRecorder
+from bytelang.core.metrics import ProtocolMetrics
+from bytelang.exceptions import BytelangError
 from bytelang.impl.serializer.primitive import PrimitiveSerializer
 
 type OnReceiveFunction[T] = Callable[[T], Result[None, str]]
 """Вид обработчика приёма"""
 
+type OnBatchReceiveFunction[T] = Callable[[Sequence[T]], Result[None, str]]
+"""Вид пакетного обработчика приёма"""
+
+
+@dataclass(frozen=True)
+class PullStats:
+    """Статистика пакетной обработки входящих сообщений"""
+
+    frames: int
+    """Количество кадров в пакете"""
+    total_bytes: int
+    """Считано байт"""
+    decode_secs: float
+    """Время декодирования"""
+
 
 class Protocol:
     """Протокол P2P общения по потоку с указанной структурой полей"""
@@ -21,13 +47,25 @@ class Protocol:
             self,
             stream: Stream,
             local_code: PrimitiveSerializer[int],
-            remote_code: PrimitiveSerializer[int]
+            remote_code: PrimitiveSerializer[int],
+            *,
+            timings: bool = False
     ) -> None:
+        """
+        :param timings: Замерять время кодирования, декодирования и обработчиков (см. ProtocolMetrics.timings)
+        """
         self._stream: Final = stream
         self._local_instruction_code: Final = local_code
         self._remote_instruction_code: Final = remote_code
         self._receive_handlers: Final = dict[bytes, tuple[Instruction, OnReceiveFunction]]()
+        self._batch_handlers: Final = dict[bytes, OnBatchReceiveFunction]()
         self._send_handlers: Final = dict[bytes, Instruction]()
+        self._metrics: Final = ProtocolMetrics(timings)
+        self._receive_recorders: Final = dict[bytes, InstructionRecorder]()
+
+    def getMetrics(self) -> ProtocolMetrics:
+        """Метрики инструкций протокола"""
+        return self._metrics
 
     def getSenders(self) -> Iterable:
         """Получить все обработчики на отправку"""
@@ -37,12 +75,26 @@ class Protocol:
         """Получить все обработчики на приём"""
         return (i for i, j in self._receive_handlers.values())
 
-    def addReceiver[T: Serializable](self, /, result: Serializer[T], handler: OnReceiveFunction[T], name: str = None) -> None:
-        """Зарегистрировать обработчик входящих сообщений"""
+    def addReceiver[T: Serializable](
+            self,
+            /,
+            result: Serializer[T],
+            handler: OnReceiveFunction[T],
+            name: str = None,
+            batch_handler: Optional[OnBatchReceiveFunction[T]] = None
+    ) -> None:
+        """
+        Зарегистрировать обработчик входящих сообщений
+        :param batch_handler: Обработчик подряд идущих сообщений в pull_many (по умолчанию handler для каждого)
+        """
         index = len(self._receive_handlers)
         code = self._local_instruction_code.pack(index).unwrap()
         instruction = Instruction(code, result, name)
         self._receive_handlers[code] = (instruction, handler)
+        self._receive_recorders[code] = self._metrics.getRecorder(instruction.getMetricName())
+
+        if batch_handler is not None:
+            self._batch_handlers[code] = batch_handler
 
     def addSender[T: Serializable](self, /, signature: Serializer[T], name: str = None) -> Callable[[T], Result[None, str]]:
         """Зарегистрировать исходящую инструкцию"""
@@ -51,29 +103,181 @@ class Protocol:
         instruction = Instruction(code, signature, name)
         self._send_handlers[code] = instruction
 
+        metrics = self._metrics
+        recorder = metrics.getRecorder(instruction.getMetricName())
+
         def _wrapper(value: T):
-            return instruction.send(self._stream, value)
+            timed = metrics.timings
+            start = perf_counter() if timed else 0.0
+
+            try:
+                size = instruction.send_raw(self._stream, value)
+
+            except BytelangError as e:
+                recorder.recordSendError()
+                return err(str(e))
+
+            recorder.recordSend(size, perf_counter() - start if timed else None)
+            return ok(None)
 
         return _wrapper
 
+    def _readCode(self, stream: InputStream) -> bytes:
+        """Считать код известной инструкции"""
+        try:
+            code = stream.read_raw(self._remote_instruction_code.getSize())
+
+        except BytelangError as e:
+            raise BytelangError(f"Failed to read instruction code: {e}") from e
+
+        if code not in self._receive_handlers:
+            raise BytelangError(f"Unknown instruction code: {code.hex()}")
+
+        return code
+
+    def _receiveArgs(self, stream: InputStream, code: bytes) -> Any:
+        """Считать аргументы инструкции"""
+        instruction, _ = self._receive_handlers[code]
+
+        try:
+            return instruction.receive_raw(stream)
+
+        except BytelangError as e:
+            raise BytelangError(f"Failed to receive arguments: {e}") from e
+
+    def decode_raw(self, stream: InputStream) -> tuple[Instruction, Any]:
+        """Декодировать один входящий кадр из потока (BytelangError при ошибке)"""
+        code = self._readCode(stream)
+        instruction, _ = self._receive_handlers[code]
+        return instruction, self._receiveArgs(stream, code)
+
+    def _decodeCounted(self, stream: InputStream, code: bytes) -> tuple[Instruction, Any, int]:
+        """
+        Декодировать аргументы кадра с уже считанным кодом с учётом в метриках.
+        Возвращает инструкцию, аргументы и размер кадра
+        """
+        instruction, _ = self._receive_handlers[code]
+        recorder = self._receive_recorders[code]
+        timed = self._metrics.timings
+        start = perf_counter() if timed else 0.0
+
+        try:
+            args, size = instruction.receive_sized_raw(stream)
+
+        except BytelangError as e:
+            recorder.recordError()
+            raise BytelangError(f"Failed to receive arguments: {e}") from e
+
+        size += len(code)
+        recorder.recordReceive(size, perf_counter() - start if timed else None)
+        return instruction, args, size
+
+    def handle(self, instruction: Instruction, value: Any) -> Result[None, str]:
+        """Передать декодированное значение обработчику инструкции"""
+        _, handler = self._receive_handlers[instruction.code]
+        recorder = self._receive_recorders[instruction.code]
+
+        if not self._metrics.timings:
+            result = handler(value)
+            recorder.recordHandle(None, int(result.is_err()))
+            return result
+
+        start = perf_counter()
+        result = handler(value)
+        recorder.recordHandle(perf_counter() - start, int(result.is_err()))
+
+        return result
+
+    def receive_raw(self) -> tuple[Instruction, Any]:
+        """
+        Дождаться и декодировать входящий кадр, не вызывая обработчик (см. handle).
+        BytelangError при ошибке разбора, поток при этом выравнивается через resync
+        """
+        try:
+            stream = self._stream
+            instruction, args, _ = self._decodeCounted(stream, self._readCode(stream))
+            stream.endFrame()
+
+        except BytelangError:
+            self._stream.resync()
+            raise
+
+        return instruction, args
+
     def pull(self) -> Result[None, str]:
-        """Обработать входящее сообщение"""
-        code_size = self._remote_instruction_code.getSize()
-        code_result = self._stream.read(code_size)
+        """Обработать входящее сообщение (после ошибки разбора поток выравнивается через resync)"""
+        try:
+            instruction, args = self.receive_raw()
 
-        if code_result.is_err():
-            return code_result.map(lambda _: None).map_err(
-                lambda e: f"Failed to read instruction code: {e}")
+        except BytelangError as e:
+            return err(str(e))
 
-        code = code_result.unwrap()
+        return self.handle(instruction, args)
 
-        if code not in self._receive_handlers:
-            return err(f"Unknown instruction code: {code.hex()}")
+    def pull_many(self, max_frames: int = 256) -> Result[PullStats, str]:
+        """
+        Обработать пакет входящих сообщений.
+
+        Ожидает первый кадр, затем декодирует все кадры, уже лежащие в буфере потока,
+        и передаёт их обработчикам: подряд идущие кадры одной инструкции уходят
+        пакетному обработчику одним вызовом.
+        Кадр, начало которого уже в буфере, дочитывается с блокировкой.
+        """
+        stream = self._stream
+        frames = list[tuple[Instruction, Any]]()
+        errors = list[str]()
+
+        total_bytes = 0
+        start: Optional[float] = None
+
+        try:
+            while len(frames) < max_frames:
+                if len(frames) > 0 and stream.available() == 0:
+                    break
+
+                code = self._readCode(stream)
+
+                if start is None:
+                    # Ожидание первого кадра не входит во время декодирования
+                    start = perf_counter()
+
+                instruction, args, size = self._decodeCounted(stream, code)
+                stream.endFrame()
+                frames.append((instruction, args))
+                total_bytes += size
+
+        except BytelangError as e:
+            stream.resync()
+            errors.append(str(e))
+
+        decode_secs = 0.0 if start is None else perf_counter() - start
+
+        for instruction, group in groupby(frames, key=lambda frame: frame[0]):
+            args = tuple(a for _, a in group)
+            errors.extend(self._dispatch(instruction, args))
+
+        if len(errors) > 0:
+            return err("; ".join(errors))
+
+        return ok(PullStats(len(frames), total_bytes, decode_secs))
+
+    def _dispatch(self, instruction: Instruction, args: Sequence[Any]) -> Iterable[str]:
+        batch_handler = self._batch_handlers.get(instruction.code)
 
-        instruction, handler = self._receive_handlers[code]
-        args_result = instruction.receive(self._stream)
+        if batch_handler is not None:
+            timed = self._metrics.timings
+            start = perf_counter() if timed else 0.0
+            results = (batch_handler(args),)
+            self._receive_recorders[instruction.code].recordHandle(
+                perf_counter() - start if timed else None,
+                int(results[0].is_err())
+            )
 
-        if args_result.is_err():
-            return args_result.map_err(lambda e: f"Failed to receive arguments: {e}").map(lambda _: None)
+        else:
+            results = tuple(self.handle(instruction, a) for a in args)
 
-        return handler(args_result.unwrap())
+        return tuple(
+            r.err().unwrap()
+            for r in results
+            if r.is_err()
+        )
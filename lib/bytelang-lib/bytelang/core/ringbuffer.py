@@ -0,0 +1,112 @@
+from collections.abc import Buffer
+from typing import Final
+from typing import Optional
+
+
+class RingBuffer:
+    """Кольцевой байтовый буфер фиксированной ёмкости"""
+
+    def __init__(self, capacity: int) -> None:
+        assert capacity >= 1
+
+        self._buffer: Final = bytearray(capacity)
+        self._view: Final = memoryview(self._buffer)
+        self._capacity: Final = capacity
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def getCapacity(self) -> int:
+        """Ёмкость буфера"""
+        return self._capacity
+
+    def getFree(self) -> int:
+        """Свободное место"""
+        return self._capacity - self._size
+
+    def clear(self) -> None:
+        """Очистить буфер"""
+        self._head = 0
+        self._size = 0
+
+    def write(self, data: Buffer) -> int:
+        """Дописать данные в хвост, вернуть количество записанных байт"""
+        tail = self._head + self._size
+
+        # Быстрый путь: данные целиком помещаются без перехода через край
+        if tail + len(data) <= self._capacity:
+            self._buffer[tail:tail + len(data)] = data
+            self._size += len(data)
+            return len(data)
+
+        data = memoryview(data)
+        count = min(len(data), self.getFree())
+
+        tail = (self._head + self._size) % self._capacity
+        first = min(count, self._capacity - tail)
+
+        self._view[tail:tail + first] = data[:first]
+        self._view[:count - first] = data[first:count]
+
+        self._size += count
+        return count
+
+    def peek(self, size: int) -> bytes:
+        """Скопировать до size байт из головы без извлечения"""
+        size = min(size, self._size)
+        end = self._head + size
+
+        if end <= self._capacity:
+            return bytes(self._view[self._head:end])
+
+        return bytes(self._view[self._head:]) + bytes(self._view[:end - self._capacity])
+
+    def view(self, size: int) -> Optional[memoryview]:
+        """Срез головы без копирования, если он не переходит через край буфера"""
+        size = min(size, self._size)
+        end = self._head + size
+
+        if end > self._capacity:
+            return None
+
+        return self._view[self._head:end]
+
+    def skip(self, size: int) -> int:
+        """Отбросить до size байт из головы"""
+        size = min(size, self._size)
+
+        self._head = (self._head + size) % self._capacity
+        self._size -= size
+
+        if self._size == 0:
+            self._head = 0
+
+        return size
+
+    def read(self, size: int) -> bytes:
+        """Извлечь до size байт из головы"""
+        end = self._head + size
+
+        # Быстрый путь: данных достаточно и они не переходят через край
+        if size <= self._size and end <= self._capacity:
+            data = bytes(self._view[self._head:end])
+            self._size -= size
+            self._head = 0 if self._size == 0 else end % self._capacity
+            return data
+
+        data = self.peek(size)
+        self.skip(len(data))
+        return data
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """Извлечь данные из головы в готовый буфер"""
+        out = memoryview(buffer)
+        size = min(len(out), self._size)
+        first = min(size, self._capacity - self._head)
+
+        out[:first] = self._view[self._head:self._head + first]
+        out[first:size] = self._view[:size - first]
+
+        return self.skip(size)
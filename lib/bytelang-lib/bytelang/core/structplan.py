@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Buffer
+from dataclasses import dataclass
+from itertools import groupby
+# noinspection PyPep8Naming
+from struct import error as StructError
+from typing import Optional
+from typing import Sequence
+
+from bytelang.abc.serializer import Serializer
+from bytelang.abc.stream import InputStream
+from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
+
+
+@dataclass(frozen=True)
+class StructPlan:
+    """План упаковки плоской композиции полей фиксированного размера одним struct.Struct"""
+
+    _struct: struct.Struct
+    _fields_count: int
+    _byte_fields: tuple[tuple[int, int], ...]
+    """Индексы и длины полей bytes (struct молча дополняет или обрезает их при упаковке)"""
+
+    @classmethod
+    def compile(cls, fields: Sequence[Serializer]) -> Optional[StructPlan]:
+        """Скомпилировать план, если все поля плоские и фиксированного размера"""
+        formats = tuple(f.getStructFormat() for f in fields)
+
+        if len(formats) == 0 or None in formats:
+            return None
+
+        byte_fields = tuple(
+            (i, int(fmt[:-1]))
+            for i, fmt in enumerate(formats)
+            if fmt.endswith("s")
+        )
+
+        return cls(struct.Struct(f"<{cls._joinFormats(formats)}"), len(formats), byte_fields)
+
+    @staticmethod
+    def _joinFormats(formats: Sequence[str]) -> str:
+        def _run(fmt: str, count: int) -> str:
+            if count == 1 or fmt.endswith("s"):
+                return fmt * count
+
+            return f"{count}{fmt}"
+
+        return "".join(
+            _run(fmt, len(tuple(group)))
+            for fmt, group in groupby(formats)
+        )
+
+    def getSize(self) -> int:
+        """Размер упакованной записи"""
+        return self._struct.size
+
+    def read_raw(self, stream: InputStream) -> list:
+        """Считать запись целиком одним чтением"""
+        return self.unpack_raw(stream.read_view_raw(self._struct.size))
+
+    def write_raw(self, stream: OutputStream, values: Sequence) -> None:
+        """Записать запись целиком одной записью"""
+        stream.write_raw(self.pack_raw(values))
+
+    def unpack_raw(self, data: Buffer) -> list:
+        """Распаковать запись"""
+
+        try:
+            return list(self._struct.unpack(data))
+
+        except StructError as e:
+            raise BytelangError(f"Unpack error: {e}") from e
+
+    def pack_raw(self, values: Sequence) -> bytes:
+        """Упаковать запись"""
+
+        if len(values) != self._fields_count:
+            raise BytelangError(f"Value/fields count mismatch: {len(values)} vs {self._fields_count}")
+
+        try:
+            for i, length in self._byte_fields:
+                if len(values[i]) != length:
+                    raise BytelangError(f"Field {i}: Invalid ByteArray size (expected: {length}, got: {len(values[i])})")
+
+            return self._struct.pack(*values)
+
+        except (StructError, TypeError) as e:
+            raise BytelangError(f"Pack error: {e}") from e
+
+    def __repr__(self) -> str:
+        return f"plan<{self._struct.format}>"
@@ -0,0 +1,20 @@
+"""Исключения быстрого (raw) пути сериализации"""
+
+from typing import Callable
+
+from rs.result import Result
+from rs.result import err
+from rs.result import ok
+
+
+class BytelangError(Exception):
+    """Ошибка сериализации или ввода-вывода"""
+
+
+def catch[T](f: Callable[..., T], *args) -> Result[T, str]:
+    """Вызвать raw-функцию, перехватив BytelangError в Result"""
+    try:
+        return ok(f(*args))
+
+    except BytelangError as e:
+        return err(str(e))
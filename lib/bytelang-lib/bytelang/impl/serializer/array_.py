@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
 from typing import Sequence
 
-from rs.result import Result
-from rs.result import err
-from rs.result import ok
 from bytelang.abc.serializer import Serializable
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.core.structplan import StructPlan
+from bytelang.exceptions import BytelangError
 
 
 @dataclass(frozen=True)
@@ -21,33 +22,53 @@ class ArraySerializer[T: Serializable](Serializer[Sequence[T]]):
     length: int
     """Длинна массива"""
 
+    _plan: Optional[StructPlan] = field(init=False, repr=False, compare=False)
+    """Слитный план, если элемент плоский и фиксированного размера"""
+
     def __post_init__(self):
         assert self.length >= 1
+        object.__setattr__(self, "_plan", StructPlan.compile((self.item,) * self.length))
 
     def __repr__(self) -> str:
         return f"[{self.length}]{self.item}"
 
-    def read(self, stream: InputStream) -> Result[list, str]:
+    def getStaticSize(self) -> Optional[int]:
+        size = self.item.getStaticSize()
+        return None if size is None else size * self.length
+
+    def read_raw(self, stream: InputStream) -> list:
+        if self._plan is not None:
+            try:
+                return self._plan.read_raw(stream)
+
+            except BytelangError as e:
+                raise BytelangError(f"Fused items error: {e}") from e
+
         items = list()
 
         for i in range(self.length):
-            item_result = self.item.read(stream)
+            try:
+                items.append(self.item.read_raw(stream))
 
-            if item_result.is_err():
-                return item_result.map_err(lambda e: f"Item {i} read error: {e}")
+            except BytelangError as e:
+                raise BytelangError(f"Item {i} read error: {e}") from e
 
-            items.append(item_result.unwrap())
+        return items
 
-        return ok(items)
-
-    def write(self, stream: OutputStream, value: list) -> Result[None, str]:
+    def write_raw(self, stream: OutputStream, value: list) -> None:
         if len(value) != self.length:
-            return err(f"Array length mismatch: expected {self.length}, got {len(value)}")
+            raise BytelangError(f"Array length mismatch: expected {self.length}, got {len(value)}")
 
-        for i, item in enumerate(value):
-            item_result = self.item.write(stream, item)
+        if self._plan is not None:
+            try:
+                return self._plan.write_raw(stream, value)
 
-            if item_result.is_err():
-                return item_result.map_err(lambda e: f"Item {i} write error: {e}")
+            except BytelangError as e:
+                raise BytelangError(f"Fused items write error: {e}") from e
+
+        for i, item in enumerate(value):
+            try:
+                self.item.write_raw(stream, item)
 
-        return ok(None)
+            except BytelangError as e:
+                raise BytelangError(f"Item {i} write error: {e}") from e
@@ -1,44 +1,148 @@
-from rs.result import Result
-from rs.result import err
-from rs.result import ok
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Final
+from typing import Optional
+
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
 from bytelang.impl.serializer.bytearray_ import ByteArraySerializer
 
 
+@dataclass(frozen=True)
+class EncodingCacheStats:
+    """Метрики кэша закодированных строк"""
+
+    hits: int
+    """Попаданий"""
+    misses: int
+    """Промахов"""
+    size: int
+    """Строк в кэше"""
+    capacity: int
+    """Ёмкость кэша"""
+
+    def getHitRate(self) -> float:
+        """Доля попаданий"""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
 class ArrayStringSerializer(Serializer[str]):
-    """Сериализатор строк фиксированной длины с UTF-8 кодировкой"""
+    """
+    Сериализатор строк фиксированной длины с UTF-8 кодировкой.
+
+    Готовые дополненные кодировки повторяющихся строк кэшируются. Строка попадает в кэш
+    только со второго кодирования, так что поток разовых строк (ответы с именами и MAC)
+    не вытесняет постоянные. При переполнении вытесняется дольше всех не использованная запись.
+    """
 
-    def __init__(self, length: int) -> None:
+    def __init__(self, length: int, cache_size: int = 256) -> None:
+        """
+        :param length: Размер строки в байтах
+        :param cache_size: Ёмкость кэша готовых дополненных кодировок (0 - без кэша)
+        """
         self._byte_array_serializer = ByteArraySerializer(length)
+        self._cache_size: Final = cache_size
 
-    def write(self, stream: OutputStream, value: str) -> Result[None, str]:
-        """Записать строку как байты фиксированной длины"""
+        self._cache: Final = OrderedDict[str, bytes]()
+        """Кодировки в порядке использования (последняя - самая свежая)"""
+        self._seen: Final = OrderedDict[str, None]()
+        """Строки, закодированные один раз (кандидаты в кэш, не больше cache_size)"""
+        self._lock: Final = Lock()
+        """Вставка и вытеснение (попадание - без блокировки: блокировка дороже самого кодирования)"""
+        self._hits = 0
+        """Попадания (считаются без блокировки: при параллельных отправителях - приблизительно)"""
+        self._misses = 0
+
+    def _encodeUncached(self, value: str) -> bytes:
         try:
             encoded = value.encode('utf-8')
 
-            if len(encoded) > self._byte_array_serializer.length:
-                return err(f"String too long ({len(encoded)} > {self._byte_array_serializer.length} bytes)")
+        except (AttributeError, UnicodeError) as e:
+            raise BytelangError(f"{self.write.__name__} error: {str(e)}") from e
 
-            padded = encoded + b'\x00' * (self._byte_array_serializer.length - len(encoded))
-            return self._byte_array_serializer.write(stream, padded)
+        if len(encoded) > self._byte_array_serializer.length:
+            raise BytelangError(f"String too long ({len(encoded)} > {self._byte_array_serializer.length} bytes)")
 
-        except Exception as e:
-            return err(f"{self.write.__name__} error: {str(e)}")
+        # Дополнение нулями за одно выделение, без промежуточной конкатенации
+        return encoded.ljust(self._byte_array_serializer.length, b'\x00')
 
-    def read(self, stream: InputStream) -> Result[str, str]:
-        """Прочитать строку из байтов фиксированной длины"""
+    def encode_raw(self, value: str) -> bytes:
+        """Строка, закодированная и дополненная до фиксированной длины (BytelangError при ошибке)"""
         try:
-            data = self._byte_array_serializer.read(stream)
+            encoded = self._cache.get(value)
+
+        except TypeError as e:
+            raise BytelangError(f"{self.write.__name__} error: {str(e)}") from e
+
+        if encoded is not None:
+            try:
+                # Одна операция OrderedDict атомарна под GIL; запись могли вытеснить после get
+                self._cache.move_to_end(value)
+
+            except KeyError:
+                pass
+
+            self._hits += 1
+            return encoded
+
+        encoded = self._encodeUncached(value)
+        self._admit(value, encoded)
+        return encoded
 
-            if data.is_err():
-                return err(data.err().unwrap())
+    def _admit(self, value: str, encoded: bytes) -> None:
+        """Учесть промах: повторная строка переходит в кэш"""
+        with self._lock:
+            self._misses += 1
 
-            return ok(data.unwrap().rstrip(b'\x00').decode('utf-8'))
+            if self._cache_size == 0:
+                return
+
+            if value in self._seen:
+                del self._seen[value]
+                self._remember(self._cache, value, encoded)
+
+            else:
+                self._remember(self._seen, value, None)
+
+    def _remember[T](self, entries: OrderedDict[str, T], value: str, item: T) -> None:
+        if len(entries) >= self._cache_size:
+            entries.popitem(last=False)
+
+        entries[value] = item
+
+    def write_raw(self, stream: OutputStream, value: str) -> None:
+        """Записать строку как байты фиксированной длины"""
+        stream.write_raw(self.encode_raw(value))
+
+    def read_raw(self, stream: InputStream) -> str:
+        """Прочитать строку из байтов фиксированной длины"""
+        data = stream.read_view_raw(self._byte_array_serializer.length)
+
+        try:
+            # Декодирование прямо из буфера потока: нулевое заполнение становится хвостом из '\0'
+            return str(data, 'utf-8').rstrip('\x00')
 
         except Exception as exception:
-            return err(f"{self.read.__name__} error: {exception}")
-    
+            raise BytelangError(f"{self.read.__name__} error: {exception}") from exception
+
+    def getLength(self) -> int:
+        """Размер строки в байтах"""
+        return self._byte_array_serializer.length
+
+    def getStaticSize(self) -> Optional[int]:
+        return self.getLength()
+
+    def getCacheStats(self) -> EncodingCacheStats:
+        """
+        Получить метрики кэша кодировок.
+        Счётчик попаданий ведётся без блокировки: при параллельных отправителях он приблизителен
+        """
+        with self._lock:
+            return EncodingCacheStats(self._hits, self._misses, len(self._cache), self._cache_size)
+
     def __repr__(self) -> str:
         return f"[{self._byte_array_serializer.length}]str"
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Buffer
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Optional
+from typing import Sequence
+
+from bytelang.abc.serializer import Serializer
+from bytelang.abc.stream import InputStream
+from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
+from bytelang.impl.serializer.primitive import PrimitiveSerializer
+# noinspection PyProtectedMember
+from bytelang.impl.serializer.primitive import _Format
+
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+_LITTLE_ENDIAN_HOST = sys.byteorder == "little"
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """Раскладка примитивного элемента для массовых операций"""
+
+    typecode: str
+    """Код типа array.array с тем же размером элемента"""
+    size: int
+    """Размер элемента"""
+    dtype: str
+    """Тип numpy (little-endian)"""
+    use_numpy: bool
+
+    @classmethod
+    def of(cls, item: PrimitiveSerializer, use_numpy: bool) -> _Layout:
+        if use_numpy and numpy is None:
+            raise BytelangError("numpy is not installed")
+
+        fmt = item.getStructFormat()
+        size = item.getSize()
+        prefix = _Format.matchPrefix(fmt)
+
+        candidates = {"f": "fd", "i": "bhilq", "u": "BHILQ"}[prefix]
+        typecode = next(c for c in candidates if array(c).itemsize == size)
+
+        return cls(typecode, size, f"<{prefix}{size}", use_numpy)
+
+    def decode(self, data: Buffer, count: int) -> Sequence:
+        """Распаковать count элементов одним вызовом"""
+        if memoryview(data).nbytes != count * self.size:
+            raise BytelangError(f"Bulk unpack error: expected {count * self.size} bytes, got {memoryview(data).nbytes}")
+
+        if self.use_numpy:
+            # Копия: буфер потока действителен только до следующего чтения
+            return numpy.frombuffer(data, self.dtype).copy()
+
+        values = array(self.typecode)
+        values.frombytes(data)
+
+        if not _LITTLE_ENDIAN_HOST:
+            values.byteswap()
+
+        return values
+
+    def encode(self, values: Any) -> bytes:
+        """Упаковать элементы одним вызовом"""
+        try:
+            if self.use_numpy:
+                return numpy.asarray(values, self.dtype).tobytes()
+
+            # Копия нужна, если тип другой или порядок байт придётся менять на месте
+            if not (isinstance(values, array) and values.typecode == self.typecode) or not _LITTLE_ENDIAN_HOST:
+                values = array(self.typecode, values)
+
+            if not _LITTLE_ENDIAN_HOST:
+                values.byteswap()
+
+            return values.tobytes()
+
+        except (OverflowError, TypeError, ValueError) as e:
+            raise BytelangError(f"Bulk pack error: {e}") from e
+
+
+@dataclass(frozen=True)
+class BulkArraySerializer(Serializer[Sequence]):
+    """
+    Массив примитивов фиксированной длины, читаемый и записываемый одним вызовом.
+    Возвращает array.array (или numpy.ndarray при use_numpy) вместо списка.
+    """
+
+    item: PrimitiveSerializer
+    """Примитив элемента"""
+    length: int
+    """Длинна массива"""
+    use_numpy: bool = False
+    """Возвращать numpy.ndarray"""
+
+    _layout: _Layout = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        assert self.length >= 1
+        object.__setattr__(self, "_layout", _Layout.of(self.item, self.use_numpy))
+
+    def read_raw(self, stream: InputStream) -> Sequence:
+        return self._layout.decode(stream.read_view_raw(self.length * self._layout.size), self.length)
+
+    def write_raw(self, stream: OutputStream, value: Sequence) -> None:
+        if len(value) != self.length:
+            raise BytelangError(f"Array length mismatch: expected {self.length}, got {len(value)}")
+
+        stream.write_raw(self._layout.encode(value))
+
+    def getStaticSize(self) -> Optional[int]:
+        return self.length * self._layout.size
+
+    def __repr__(self) -> str:
+        return f"[{self.length}]{self.item}*"
+
+
+@dataclass(frozen=True)
+class BulkVectorSerializer(Serializer[Sequence]):
+    """
+    Динамический массив примитивов, читаемый и записываемый одним вызовом.
+    Возвращает array.array (или numpy.ndarray при use_numpy) вместо списка.
+    """
+
+    item: PrimitiveSerializer
+    """Примитив элемента"""
+    length: PrimitiveSerializer[int]
+    """Примитив описывающий длину"""
+    use_numpy: bool = False
+    """Возвращать numpy.ndarray"""
+
+    _layout: _Layout = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_layout", _Layout.of(self.item, self.use_numpy))
+
+    def read_raw(self, stream: InputStream) -> Sequence:
+        try:
+            length = self.length.read_raw(stream)
+
+        except BytelangError as e:
+            raise BytelangError(f"Length read error: {e}") from e
+
+        # Пустой вектор не читает данных: поток может уже закончиться на длине
+        data = stream.read_view_raw(length * self._layout.size) if length > 0 else b""
+        return self._layout.decode(data, length)
+
+    def write_raw(self, stream: OutputStream, value: Sequence) -> None:
+        data = self._layout.encode(value)
+
+        try:
+            self.length.write_raw(stream, len(value))
+
+        except BytelangError as e:
+            raise BytelangError(f"Length write error: {e}") from e
+
+        stream.write_raw(data)
+
+    def __repr__(self) -> str:
+        return f"[{self.length}]{self.item}*"
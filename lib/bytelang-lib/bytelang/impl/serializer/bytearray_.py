@@ -1,10 +1,9 @@
 from dataclasses import dataclass
 
-from rs.result import Result
-from rs.result import err
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
 
 
 @dataclass(frozen=True)
@@ -17,20 +16,25 @@ class ByteArraySerializer(Serializer[bytes]):
     def __post_init__(self):
         assert self.length >= 1
 
-    def write(self, stream: OutputStream, value: bytes) -> Result[None, str]:
+    def write_raw(self, stream: OutputStream, value: bytes) -> None:
         if len(value) != self.length:
-            return err(f"Invalid ByteArray size (expected: {self.length}, got: {len(value)})")
-
-        return (
-            stream.write(value)
-            .map_err(lambda e: f"{self.write.__name__} error: {e}")
-        )
-
-    def read(self, stream: InputStream) -> Result[bytes, str]:
-        return (
-            stream.read(self.length)
-            .map_err(lambda e: f"{self.read.__name__} error: {e}")
-        )
+            raise BytelangError(f"Invalid ByteArray size (expected: {self.length}, got: {len(value)})")
+
+        try:
+            stream.write_raw(value)
+
+        except BytelangError as e:
+            raise BytelangError(f"{self.write.__name__} error: {e}") from e
+
+    def read_raw(self, stream: InputStream) -> bytes:
+        try:
+            return stream.read_raw(self.length)
+
+        except BytelangError as e:
+            raise BytelangError(f"{self.read.__name__} error: {e}") from e
+
+    def getStructFormat(self) -> str:
+        return f"{self.length}s"
 
     def __repr__(self) -> str:
         return f"[{self.length}]bytes"
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 
-from rs.result import Result
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
 from bytelang.impl.serializer.primitive import PrimitiveSerializer
 
 
@@ -14,23 +14,25 @@ class ByteVectorSerializer(Serializer[bytes]):
     length: PrimitiveSerializer[int]
     """Примитив длины"""
 
-    def write(self, stream: OutputStream, value: bytes) -> Result[None, str]:
-        len_result = self.length.write(stream, len(value))
+    def write_raw(self, stream: OutputStream, value: bytes) -> None:
+        try:
+            self.length.write_raw(stream, len(value))
 
-        if len_result.is_err():
-            return len_result.map_err(lambda e: f"{self.write} (len) err: {e}")
+        except BytelangError as e:
+            raise BytelangError(f"{self.write} (len) err: {e}") from e
 
-        return (
-            stream.write(value)
-            .map_err(lambda e: f"{self.write} err: {e}")
-        )
+        try:
+            stream.write_raw(value)
 
-    def read(self, stream: InputStream) -> Result[bytes, str]:
-        return (
-            self.length.read(stream)
-            .and_then(lambda length: stream.read(length))
-            .map_err(lambda e: f"{self.read} error: {e}")
-        )
+        except BytelangError as e:
+            raise BytelangError(f"{self.write} err: {e}") from e
+
+    def read_raw(self, stream: InputStream) -> bytes:
+        try:
+            return stream.read_raw(self.length.read_raw(stream))
+
+        except BytelangError as e:
+            raise BytelangError(f"{self.read} error: {e}") from e
 
     def __repr__(self) -> str:
         return f"[{self.length}]bytes"
@@ -1,4 +1,5 @@
 import struct
+from collections.abc import Buffer
 from itertools import chain
 # noinspection PyPep8Naming
 from struct import error as StructError
@@ -6,11 +7,11 @@ from typing import Final
 from typing import Iterable
 
 from rs.result import Result
-from rs.result import err
-from rs.result import ok
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
+from bytelang.exceptions import catch
 
 
 class _Format:
@@ -72,42 +73,45 @@ class PrimitiveSerializer[T](Serializer[T]):
     def __repr__(self) -> str:
         return f"{_Format.matchPrefix(self._struct.format.strip("<>"))}{self.getSize() * 8}"
 
-    def read(self, stream: InputStream) -> Result[T, str]:
-        return (
-            stream.read(self.getSize())
-            .and_then(lambda data: self.unpack(data))
-            .map_err(lambda e: f"Read error: {e}")
-        )
-
-    def write(self, stream: OutputStream, value: T) -> Result[None, str]:
-        return (
-            self.pack(value)
-            .and_then(lambda data: stream.write(data))
-            .map_err(lambda e: f"Write error: {e}")
-        )
-
-    def unpack(self, data: bytes) -> Result[T, str]:
+    def read_raw(self, stream: InputStream) -> T:
+        return self.unpack_raw(stream.read_view_raw(self._struct.size))
+
+    def write_raw(self, stream: OutputStream, value: T) -> None:
+        stream.write_raw(self.pack_raw(value))
+
+    def unpack(self, data: Buffer) -> Result[T, str]:
         """Распаковать данные"""
+        return catch(self.unpack_raw, data)
+
+    def pack(self, value: T) -> Result[bytes, str]:
+        """Упаковать данные"""
+        return catch(self.pack_raw, value)
+
+    def unpack_raw(self, data: Buffer) -> T:
+        """Распаковать данные (BytelangError при ошибке)"""
 
         try:
-            return ok(self._struct.unpack(data)[0])
+            return self._struct.unpack(data)[0]
 
         except StructError as e:
-            return err(f"Unpack error: {e}")
+            raise BytelangError(f"Unpack error: {e}") from e
 
-    def pack(self, value: T) -> Result[bytes, str]:
-        """Упаковать данные"""
+    def pack_raw(self, value: T) -> bytes:
+        """Упаковать данные (BytelangError при ошибке)"""
 
         try:
-            return ok(self._struct.pack(value))
+            return self._struct.pack(value)
 
         except StructError as exception:
-            return err(f"Pack error: {exception}")
+            raise BytelangError(f"Pack error: {exception}") from exception
 
     def getSize(self) -> int:
         """Узнать размер примитива"""
         return self._struct.size
 
+    def getStructFormat(self) -> str:
+        return self._struct.format.strip("<>")
+
 
 u8 = PrimitiveSerializer[int | bool](_Format.U8)
 u16 = PrimitiveSerializer[int](_Format.U16)
@@ -1,13 +1,14 @@
 from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
 from typing import Sequence
 
-from rs.result import Result
-from rs.result import err
-from rs.result import ok
 from bytelang.abc.serializer import Serializable
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.core.structplan import StructPlan
+from bytelang.exceptions import BytelangError
 
 
 @dataclass(frozen=True)
@@ -16,30 +17,52 @@ class StructSerializer[T: Sequence[Serializable]](Serializer[T]):
 
     fields: Sequence[Serializer]
 
+    _plan: Optional[StructPlan] = field(init=False, repr=False, compare=False)
+    """Слитный план, если все поля плоские и фиксированного размера"""
+
+    def __post_init__(self):
+        object.__setattr__(self, "_plan", StructPlan.compile(self.fields))
+
     def __repr__(self) -> str:
         return f"{{ {', '.join(map(str, self.fields))} }}"
 
-    def read(self, stream: InputStream) -> Result[T, str]:
+    def getStaticSize(self) -> Optional[int]:
+        sizes = tuple(f.getStaticSize() for f in self.fields)
+        return None if None in sizes else sum(sizes)
+
+    def read_raw(self, stream: InputStream) -> T:
+        if self._plan is not None:
+            try:
+                return self._plan.read_raw(stream)
+
+            except BytelangError as e:
+                raise BytelangError(f"Fused fields error: {e}") from e
+
         values = list()
 
         for i, field in enumerate(self.fields):
-            value = field.read(stream)
+            try:
+                values.append(field.read_raw(stream))
 
-            if value.is_err():
-                return err(f"Field {i} error: {value.err().unwrap()}")
+            except BytelangError as e:
+                raise BytelangError(f"Field {i} error: {e}") from e
 
-            values.append(value.unwrap())
+        return values
 
-        return ok(values)
-
-    def write(self, stream: OutputStream, value: T) -> Result[None, str]:
+    def write_raw(self, stream: OutputStream, value: T) -> None:
         if len(value) != len(self.fields):
-            return err(f"Value/fields count mismatch: {len(value)} vs {len(self.fields)}")
+            raise BytelangError(f"Value/fields count mismatch: {len(value)} vs {len(self.fields)}")
 
-        for i, (field, item) in enumerate(zip(self.fields, value)):
-            result = field.write(stream, item)
+        if self._plan is not None:
+            try:
+                return self._plan.write_raw(stream, value)
 
-            if result.is_err():
-                return err(f"Field {i} write error: {result}")
+            except BytelangError as e:
+                raise BytelangError(f"Fused fields write error: {e}") from e
+
+        for i, (field, item) in enumerate(zip(self.fields, value)):
+            try:
+                field.write_raw(stream, item)
 
-        return ok(None)
+            except BytelangError as e:
+                raise BytelangError(f"Field {i} write error: {e}") from e
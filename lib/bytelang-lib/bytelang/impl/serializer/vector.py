@@ -1,11 +1,10 @@
 from dataclasses import dataclass
 from typing import Sequence
 
-from rs.result import Result
-from rs.result import ok
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
 from bytelang.impl.serializer.primitive import PrimitiveSerializer
 
 
@@ -18,42 +17,39 @@ class VectorSerializer[T](Serializer[Sequence[T]]):
     length: PrimitiveSerializer[int]
     """Примитив описывающий длину"""
 
-    def read(self, stream: InputStream) -> Result[Sequence[T], str]:
+    def read_raw(self, stream: InputStream) -> Sequence[T]:
         # Чтение длины вектора
-        length_result = self.length.read(stream)
+        try:
+            length = self.length.read_raw(stream)
 
-        if length_result.is_err():
-            # noinspection PyTypeChecker
-            return length_result.map_err(lambda e: f"Length read error: {e}")
+        except BytelangError as e:
+            raise BytelangError(f"Length read error: {e}") from e
 
-        length = length_result.unwrap()
         items = list()
 
         # Чтение элементов
         for i in range(length):
-            item_result = self.item.read(stream)
+            try:
+                items.append(self.item.read_raw(stream))
 
-            if item_result.is_err():
-                return item_result.map_err(lambda e: f"Item {i} read error: {e}")
+            except BytelangError as e:
+                raise BytelangError(f"Item {i} read error: {e}") from e
 
-            items.append(item_result.unwrap())
+        return items
 
-        return ok(items)
+    def write_raw(self, stream: OutputStream, value: Sequence[T]) -> None:
+        try:
+            self.length.write_raw(stream, len(value))
 
-    def write(self, stream: OutputStream, value: Sequence[T]) -> Result[None, str]:
-        length = len(value)
-        len_result = self.length.write(stream, length)
-
-        if len_result.is_err():
-            return len_result.map_err(lambda e: f"Length write error: {e}")
+        except BytelangError as e:
+            raise BytelangError(f"Length write error: {e}") from e
 
         for i, item in enumerate(value):
-            item_result = self.item.write(stream, item)
-
-            if item_result.is_err():
-                return item_result.map_err(lambda e: f"Item {i} write error: {e}")
+            try:
+                self.item.write_raw(stream, item)
 
-        return ok(None)
+            except BytelangError as e:
+                raise BytelangError(f"Item {i} write error: {e}") from e
 
     def __repr__(self) -> str:
         return f"[{self.length}]{self.item}"
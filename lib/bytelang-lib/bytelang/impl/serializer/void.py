@@ -1,16 +1,19 @@
-from rs.result import Result
-from rs.result import ok
+from typing import Optional
+
 from bytelang.abc.serializer import Serializer
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
 
 
 class VoidSerializer(Serializer[None]):
-    def read(self, stream: InputStream) -> Result[None, str]:
-        return ok(None)
+    def read_raw(self, stream: InputStream) -> None:
+        return None
+
+    def write_raw(self, stream: OutputStream, value: None) -> None:
+        return None
 
-    def write(self, stream: OutputStream, value: None) -> Result[None, str]:
-        return ok(None)
+    def getStaticSize(self) -> Optional[int]:
+        return 0
 
     def __repr__(self) -> str:
         return "void"
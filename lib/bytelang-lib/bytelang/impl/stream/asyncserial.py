@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Final
+from typing import Optional
+
+from serial import Serial as SerialPort
+
+from bytelang.abc.stream import AsyncStream
+from bytelang.exceptions import BytelangError
+
+
+class AsyncSerialStream(AsyncStream):
+    """
+    Асинхронный поток по последовательному порту.
+
+    На POSIX порт открывается неблокирующим и ожидается через add_reader цикла событий.
+    На Windows (нет файлового дескриптора) блокирующее чтение уходит в executor.
+    Запись копится в очереди и выполняется отдельным потоком записи, так что write_raw не блокирует цикл событий.
+    """
+
+    _use_selector: Final = os.name == "posix"
+
+    def __init__(self, port: str, baud: int) -> None:
+        self._serial_port: Final = SerialPort(port=port, baudrate=baud, timeout=0 if self._use_selector else None)
+
+        self._writer: Final = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"serial-write-{port}")
+        self._lock: Final = Lock()
+        self._pending = bytearray()
+        """Данные, ещё не переданные потоку записи"""
+        self._flushing: Optional[Future] = None
+        """Задача записи очереди (None - очередь пуста и записи нет)"""
+        self._write_error: Optional[BytelangError] = None
+        """Ошибка записи, ещё не переданная drain"""
+
+    async def read_some_raw(self, max_size: int) -> bytes:
+        try:
+            if not self._use_selector:
+                return await asyncio.get_running_loop().run_in_executor(None, self._readSomeBlocking, max_size)
+
+            while True:
+                data = self._serial_port.read(min(self._serial_port.in_waiting, max_size))
+
+                if len(data) > 0:
+                    return data
+
+                await self._waitReadable()
+
+        except Exception as e:
+            raise BytelangError(f"AsyncSerialStream read error: {e}") from e
+
+    def _readSomeBlocking(self, max_size: int) -> bytes:
+        return self._serial_port.read(max(1, min(self._serial_port.in_waiting, max_size)))
+
+    async def _waitReadable(self) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        fd = self._serial_port.fileno()
+
+        def _ready() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        loop.add_reader(fd, _ready)
+
+        try:
+            await future
+
+        finally:
+            loop.remove_reader(fd)
+
+    def write_raw(self, data: bytes) -> None:
+        with self._lock:
+            self._pending += data
+
+            if self._flushing is None:
+                self._flushing = self._writer.submit(self._flushPending)
+
+    def _flushPending(self) -> None:
+        """Записывать очередь, пока она не опустеет (поток записи)"""
+        while True:
+            with self._lock:
+                if len(self._pending) == 0:
+                    self._flushing = None
+                    return
+
+                data, self._pending = self._pending, bytearray()
+
+            try:
+                self._serial_port.write(data)
+
+            except Exception as e:
+                with self._lock:
+                    # Остаток очереди после ошибки уже не дойдёт целыми кадрами
+                    self._pending.clear()
+                    self._write_error = BytelangError(f"AsyncSerialStream write error: {e}")
+
+    async def drain(self) -> None:
+        with self._lock:
+            flushing = self._flushing
+
+        if flushing is not None:
+            await asyncio.wrap_future(flushing)
+
+        with self._lock:
+            error, self._write_error = self._write_error, None
+
+        if error is not None:
+            raise error
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._serial_port.port}>"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+from threading import Lock
+from typing import Final
+from typing import Optional
+
+from bytelang.abc.stream import AsyncStream
+
+
+class _Channel:
+    """Односторонний канал байт: запись из любого потока, ожидание в цикле событий"""
+
+    def __init__(self) -> None:
+        self._data: Final = bytearray()
+        self._lock: Final = Lock()
+        self._waiter: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = None
+
+    def put(self, data: bytes) -> None:
+        """Дописать данные и разбудить ожидающего читателя"""
+        with self._lock:
+            self._data.extend(data)
+            waiter, self._waiter = self._waiter, None
+
+        if waiter is not None:
+            loop, future = waiter
+            loop.call_soon_threadsafe(self._wake, future)
+
+    @staticmethod
+    def _wake(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    async def take(self, max_size: int) -> bytes:
+        """Дождаться данных и забрать до max_size байт"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self._lock:
+                if len(self._data) > 0:
+                    data = bytes(self._data[:max_size])
+                    del self._data[:max_size]
+                    return data
+
+                future = loop.create_future()
+                self._waiter = (loop, future)
+
+            await future
+
+
+class AsyncVirtualStream(AsyncStream):
+    """Асинхронный поток в памяти: пара связанных потоков для тестов и эмуляции"""
+
+    def __init__(self, rx: _Channel, tx: _Channel) -> None:
+        self._rx: Final = rx
+        self._tx: Final = tx
+
+    async def read_some_raw(self, max_size: int) -> bytes:
+        return await self._rx.take(max_size)
+
+    def write_raw(self, data: bytes) -> None:
+        self._tx.put(data)
+
+    @classmethod
+    def create_pair(cls) -> tuple[AsyncVirtualStream, AsyncVirtualStream]:
+        """Создает пару связанных асинхронных потоков"""
+        a_to_b = _Channel()
+        b_to_a = _Channel()
+
+        return cls(rx=b_to_a, tx=a_to_b), cls(rx=a_to_b, tx=b_to_a)
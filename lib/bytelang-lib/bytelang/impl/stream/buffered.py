@@ -0,0 +1,72 @@
+from collections.abc import Buffer
+from typing import Final
+
+from bytelang.abc.stream import Stream
+from bytelang.core.ringbuffer import RingBuffer
+from bytelang.exceptions import BytelangError
+
+
+class BufferedStream(Stream):
+    """
+    Поток с упреждающим чтением.
+
+    Источник опрашивается через read_some: всё, что уже пришло, забирается
+    одним обращением в кольцевой буфер, а чтения полей обслуживаются из памяти.
+    Запись передаётся источнику без изменений.
+    """
+
+    def __init__(self, stream: Stream, capacity: int = 4096) -> None:
+        self._stream: Final = stream
+        self._ring: Final = RingBuffer(capacity)
+
+    def _fill(self, size: int) -> None:
+        """Дочитывать источник, пока в буфере меньше size байт"""
+        while len(self._ring) < size:
+            self._ring.write(self._stream.read_some_raw(self._ring.getFree()))
+
+    def read_raw(self, size: int) -> bytes:
+        if size < 0:
+            raise BytelangError(f"Invalid read size: {size}. Size must be non-negative")
+
+        if size > self._ring.getCapacity():
+            head = self._ring.read(size)
+            return head + self._stream.read_raw(size - len(head))
+
+        self._fill(size)
+        return self._ring.read(size)
+
+    def read_view_raw(self, size: int) -> Buffer:
+        if not (0 <= size <= self._ring.getCapacity()):
+            return self.read_raw(size)
+
+        self._fill(size)
+        view = self._ring.view(size)
+
+        if view is None:
+            return self._ring.read(size)
+
+        self._ring.skip(size)
+        return view
+
+    def readinto_raw(self, buffer: bytearray | memoryview) -> int:
+        size = len(buffer)
+
+        if size > self._ring.getCapacity():
+            return super().readinto_raw(buffer)
+
+        self._fill(size)
+        return self._ring.readinto(buffer)
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        self._fill(1)
+        return self._ring.read(max_size)
+
+    def write_raw(self, data: bytes) -> None:
+        self._stream.write_raw(data)
+
+    def available(self) -> int:
+        """Количество байт, уже считанных из источника и ожидающих разбора"""
+        return len(self._ring)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._stream}>"
@@ -1,11 +1,11 @@
+from collections.abc import Buffer
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Final
 
-from rs.result import Result
-from rs.result import err
-from rs.result import ok
 from bytelang.abc.stream import InputStream
 from bytelang.abc.stream import OutputStream
+from bytelang.exceptions import BytelangError
 
 
 @dataclass
@@ -15,7 +15,7 @@ class ByteBufferInputStream(InputStream):
     _data: bytes
     _index: int = field(default=0, init=False)
 
-    def read(self, size: int) -> Result[bytes, str]:
+    def read_raw(self, size: int) -> bytes:
         """
         Считывает указанное количество байтов из буфера.
 
@@ -23,14 +23,17 @@ class ByteBufferInputStream(InputStream):
             size: Количество байтов для чтения (должно быть положительным)
 
         Returns:
-            Result с прочитанными данными или описанием ошибки
+            Прочитанные данные
+
+        Raises:
+            BytelangError: При неверном размере или чтении за концом буфера
         """
 
         if size < 0:
-            return err(f"Invalid read size: {size}. Size must be non-negative")
+            raise BytelangError(f"Invalid read size: {size}. Size must be non-negative")
 
         if self._index >= len(self._data):
-            return err("Read beyond end of buffer")
+            raise BytelangError("Read beyond end of buffer")
 
         # Вычисляем доступные данные
         available = len(self._data) - self._index
@@ -40,7 +43,7 @@ class ByteBufferInputStream(InputStream):
         result = self._data[self._index:self._index + read_size]
         self._index += read_size
 
-        return ok(result)
+        return result
 
     def available(self) -> int:
         """Возвращает количество доступных для чтения байтов"""
@@ -51,6 +54,48 @@ class ByteBufferInputStream(InputStream):
         self._index = 0
 
 
+class ByteViewInputStream(InputStream):
+    """
+    Поток ввода поверх memoryview приёмного буфера.
+
+    Срезы отдаются без копирования, поэтому сериализаторы декодируют поля
+    прямо из исходного буфера. Размер буфера нельзя менять, пока поток жив.
+    """
+
+    def __init__(self, data: Buffer) -> None:
+        self._view: Final = memoryview(data)
+        self._index = 0
+
+    def read_view_raw(self, size: int) -> memoryview:
+        if size < 0:
+            raise BytelangError(f"Invalid read size: {size}. Size must be non-negative")
+
+        if self._index >= len(self._view):
+            raise BytelangError("Read beyond end of buffer")
+
+        start = self._index
+        self._index = min(start + size, len(self._view))
+
+        return self._view[start:self._index]
+
+    def read_raw(self, size: int) -> bytes:
+        return bytes(self.read_view_raw(size))
+
+    def readinto_raw(self, buffer: bytearray | memoryview) -> int:
+        view = self.read_view_raw(len(buffer))
+        size = len(view)
+        memoryview(buffer)[:size] = view
+        return size
+
+    def available(self) -> int:
+        """Возвращает количество доступных для чтения байтов"""
+        return len(self._view) - self._index
+
+    def reset(self) -> None:
+        """Сбрасывает позицию чтения в начало буфера"""
+        self._index = 0
+
+
 @dataclass(frozen=True)
 class ByteBufferOutputStream(OutputStream):
     """
@@ -62,18 +107,18 @@ class ByteBufferOutputStream(OutputStream):
 
     buffer: bytearray = field(default_factory=bytearray, init=False)
 
-    def write(self, data: bytes) -> Result[None, str]:
+    def write_raw(self, data: bytes) -> None:
         """
         Записывает данные в буфер.
 
         Args:
             data: Байтовые данные для записи
 
-        Returns:
-            Успешный Result или ошибку, если данные не являются bytes
+        Raises:
+            BytelangError: Если данные не являются bytes
         """
 
         if not isinstance(data, bytes):
-            return err(f"Invalid data type: {type(data)}. Expected bytes")
+            raise BytelangError(f"Invalid data type: {type(data)}. Expected bytes")
 
-        return ok(self.buffer.extend(data))
+        self.buffer.extend(data)
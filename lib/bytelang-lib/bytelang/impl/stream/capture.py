@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import mmap
+from collections.abc import Buffer
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from struct import Struct
+from threading import Event
+from threading import Lock
+from threading import Thread
+from time import perf_counter
+from time import perf_counter_ns
+from time import sleep
+from time import time_ns
+from typing import Final
+from typing import Iterator
+from typing import Optional
+
+from bytelang.abc.stream import OutputStream
+from bytelang.abc.stream import Stream
+from bytelang.exceptions import BytelangError
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+
+_MAGIC: Final = b"BLCAP"
+_VERSION: Final = 1
+
+_FILE_HEADER: Final = Struct("<5sBQ")
+"""Сигнатура, версия, время начала записи (нс с эпохи)"""
+_RECORD_HEADER: Final = Struct("<BQI")
+"""Направление, время от начала записи (мкс), длина данных"""
+
+
+class CaptureDirection(IntEnum):
+    """Направление записанного фрагмента"""
+
+    RX = 0
+    """Принято из потока"""
+    TX = 1
+    """Записано в поток"""
+
+
+@dataclass(frozen=True)
+class CaptureRecord:
+    """Фрагмент обмена из файла записи"""
+
+    direction: CaptureDirection
+    timestamp_secs: float
+    """Время от начала записи"""
+    data: memoryview
+    """Данные (срез отображения файла: действителен, пока открыт CaptureReader)"""
+
+
+@dataclass(frozen=True)
+class CaptureSummary:
+    """Сводка файла записи"""
+
+    records: int
+    rx_bytes: int
+    tx_bytes: int
+    duration_secs: float
+    """Время последнего фрагмента"""
+
+
+class CaptureStream(Stream):
+    """
+    Обёртка потока, дописывающая принятые и переданные фрагменты с отметками времени в файл записи.
+
+    Формат: заголовок файла, затем записи "направление u8, время u64 (мкс), длина u32, данные".
+    Каждый кадр записи (OutputStream.frame) сохраняется одной записью TX.
+    Запись в файл буферизована и сбрасывается фоновым потоком раз в flush_secs
+    (даже если обмен затих) и при close.
+    """
+
+    def __init__(self, stream: Stream, path: Path, flush_secs: float = 1.0) -> None:
+        self._stream: Final = stream
+        self._path: Final = path
+        self._flush_secs: Final = flush_secs
+
+        self._lock: Final = Lock()
+        self._file: Final = open(path, "wb")
+        self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION, time_ns()))
+
+        self._start_ns: Final = perf_counter_ns()
+        self._dirty = False
+        """Есть записи, не сброшенные в файл"""
+
+        self._closed: Final = Event()
+        self._flusher: Final = Thread(target=self._flushLoop, name=f"capture-{path.name}", daemon=True)
+        self._flusher.start()
+
+    def _record(self, direction: CaptureDirection, data: Buffer) -> None:
+        size = memoryview(data).nbytes
+
+        if size == 0:
+            return
+
+        timestamp_us = (perf_counter_ns() - self._start_ns) // 1000
+
+        with self._lock:
+            if self._file.closed:
+                return
+
+            self._file.write(_RECORD_HEADER.pack(direction, timestamp_us, size))
+            self._file.write(data)
+            self._dirty = True
+
+    def _flushLoop(self) -> None:
+        while not self._closed.wait(self._flush_secs):
+            self.flush()
+
+    # Чтение
+
+    def read_raw(self, size: int) -> bytes:
+        data = self._stream.read_raw(size)
+        self._record(CaptureDirection.RX, data)
+        return data
+
+    def read_view_raw(self, size: int) -> Buffer:
+        data = self._stream.read_view_raw(size)
+        self._record(CaptureDirection.RX, data)
+        return data
+
+    def readinto_raw(self, buffer: bytearray | memoryview) -> int:
+        size = self._stream.readinto_raw(buffer)
+        self._record(CaptureDirection.RX, memoryview(buffer)[:size])
+        return size
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        data = self._stream.read_some_raw(max_size)
+        self._record(CaptureDirection.RX, data)
+        return data
+
+    def available(self) -> int:
+        return self._stream.available()
+
+    def resync(self) -> int:
+        return self._stream.resync()
+
+    def endFrame(self) -> int:
+        return self._stream.endFrame()
+
+    # Запись
+
+    @contextmanager
+    def frame(self) -> Iterator[OutputStream]:
+        buffer = ByteBufferOutputStream()
+        yield buffer
+
+        data = bytes(buffer.buffer)
+
+        with self._stream.frame() as out:
+            out.write_raw(data)
+
+        self._record(CaptureDirection.TX, data)
+
+    def write_raw(self, data: bytes) -> None:
+        self._stream.write_raw(data)
+        self._record(CaptureDirection.TX, data)
+
+    def flush(self) -> None:
+        """Сбросить записанное в файл"""
+        with self._lock:
+            if self._dirty and not self._file.closed:
+                self._file.flush()
+                self._dirty = False
+
+    def close(self) -> None:
+        """Сбросить и закрыть файл записи (сам поток остаётся открытым)"""
+        self._closed.set()
+        self._flusher.join()
+
+        with self._lock:
+            self._file.close()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._stream} -> {self._path.name}>"
+
+
+class CaptureReader:
+    """
+    Чтение файла записи через отображение в память: фрагменты отдаются срезами без копирования.
+    Недописанная последняя запись (прерванная запись) отбрасывается.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path: Final = path
+
+        with open(path, "rb") as f:
+            try:
+                self._mmap: Final = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            except ValueError as e:
+                raise BytelangError(f"Invalid capture file {path.name}: {e}") from e
+
+        if len(self._mmap) < _FILE_HEADER.size:
+            self._mmap.close()
+            raise BytelangError(f"Invalid capture file {path.name}: too short")
+
+        magic, version, start_ns = _FILE_HEADER.unpack_from(self._mmap)
+
+        if magic != _MAGIC or version != _VERSION:
+            self._mmap.close()
+            raise BytelangError(f"Invalid capture file {path.name}: bad header")
+
+        self.start_ns: Final[int] = start_ns
+        """Время начала записи (нс с эпохи)"""
+
+        self._view: Final = memoryview(self._mmap)
+
+    def iterRecords(self, direction: Optional[CaptureDirection] = None) -> Iterator[CaptureRecord]:
+        """Перебрать фрагменты (только указанного направления, если задано)"""
+        view = self._view
+        end = len(view)
+        offset = _FILE_HEADER.size
+        header_size = _RECORD_HEADER.size
+        unpack = _RECORD_HEADER.unpack_from
+
+        while offset + header_size <= end:
+            kind, timestamp_us, size = unpack(view, offset)
+            start = offset + header_size
+            offset = start + size
+
+            if offset > end:
+                return
+
+            if direction is None or kind == direction:
+                yield CaptureRecord(CaptureDirection(kind), timestamp_us * 1e-6, view[start:offset])
+
+    def getSummary(self) -> CaptureSummary:
+        """Сводка по файлу (проход по заголовкам записей)"""
+        records = 0
+        sizes = [0, 0]
+        timestamp_us = 0
+
+        view = self._view
+        end = len(view)
+        offset = _FILE_HEADER.size
+        header_size = _RECORD_HEADER.size
+        unpack = _RECORD_HEADER.unpack_from
+
+        while offset + header_size <= end:
+            kind, timestamp_us, size = unpack(view, offset)
+            offset += header_size + size
+
+            if offset > end:
+                break
+
+            records += 1
+            sizes[kind] += size
+
+        return CaptureSummary(records, sizes[CaptureDirection.RX], sizes[CaptureDirection.TX], timestamp_us * 1e-6)
+
+    def close(self) -> None:
+        """Закрыть отображение (если выданные срезы ещё живы - оно освободится вместе с последним)"""
+        self._view.release()
+
+        try:
+            self._mmap.close()
+
+        except BufferError:
+            pass
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._path.name}>"
+
+
+@dataclass(frozen=True)
+class ReplayStats:
+    """Метрики воспроизведения"""
+
+    chunks: int
+    """Выдано принятых фрагментов"""
+    rx_bytes: int
+    """Выдано принятых байт"""
+    tx_bytes: int
+    """Отброшено байт, записанных в поток"""
+    lag_secs: float
+    """Наибольшее отставание от исходного времени (только при realtime)"""
+
+
+class ReplayStream(Stream):
+    """
+    Поток, воспроизводящий принятые фрагменты файла записи.
+
+    realtime=True выдаёт фрагменты в исходном темпе (с множителем speed),
+    иначе - с наибольшей скоростью: весь остаток записи считается доступным,
+    так что Protocol.pull_many разбирает полные пакеты.
+    Записанное в поток отбрасывается. После конца записи чтение завершается BytelangError.
+    """
+
+    def __init__(self, path: Path, realtime: bool = False, speed: float = 1.0) -> None:
+        assert speed > 0
+
+        self._reader: Final = CaptureReader(path)
+        self._realtime: Final = realtime
+        self._speed: Final = speed
+
+        self._records: Final = self._reader.iterRecords(CaptureDirection.RX)
+        self._chunk = memoryview(b"")
+        self._offset = 0
+        self._left = self._reader.getSummary().rx_bytes
+        """Ещё не выданные принятые байты"""
+        self._origin: Optional[float] = None
+        """Момент perf_counter, соответствующий началу записи"""
+
+        self._chunks = 0
+        self._rx_bytes = 0
+        self._tx_bytes = 0
+        self._lag_secs = 0.0
+
+    def _nextChunk(self) -> None:
+        record = next(self._records, None)
+
+        if record is None:
+            raise BytelangError(f"{self._reader} replay finished")
+
+        if self._realtime:
+            due = record.timestamp_secs / self._speed
+
+            if self._origin is None:
+                self._origin = perf_counter() - due
+
+            delay = self._origin + due - perf_counter()
+
+            if delay > 0:
+                sleep(delay)
+
+            else:
+                self._lag_secs = max(self._lag_secs, -delay)
+
+        self._chunks += 1
+        self._chunk = record.data
+        self._offset = 0
+
+    def _remaining(self) -> int:
+        return len(self._chunk) - self._offset
+
+    def _take(self, size: int) -> memoryview:
+        view = self._chunk[self._offset:self._offset + size]
+        self._offset += len(view)
+        self._left -= len(view)
+        self._rx_bytes += len(view)
+        return view
+
+    def read_view_raw(self, size: int) -> Buffer:
+        if size < 0:
+            raise BytelangError(f"Invalid read size: {size}. Size must be non-negative")
+
+        if self._remaining() == 0 and size > 0:
+            self._nextChunk()
+
+        if size <= self._remaining():
+            return self._take(size)
+
+        # Поле на стыке фрагментов
+        out = bytearray()
+
+        while len(out) < size:
+            if self._remaining() == 0:
+                self._nextChunk()
+
+            out += self._take(size - len(out))
+
+        return out
+
+    def read_raw(self, size: int) -> bytes:
+        return bytes(self.read_view_raw(size))
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        if self._remaining() == 0:
+            self._nextChunk()
+
+        return bytes(self._take(max_size))
+
+    def available(self) -> int:
+        return self._remaining() if self._realtime else self._left
+
+    def write_raw(self, data: bytes) -> None:
+        self._tx_bytes += len(data)
+
+    def getStats(self) -> ReplayStats:
+        """Получить метрики воспроизведения"""
+        return ReplayStats(self._chunks, self._rx_bytes, self._tx_bytes, self._lag_secs)
+
+    def close(self) -> None:
+        """Закрыть файл записи"""
+        self._chunk = memoryview(b"")
+        self._records.close()
+        self._reader.close()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._reader}>"
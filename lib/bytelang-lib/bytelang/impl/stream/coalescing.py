@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from collections.abc import Buffer
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Condition
+from threading import Thread
+from time import monotonic
+from typing import Any
+from typing import Callable
+from typing import Final
+from typing import Iterator
+
+from bytelang.abc.stream import OutputStream
+from bytelang.abc.stream import Stream
+from bytelang.exceptions import BytelangError
+
+
+@dataclass(frozen=True)
+class WriterStats:
+    """Метрики объединяющего писателя"""
+
+    pending_frames: int
+    """Кадров в очереди"""
+    pending_bytes: int
+    """Байт в очереди"""
+    frames: int
+    """Всего поставлено кадров"""
+    flushes: int
+    """Выполнено записей в поток"""
+    flushed_bytes: int
+    """Всего записано байт"""
+    max_flush_bytes: int
+    """Наибольший размер одной записи"""
+    errors: int
+    """Неудачных записей"""
+
+    def getAverageFlushBytes(self) -> float:
+        """Средний размер записи"""
+        return self.flushed_bytes / self.flushes if self.flushes > 0 else 0.0
+
+    def getAverageFlushFrames(self) -> float:
+        """Среднее количество кадров на запись"""
+        return (self.frames - self.pending_frames) / self.flushes if self.flushes > 0 else 0.0
+
+
+class _PendingOutput(OutputStream):
+    """Дописывает кадр в буфер очереди"""
+
+    def __init__(self, buffer: bytearray) -> None:
+        self.buffer = buffer
+
+    def write_raw(self, data: bytes) -> None:
+        self.buffer += data
+
+
+class CoalescingStream(Stream):
+    """
+    Поток с объединением записи.
+
+    Кадры сериализуются прямо в переиспользуемый буфер очереди, а отдельный
+    поток-писатель сбрасывает накопленное одной записью, выждав latency_secs
+    после первого кадра пачки (или раньше, если набралось max_batch_bytes).
+    Чтение передаётся источнику без изменений.
+    """
+
+    def __init__(
+            self,
+            stream: Stream,
+            *,
+            latency_secs: float = 0.002,
+            max_batch_bytes: int = 4096,
+            on_error: Callable[[str], Any] = lambda _: None
+    ) -> None:
+        self._stream: Final = stream
+        self._latency_secs: Final = latency_secs
+        self._max_batch_bytes: Final = max_batch_bytes
+        self._on_error: Final = on_error
+
+        self._condition: Final = Condition()
+        self._pending = bytearray()
+        self._spare = bytearray()
+        self._output: Final = _PendingOutput(self._pending)
+        self._closed = False
+
+        self._pending_frames = 0
+        self._frames = 0
+        self._flushes = 0
+        self._flushed_bytes = 0
+        self._max_flush_bytes = 0
+        self._errors = 0
+        self._in_flight = False
+
+        self._writer: Final = Thread(target=self._writerLoop, name=f"{self}-writer", daemon=True)
+        self._writer.start()
+
+    @contextmanager
+    def frame(self) -> Iterator[OutputStream]:
+        with self._condition:
+            if self._closed:
+                raise BytelangError(f"{self} is closed")
+
+            start = len(self._pending)
+
+            try:
+                yield self._output
+
+            except BaseException:
+                # Недописанный кадр не должен попасть в поток
+                del self._pending[start:]
+                raise
+
+            if len(self._pending) > start:
+                self._pending_frames += 1
+                self._frames += 1
+                self._condition.notify_all()
+
+    def write_raw(self, data: bytes) -> None:
+        with self.frame() as out:
+            out.write_raw(data)
+
+    def _writerLoop(self) -> None:
+        while True:
+            with self._condition:
+                while len(self._pending) == 0 and not self._closed:
+                    self._condition.wait()
+
+                if len(self._pending) == 0:
+                    return
+
+                deadline = monotonic() + self._latency_secs
+
+                while len(self._pending) < self._max_batch_bytes and not self._closed:
+                    remaining = deadline - monotonic()
+
+                    if remaining <= 0:
+                        break
+
+                    self._condition.wait(remaining)
+
+                batch = self._swap()
+
+            self._flush(batch)
+
+    def _swap(self) -> bytearray:
+        """Забрать накопленное, подставив чистый буфер (вызывается под блокировкой)"""
+        batch = self._pending
+        self._pending, self._spare = self._spare, batch
+        self._output.buffer = self._pending
+        self._pending_frames = 0
+        self._in_flight = True
+        return batch
+
+    def _flush(self, batch: bytearray) -> None:
+        size = len(batch)
+        failed = True
+
+        try:
+            self._stream.write_raw(bytes(batch))
+            failed = False
+
+        except Exception as e:
+            # Любая ошибка записи не должна останавливать писателя: иначе flush() ждал бы вечно
+            self._on_error(f"{self} flush error: {e!r}")
+
+        finally:
+            batch.clear()
+            self._finishFlush(size, failed)
+
+    def _finishFlush(self, size: int, failed: bool) -> None:
+        with self._condition:
+            self._in_flight = False
+
+            if failed:
+                self._errors += 1
+
+            else:
+                self._flushes += 1
+                self._flushed_bytes += size
+                self._max_flush_bytes = max(self._max_flush_bytes, size)
+
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Дождаться, пока очередь будет записана в поток"""
+        with self._condition:
+            self._condition.notify_all()
+
+            while len(self._pending) > 0 or self._in_flight:
+                self._condition.wait()
+
+    def close(self) -> None:
+        """Записать остаток очереди и остановить поток-писатель"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._writer.join()
+
+    def getStats(self) -> WriterStats:
+        """Получить метрики очереди"""
+        with self._condition:
+            return WriterStats(
+                pending_frames=self._pending_frames,
+                pending_bytes=len(self._pending),
+                frames=self._frames,
+                flushes=self._flushes,
+                flushed_bytes=self._flushed_bytes,
+                max_flush_bytes=self._max_flush_bytes,
+                errors=self._errors,
+            )
+
+    def read_raw(self, size: int) -> bytes:
+        return self._stream.read_raw(size)
+
+    def read_view_raw(self, size: int) -> Buffer:
+        return self._stream.read_view_raw(size)
+
+    def readinto_raw(self, buffer: bytearray | memoryview) -> int:
+        return self._stream.readinto_raw(buffer)
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        return self._stream.read_some_raw(max_size)
+
+    def available(self) -> int:
+        return self._stream.available()
+
+    def resync(self) -> int:
+        return self._stream.resync()
+
+    def endFrame(self) -> int:
+        return self._stream.endFrame()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._stream}>"
@@ -0,0 +1,39 @@
+from collections.abc import Buffer
+from typing import Final
+
+from bytelang.abc.stream import InputStream
+from bytelang.abc.stream import OutputStream
+
+
+class CountingOutputStream(OutputStream):
+    """Обёртка потока вывода, подсчитывающая записанные байты"""
+
+    def __init__(self, stream: OutputStream) -> None:
+        self._stream: Final = stream
+
+        self.tx_bytes = 0
+        """Записано байт"""
+
+    def write_raw(self, data: bytes) -> None:
+        self._stream.write_raw(data)
+        self.tx_bytes += len(data)
+
+
+class CountingInputStream(InputStream):
+    """Обёртка потока ввода, подсчитывающая считанные байты"""
+
+    def __init__(self, stream: InputStream) -> None:
+        self._stream: Final = stream
+
+        self.rx_bytes = 0
+        """Считано байт"""
+
+    def read_raw(self, size: int) -> bytes:
+        data = self._stream.read_raw(size)
+        self.rx_bytes += len(data)
+        return data
+
+    def read_view_raw(self, size: int) -> Buffer:
+        data = self._stream.read_view_raw(size)
+        self.rx_bytes += len(data)
+        return data
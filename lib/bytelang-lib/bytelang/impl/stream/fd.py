@@ -0,0 +1,58 @@
+import fcntl
+import os
+import struct
+import termios
+from typing import Final
+
+from bytelang.abc.stream import Stream
+from bytelang.exceptions import BytelangError
+
+
+class FdStream(Stream):
+    """Поток ввода-вывода поверх файлового дескриптора POSIX (pty, pipe, сокет)"""
+
+    def __init__(self, fd: int) -> None:
+        self._fd: Final = fd
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        try:
+            data = os.read(self._fd, max(1, max_size))
+
+        except OSError as e:
+            raise BytelangError(f"FdStream read error: {e}") from e
+
+        if len(data) == 0:
+            raise BytelangError("FdStream closed")
+
+        return data
+
+    def read_raw(self, size: int) -> bytes:
+        if size < 0:
+            raise BytelangError(f"Invalid read size: {size}. Size must be non-negative")
+
+        data = b""
+
+        while len(data) < size:
+            data += self.read_some_raw(size - len(data))
+
+        return data
+
+    def write_raw(self, data: bytes) -> None:
+        view = memoryview(data)
+
+        try:
+            while len(view) > 0:
+                view = view[os.write(self._fd, view):]
+
+        except OSError as e:
+            raise BytelangError(f"FdStream write error: {e}") from e
+
+    def available(self) -> int:
+        try:
+            return struct.unpack("i", fcntl.ioctl(self._fd, termios.FIONREAD, b"\0\0\0\0"))[0]
+
+        except OSError:
+            return 0
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._fd}>"
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from binascii import crc_hqx
+from collections.abc import Buffer
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Final
+from typing import Iterator
+from typing import Optional
+
+from bytelang.abc.stream import OutputStream
+from bytelang.abc.stream import Stream
+from bytelang.exceptions import BytelangError
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+
+_DELIMITER: Final = b"\x00"
+_CRC_SIZE: Final = 2
+_CRC_INIT: Final = 0xFFFF
+
+
+def cobsEncode(data: Buffer) -> bytes:
+    """Закодировать COBS: в результате нет нулевых байт"""
+    out = bytearray()
+
+    for block in bytes(data).split(_DELIMITER):
+        while len(block) >= 0xFE:
+            out.append(0xFF)
+            out += block[:0xFE]
+            block = block[0xFE:]
+
+        out.append(len(block) + 1)
+        out += block
+
+    return bytes(out)
+
+
+def cobsDecode(data: Buffer) -> bytes:
+    """Раскодировать COBS (BytelangError при повреждённых данных)"""
+    data = memoryview(data)
+    out = bytearray()
+    index = 0
+
+    while index < len(data):
+        code = data[index]
+        end = index + code
+
+        if code == 0 or end > len(data):
+            raise BytelangError(f"Invalid COBS block at {index}")
+
+        out += data[index + 1:end]
+        index = end
+
+        if code != 0xFF and index < len(data):
+            out += _DELIMITER
+
+    return bytes(out)
+
+
+@dataclass(frozen=True)
+class FramingStats:
+    """Метрики кадрированного потока"""
+
+    frames: int
+    """Принято целых кадров"""
+    bad_frames: int
+    """Отброшено повреждённых кадров (COBS, CRC или ошибка разбора)"""
+    discarded_bytes: int
+    """Отброшено байт при восстановлении выравнивания"""
+
+
+class FramedStream(Stream):
+    """
+    Кадрированный поток: каждый кадр - COBS(данные + CRC16) с нулевым разделителем.
+
+    Чтение идёт в пределах текущего целого кадра: повреждённые кадры отбрасываются
+    ещё до разбора, а после ошибки разбора resync пропускает остаток кадра,
+    так что следующий кадр находится одним поиском разделителя, а не перебором байт.
+    Каждый кадр записи (OutputStream.frame) уходит одним кадром.
+    """
+
+    def __init__(self, stream: Stream, chunk_size: int = 4096) -> None:
+        self._stream: Final = stream
+        self._chunk_size: Final = chunk_size
+
+        self._rx = b""
+        """Принятые, ещё не разобранные на кадры байты"""
+        self._rx_offset = 0
+        self._frame = memoryview(b"")
+        """Данные текущего кадра"""
+        self._frame_offset = 0
+
+        self._frames = 0
+        self._bad_frames = 0
+        self._discarded_bytes = 0
+
+    # Запись
+
+    @contextmanager
+    def frame(self) -> Iterator[OutputStream]:
+        buffer = ByteBufferOutputStream()
+        yield buffer
+
+        payload = bytes(buffer.buffer)
+        encoded = cobsEncode(payload + crc_hqx(payload, _CRC_INIT).to_bytes(_CRC_SIZE, "big")) + _DELIMITER
+
+        with self._stream.frame() as out:
+            out.write_raw(encoded)
+
+    def write_raw(self, data: bytes) -> None:
+        with self.frame() as out:
+            out.write_raw(data)
+
+    # Чтение
+
+    def _receive(self) -> bytes:
+        """Дождаться следующего разделителя и вернуть закодированный кадр"""
+        while True:
+            end = self._rx.find(_DELIMITER, self._rx_offset)
+
+            if end != -1:
+                encoded = self._rx[self._rx_offset:end]
+                self._rx_offset = end + 1
+                return encoded
+
+            self._rx = self._rx[self._rx_offset:] + self._stream.read_some_raw(self._chunk_size)
+            self._rx_offset = 0
+
+    def _decode(self, encoded: bytes) -> Optional[bytes]:
+        """Данные кадра или None, если кадр повреждён"""
+        try:
+            decoded = cobsDecode(encoded)
+
+        except BytelangError:
+            return None
+
+        if len(decoded) < _CRC_SIZE:
+            return None
+
+        payload, crc = decoded[:-_CRC_SIZE], decoded[-_CRC_SIZE:]
+
+        if crc_hqx(payload, _CRC_INIT).to_bytes(_CRC_SIZE, "big") != crc:
+            return None
+
+        return payload
+
+    def _nextFrame(self) -> None:
+        """Перейти к следующему целому кадру"""
+        while True:
+            encoded = self._receive()
+
+            # Пустой участок между разделителями - не ошибка, а выравнивание отправителя
+            if len(encoded) == 0:
+                continue
+
+            payload = self._decode(encoded)
+
+            if payload is not None:
+                break
+
+            self._bad_frames += 1
+            self._discarded_bytes += len(encoded) + 1
+
+        self._frames += 1
+        self._frame = memoryview(payload)
+        self._frame_offset = 0
+
+    def _remaining(self) -> int:
+        return len(self._frame) - self._frame_offset
+
+    def read_view_raw(self, size: int) -> memoryview:
+        if size < 0:
+            raise BytelangError(f"Invalid read size: {size}. Size must be non-negative")
+
+        # Пустое поле в конце кадра не должно забирать следующий кадр
+        if size > 0 and self._remaining() == 0:
+            self._nextFrame()
+
+        if size > self._remaining():
+            raise BytelangError(f"Frame underrun: need {size} bytes, {self._remaining()} left in frame")
+
+        view = self._frame[self._frame_offset:self._frame_offset + size]
+        self._frame_offset += size
+        return view
+
+    def read_raw(self, size: int) -> bytes:
+        return bytes(self.read_view_raw(size))
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        if self._remaining() == 0:
+            self._nextFrame()
+
+        return self.read_raw(min(max_size, self._remaining()))
+
+    def available(self) -> int:
+        """Байт в текущем кадре и ещё не разобранных принятых байт"""
+        return self._remaining() + len(self._rx) - self._rx_offset + self._stream.available()
+
+    def resync(self) -> int:
+        """Отбросить остаток текущего кадра"""
+        remaining = self._remaining()
+
+        if remaining > 0 or self._frame_offset > 0:
+            self._bad_frames += 1
+
+        return self._dropFrame()
+
+    def endFrame(self) -> int:
+        """Отбросить неразобранный хвост кадра (кадр при этом не считается повреждённым)"""
+        return self._dropFrame()
+
+    def _dropFrame(self) -> int:
+        remaining = self._remaining()
+        self._discarded_bytes += remaining
+        self._frame = memoryview(b"")
+        self._frame_offset = 0
+        return remaining
+
+    def getStats(self) -> FramingStats:
+        """Получить метрики приёма"""
+        return FramingStats(self._frames, self._bad_frames, self._discarded_bytes)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._stream}>"
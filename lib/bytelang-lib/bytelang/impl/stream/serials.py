@@ -5,9 +5,7 @@ import serial.tools.list_ports
 from serial import Serial as SerialPort
 
 from bytelang.abc.stream import Stream
-from rs.result import Result
-from rs.result import err
-from rs.result import ok
+from bytelang.exceptions import BytelangError
 
 
 @dataclass
@@ -17,20 +15,30 @@ class SerialStream(Stream):
     def __init__(self, port: str, baud: int) -> None:
         self._serial_port = SerialPort(port=port, baudrate=baud, timeout=None)
 
-    def read(self, size: int) -> Result[bytes, str]:
+    def read_raw(self, size: int) -> bytes:
         try:
-            return ok(self._serial_port.read(size))
+            return self._serial_port.read(size)
 
         except Exception as e:
-            return err(f"SerialStream read error: {e}")
+            raise BytelangError(f"SerialStream read error: {e}") from e
 
-    def write(self, data: bytes) -> Result[None, str]:
+    def read_some_raw(self, max_size: int) -> bytes:
+        try:
+            waiting = self._serial_port.in_waiting
+            return self._serial_port.read(max(1, min(waiting, max_size)))
+
+        except Exception as e:
+            raise BytelangError(f"SerialStream read error: {e}") from e
+
+    def available(self) -> int:
+        return self._serial_port.in_waiting
+
+    def write_raw(self, data: bytes) -> None:
         try:
             self._serial_port.write(data)
-            return ok(None)
 
         except Exception as e:
-            return err(f"SerialStream write error: {e}")
+            raise BytelangError(f"SerialStream write error: {e}") from e
 
     @staticmethod
     def getPorts(exclude: Sequence[str] = ("COM1",)) -> Sequence[str]:
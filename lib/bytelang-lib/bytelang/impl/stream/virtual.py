@@ -1,67 +1,283 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+from dataclasses import dataclass
 from threading import Condition
 from threading import Lock
+from time import monotonic
+from typing import Final
+from typing import Iterator
+from typing import Optional
 
-from rs.result import Result
-from rs.result import ok
+from bytelang.abc.stream import OutputStream
 from bytelang.abc.stream import Stream
+from bytelang.core.ringbuffer import RingBuffer
+from bytelang.exceptions import BytelangError
+
+
+@dataclass(frozen=True)
+class ChannelStats:
+    """Метрики одного направления виртуального потока"""
+
+    capacity: int
+    """Ёмкость буфера"""
+    size: int
+    """Байт в буфере сейчас"""
+    high_water: int
+    """Наибольшее заполнение буфера"""
+    total_bytes: int
+    """Всего передано байт"""
+    blocked_writes: int
+    """Сколько раз писатель ждал освобождения места"""
+
+
+class _FrameOutput(OutputStream):
+    """Собирает кадр перед записью в канал"""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def write_raw(self, data: bytes) -> None:
+        self.buffer += data
+
+
+class _Channel:
+    """
+    Односторонний канал байт поверх кольцевого буфера ограниченной ёмкости.
+    Быстрые пути (данные или место уже есть) берут только блокировку, без обращений к условию
+    """
+
+    def __init__(self, capacity: int, timeout: Optional[float]) -> None:
+        self._ring: Final = RingBuffer(capacity)
+        self._lock: Final = Lock()
+        self._condition: Final = Condition(self._lock)
+        self._timeout: Final = timeout
+
+        self._waiting = 0
+        """Ожидающих на условии: без них оповещение пропускается"""
+        self._writing = False
+        """Писатель ждёт места посреди записи: остальные ждут его, чтобы не вклиниться в его данные"""
+
+        self._high_water = 0
+        self._total_bytes = 0
+        self._blocked_writes = 0
+
+    def _wait(self, deadline: Optional[float], what: str) -> None:
+        """Ждать изменения состояния канала (вызывается под блокировкой)"""
+        remaining = None if deadline is None else deadline - monotonic()
+
+        if remaining is not None and remaining <= 0:
+            raise BytelangError(f"Virtual channel {what} timeout ({self._timeout} s)")
+
+        self._waiting += 1
+
+        try:
+            signaled = self._condition.wait(remaining)
+
+        finally:
+            self._waiting -= 1
+
+        if not signaled:
+            raise BytelangError(f"Virtual channel {what} timeout ({self._timeout} s)")
+
+    def _notify(self) -> None:
+        """Разбудить ожидающих (вызывается под блокировкой)"""
+        if self._waiting > 0:
+            self._condition.notify_all()
+
+    def _deadline(self) -> Optional[float]:
+        return None if self._timeout is None else monotonic() + self._timeout
+
+    def _written(self, size: int) -> None:
+        """Учесть записанное (вызывается под блокировкой)"""
+        self._total_bytes += size
+
+        if len(self._ring) > self._high_water:
+            self._high_water = len(self._ring)
+
+        if self._waiting > 0:
+            self._condition.notify_all()
+
+    def put(self, data: bytes) -> None:
+        """Дописать данные, блокируясь, пока в буфере нет места (данные одного вызова не перемежаются с чужими)"""
+        with self._lock:
+            # Быстрый путь: место есть и никто не дописывает по частям
+            if not self._writing and len(data) <= self._ring.getFree():
+                self._ring.write(data)
+                self._written(len(data))
+                return
+
+            deadline = self._deadline()
+
+            while self._writing:
+                self._wait(deadline, "write")
+
+            self._writing = True
+
+            try:
+                self._putSlow(memoryview(data), deadline)
+
+            finally:
+                self._writing = False
+                self._notify()
+
+    def _putSlow(self, view: memoryview, deadline: Optional[float]) -> None:
+        """Дописывать по частям по мере освобождения места (вызывается под блокировкой)"""
+        while len(view) > 0:
+            if self._ring.getFree() == 0:
+                self._blocked_writes += 1
+
+                while self._ring.getFree() == 0:
+                    self._wait(deadline, "write")
+
+            written = self._ring.write(view)
+            view = view[written:]
+            self._written(written)
+
+    def take(self, size: int) -> bytes:
+        """Забрать ровно size байт, блокируясь, пока их нет"""
+        with self._lock:
+            ring = self._ring
+
+            # Быстрый путь: данные уже пришли
+            if size <= len(ring):
+                data = ring.read(size)
+
+                if self._waiting > 0:
+                    self._condition.notify_all()
+
+                return data
+
+            deadline = self._deadline()
+
+            if size <= ring.getCapacity():
+                while len(ring) < size:
+                    self._wait(deadline, "read")
+
+                data = ring.read(size)
+                self._notify()
+                return data
+
+            # Больше ёмкости буфера: собирать по частям, освобождая место писателю
+            chunks = list[bytes]()
+            remaining = size
+
+            while remaining > 0:
+                while len(ring) == 0:
+                    self._wait(deadline, "read")
+
+                chunk = ring.read(remaining)
+                remaining -= len(chunk)
+                chunks.append(chunk)
+                self._notify()
+
+            return b"".join(chunks)
+
+    def takeSome(self, max_size: int, block: bool) -> bytes:
+        """Забрать до max_size уже пришедших байт (при block - дождавшись хотя бы одного)"""
+        with self._lock:
+            deadline = self._deadline() if block and len(self._ring) == 0 else None
+
+            while block and len(self._ring) == 0:
+                self._wait(deadline, "read")
+
+            data = self._ring.read(max_size)
+
+            self._notify()
+
+            return data
+
+    def takeInto(self, buffer: bytearray | memoryview) -> int:
+        """Заполнить буфер целиком"""
+        out = memoryview(buffer)
+        deadline = self._deadline()
+        done = 0
+
+        with self._lock:
+            while done < len(out):
+                while len(self._ring) == 0:
+                    self._wait(deadline, "read")
+
+                done += self._ring.readinto(out[done:])
+                self._notify()
+
+        return done
+
+    def available(self) -> int:
+        with self._lock:
+            return len(self._ring)
+
+    def getStats(self) -> ChannelStats:
+        with self._lock:
+            return ChannelStats(
+                capacity=self._ring.getCapacity(),
+                size=len(self._ring),
+                high_water=self._high_water,
+                total_bytes=self._total_bytes,
+                blocked_writes=self._blocked_writes,
+            )
 
 
 class VirtualStream(Stream):
-    """Простой поток-заглушка с блокирующим чтением"""
-
-    def __init__(self,
-                 rx_buffer: bytearray,
-                 tx_buffer: bytearray,
-                 rx_lock: Lock,
-                 tx_lock: Lock):
-        self.rx = rx_buffer
-        self.tx = tx_buffer
-        self.rx_lock = rx_lock
-        self.tx_lock = tx_lock
-        self.rx_condition = Condition(rx_lock)
-
-    def write(self, data: bytes) -> Result[None, str]:
-        """Запись данных в буфер передачи"""
-        with self.tx_lock:
-            self.tx.extend(data)
-
-            with self.rx_condition:
-                self.rx_condition.notify_all()
-
-            return ok(None)
-
-    def read(self, size: int) -> Result[bytes, str]:
+    """
+    Поток в памяти: пара связанных потоков для тестов и нагрузочных прогонов.
+
+    Каждое направление - кольцевой буфер ограниченной ёмкости:
+    чтение блокируется, пока данных нет, а запись - пока читатель не освободит место.
+    """
+
+    def __init__(self, rx: _Channel, tx: _Channel) -> None:
+        self._rx: Final = rx
+        self._tx: Final = tx
+
+    @contextmanager
+    def frame(self) -> Iterator[OutputStream]:
+        """Кадр уходит в канал одной записью: одна блокировка на кадр, и кадры писателей не перемежаются"""
+        output = _FrameOutput()
+        yield output
+        self._tx.put(output.buffer)
+
+    def write_raw(self, data: bytes) -> None:
+        """Запись данных, блокирующаяся при заполненном буфере"""
+        self._tx.put(data)
+
+    def read_raw(self, size: int) -> bytes:
         """Блокирующее чтение данных из буфера приема"""
-        with self.rx_condition:
-            while len(self.rx) < size:
-                self.rx_condition.wait()
+        if size < 0:
+            raise BytelangError(f"Invalid read size: {size}. Size must be non-negative")
 
-            data = bytes(self.rx[:size])
-            del self.rx[:size]
-            return ok(data)
+        return self._rx.take(size)
+
+    def readinto_raw(self, buffer: bytearray | memoryview) -> int:
+        return self._rx.takeInto(buffer)
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        """Блокирующее чтение всего, что уже есть в буфере приема"""
+        return self._rx.takeSome(max_size, block=True)
+
+    def read_available(self, max_size: int) -> bytes:
+        """Неблокирующее чтение: до max_size уже пришедших байт (возможно, ни одного)"""
+        return self._rx.takeSome(max_size, block=False)
+
+    def available(self) -> int:
+        return self._rx.available()
+
+    def getRxStats(self) -> ChannelStats:
+        """Метрики направления приёма"""
+        return self._rx.getStats()
+
+    def getTxStats(self) -> ChannelStats:
+        """Метрики направления передачи"""
+        return self._tx.getStats()
 
     @classmethod
-    def create_pair(cls) -> tuple[VirtualStream, VirtualStream]:
-        """Создает пару связанных пир-потоков с блокирующим чтением"""
-        a_lock = Lock()
-        b_lock = Lock()
-
-        a_to_b = bytearray()
-        b_to_a = bytearray()
-
-        return (
-            cls(
-                rx_buffer=b_to_a,
-                tx_buffer=a_to_b,
-                rx_lock=b_lock,
-                tx_lock=a_lock
-            ),
-            cls(
-                rx_buffer=a_to_b,
-                tx_buffer=b_to_a,
-                rx_lock=a_lock,
-                tx_lock=b_lock
-            )
-        )
+    def create_pair(cls, capacity: int = 65536, timeout: Optional[float] = None) -> tuple[VirtualStream, VirtualStream]:
+        """
+        Создает пару связанных пир-потоков с блокирующим чтением
+        :param capacity: Ёмкость буфера каждого направления
+        :param timeout: Предельное время ожидания чтения или записи (BytelangError по истечении)
+        """
+        a_to_b = _Channel(capacity, timeout)
+        b_to_a = _Channel(capacity, timeout)
+
+        return cls(rx=b_to_a, tx=a_to_b), cls(rx=a_to_b, tx=b_to_a)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Vector2D[T]:
     """Ход игрока"""
 
@@ -51,7 +51,7 @@ class Vector2D[T]:
         raise TypeError("Unsupported operand type")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Vector3D[T]:
     """Ход игрока"""
 
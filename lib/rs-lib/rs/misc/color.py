@@ -4,7 +4,7 @@ from typing import ClassVar
 from typing import Self
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Color:
     """Цвет"""
 
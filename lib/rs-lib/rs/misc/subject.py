@@ -1,18 +1,115 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from itertools import count
+from threading import local
 from typing import Any
 from typing import Callable
+from typing import ClassVar
+from typing import Hashable
+from typing import Iterator
+from typing import Optional
+
+
+class _Batch(local):
+    """Отложенные уведомления транзакции (свои в каждом потоке)"""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.queue: deque[tuple[Hashable, Subject, Any]] = deque()
+        self.keys = set[Hashable]()
+        self.unique = count()
+        """Ключи уведомлений с нехешируемым значением (не объединяются)"""
 
 
 class Subject[T]:
     """Субъект"""
 
+    _batch: ClassVar = _Batch()
+
+    __slots__ = ("__observers",)
+
     def __init__(self) -> None:
         self.__observers = set[Callable[[T], Any]]()
 
     def notify(self, value: T) -> None:
-        """Уведомить наблюдателей"""
+        """Уведомить наблюдателей (внутри batch - отложенно, одинаковые уведомления объединяются)"""
+        batch = Subject._batch
+
+        if batch.depth > 0:
+            self._defer(batch, value)
+            return
+
         for observer in self.__observers:
             observer(value)
 
+    def _defer(self, batch: _Batch, value: T) -> None:
+        try:
+            key = (self, value)
+            hash(key)
+
+        except TypeError:
+            key = next(batch.unique)
+
+        if key in batch.keys:
+            return
+
+        batch.keys.add(key)
+        batch.queue.append((key, self, value))
+
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[None]:
+        """
+        Транзакция уведомлений текущего потока: уведомления всех субъектов откладываются до выхода
+        из внешнего batch и доставляются по порядку, каждое уникальное (субъект, значение) - один раз.
+        Уведомления, вызванные доставкой, тоже объединяются с ещё не доставленными.
+        Исключение наблюдателя не прерывает доставку: очередь доставляется до конца,
+        затем выбрасывается первое исключение.
+        """
+        batch = cls._batch
+        batch.depth += 1
+
+        try:
+            yield
+
+        finally:
+            error = None
+
+            try:
+                if batch.depth == 1:
+                    error = cls._deliver(batch)
+
+            finally:
+                if batch.depth == 1:
+                    batch.queue.clear()
+                    batch.keys.clear()
+
+                batch.depth -= 1
+
+            if error is not None:
+                raise error
+
+    @staticmethod
+    def _deliver(batch: _Batch) -> Optional[Exception]:
+        """Доставить очередь до конца, вернуть первое исключение наблюдателей"""
+        error = None
+
+        while len(batch.queue) > 0:
+            key, subject, value = batch.queue.popleft()
+            batch.keys.discard(key)
+
+            for observer in tuple(subject.__observers):
+                try:
+                    observer(value)
+
+                except Exception as e:
+                    if error is None:
+                        error = e
+
+        return error
+
     def addListener(self, observer: Callable[[T], Any]) -> None:
         """Добавить наблюдателя"""
         self.__observers.add(observer)
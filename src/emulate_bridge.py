@@ -0,0 +1,58 @@
+from argparse import ArgumentParser
+from random import Random
+from time import sleep
+
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from game.core.entities.board import Board
+from game.core.entities.mac import Mac
+from game.core.protocol import GameProtocol
+from game.impl.emulator import BridgeEmulator
+from game.impl.emulator import EmulatorConfig
+
+
+def _payload(serializer, value) -> bytes:
+    stream = ByteBufferOutputStream()
+    serializer.write(stream, value).unwrap()
+    return bytes(stream.buffer)
+
+
+def _main():
+    parser = ArgumentParser(description="Эмулятор моста ESP32 на псевдотерминале (добавьте порт в _EXTRA_PORTS launch.py)")
+    parser.add_argument("--players", type=int, default=16)
+    parser.add_argument("--moves-per-sec", type=float, default=20.0, help="суммарный темп ходов игроков")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--latency", type=float, default=0.002, help="время в эфире пакета, с")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--loss-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    emulator = BridgeEmulator(EmulatorConfig(
+        baud=args.baud,
+        radio_latency_secs=args.latency,
+        delivery_failure_rate=args.failure_rate,
+        uplink_loss_rate=args.loss_rate,
+    ))
+
+    print(f"Порт эмулятора: {emulator.getPort()}")
+
+    random = Random()
+    macs = tuple(Mac(bytes((2, 0, 0, 0, i >> 8, i & 0xFF))) for i in range(args.players))
+
+    for i, mac in enumerate(macs):
+        emulator.transmit(mac, _payload(GameProtocol.player_message, f"bot-{i}"))
+
+    moves = 0
+
+    while True:
+        move = (random.randrange(Board.max_size), random.randrange(Board.max_size))
+        emulator.transmit(random.choice(macs), _payload(GameProtocol.player_move, move))
+        moves += 1
+
+        if moves % max(1, int(args.moves_per_sec * 5)) == 0:
+            print(emulator.getStats())
+
+        sleep(1 / args.moves_per_sec)
+
+
+if __name__ == "__main__":
+    _main()
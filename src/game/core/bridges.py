@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from queue import Empty
+from queue import Queue
+from threading import Thread
+from time import sleep
+from typing import Any
+from typing import Callable
+from typing import Final
+from typing import Optional
+from typing import Sequence
+
+from bytelang.abc.stream import Stream
+from bytelang.core.instruction import Instruction
+from bytelang.exceptions import BytelangError
+from game.core.entities.mac import Mac
+from game.core.environment import Environment
+from game.core.loop import EnvironmentLoop
+from game.core.protocol import GameProtocol
+from rs.misc.log import Logger
+from rs.result import Result
+from rs.result import err
+from rs.result import ok
+
+type _Inbound = tuple[GameProtocol, Optional[Instruction], Any]
+"""Мост, инструкция и аргументы кадра (инструкция None - ошибка разбора с текстом вместо аргументов)"""
+
+
+class BridgeHub:
+    """
+    Несколько мостов ESP32 на одно окружение.
+
+    Каждый мост читается своим потоком (порты Windows не ожидаются через selectors),
+    декодированные кадры сходятся в одну ограниченную очередь и обрабатываются
+    по одному в потоке poll/run, так что окружение меняется только из него.
+    С runOn кадры вместо этого уходят командами в EnvironmentLoop - единственного писателя окружения.
+    Сообщения окружения уходят через мост, на котором адресат был слышен последним.
+    """
+
+    def __init__(
+            self,
+            env: Environment,
+            queue_size: int = 1024,
+            *,
+            retry_secs: float = 0.01,
+            max_retry_secs: float = 1.0,
+            max_failures: int = 32
+    ) -> None:
+        self._log: Final = Logger("bridges")
+        self._env: Final = env
+
+        self._retry_secs: Final = retry_secs
+        """Пауза после ошибки чтения (удваивается с каждой ошибкой подряд)"""
+        self._max_retry_secs: Final = max_retry_secs
+        self._max_failures: Final = max_failures
+        """Ошибок чтения подряд, после которых мост отключается (порт пропал)"""
+
+        self._bridges: Final = list[GameProtocol]()
+        self._routes: Final = dict[Mac, GameProtocol]()
+        """Мост, на котором MAC был слышен последним"""
+        self._inbound: Final = Queue[_Inbound](queue_size)
+        self._sink: Callable[[_Inbound], Any] = self._inbound.put
+        """Приёмник декодированных кадров потоков чтения"""
+        self._readers: Final = list[Thread]()
+        self._running = False
+
+        env.protocol_message_sender = self.sendMessage
+
+    def addBridge(self, stream: Stream) -> GameProtocol:
+        """Подключить мост (до start)"""
+        assert not self._running
+
+        bridge = GameProtocol(stream, self._env)
+        bridge.peer_subject.addListener(lambda mac: self._routes.__setitem__(mac, bridge))
+        self._bridges.append(bridge)
+
+        # GameProtocol отправляет сообщения окружения через себя - маршрутизацию возвращает хаб
+        self._env.protocol_message_sender = self.sendMessage
+        return bridge
+
+    def getBridges(self) -> Sequence[GameProtocol]:
+        """Подключённые мосты"""
+        return tuple(self._bridges)
+
+    def getRoute(self, mac: Mac) -> Optional[GameProtocol]:
+        """Мост, на котором MAC был слышен последним"""
+        return self._routes.get(mac)
+
+    def sendMessage(self, mac: Mac, message: str) -> Result[None, str]:
+        """Отправить сообщение игроку (широковещательное - через все мосты)"""
+        if len(self._bridges) == 0:
+            return err("No bridges connected")
+
+        if mac == Mac.broadcast():
+            errors = tuple(
+                r.err().unwrap()
+                for r in (bridge.sendMessage(mac, message) for bridge in self._bridges)
+                if r.is_err()
+            )
+            return err("; ".join(errors)) if len(errors) > 0 else ok(None)
+
+        bridge = self._routes.get(mac)
+
+        if bridge is None:
+            self._log.write(f"{mac} ещё не был слышен, отправка через первый мост")
+            bridge = self._bridges[0]
+
+        return bridge.sendMessage(mac, message)
+
+    def _read(self, bridge: GameProtocol) -> None:
+        failures = 0
+
+        while self._running:
+            try:
+                instruction, value = bridge.receive_raw()
+
+            except BytelangError as e:
+                if not self._running:
+                    return
+
+                failures += 1
+
+                if failures >= self._max_failures:
+                    self._sink((bridge, None, f"{bridge}: отключён после {failures} ошибок чтения подряд: {e}"))
+                    return
+
+                self._sink((bridge, None, f"{bridge}: {e}"))
+
+                # Постоянная ошибка (порт отключён) не должна забивать общую очередь и вытеснять другие мосты
+                sleep(min(self._retry_secs * (1 << (failures - 1)), self._max_retry_secs))
+                continue
+
+            failures = 0
+            self._sink((bridge, instruction, value))
+
+    def start(self) -> None:
+        """Запустить потоки чтения мостов"""
+        assert not self._running
+        self._running = True
+
+        for i, bridge in enumerate(self._bridges):
+            reader = Thread(target=self._read, args=(bridge,), name=f"bridge-{i}", daemon=True)
+            self._readers.append(reader)
+            reader.start()
+
+    def stop(self) -> None:
+        """Остановить потоки чтения (они завершатся после текущего чтения)"""
+        self._running = False
+
+    def poll(self, on_error: Callable[[str], Any], timeout: Optional[float] = None) -> int:
+        """
+        Дождаться кадров (не дольше timeout) и обработать все уже принятые.
+        Возвращает количество обработанных кадров
+        """
+        try:
+            item = self._inbound.get(timeout=timeout)
+
+        except Empty:
+            return 0
+
+        handled = 0
+
+        while True:
+            handled += self._handle(item, on_error)
+
+            try:
+                item = self._inbound.get_nowait()
+
+            except Empty:
+                return handled
+
+    @staticmethod
+    def _handle(item: _Inbound, on_error: Callable[[str], Any]) -> int:
+        """Обработать кадр (возвращает 1, если кадр дошёл до обработчика)"""
+        bridge, instruction, value = item
+
+        if instruction is None:
+            on_error(value)
+            return 0
+
+        result = bridge.handle(instruction, value)
+
+        if result.is_err():
+            on_error(result.err().unwrap())
+
+        return 1
+
+    def run(self, on_error: Callable[[str], Any]) -> None:
+        """Запустить чтение и бесконечно обрабатывать входящие кадры"""
+        self.start()
+
+        while True:
+            self.poll(on_error)
+
+    def runOn(self, loop: EnvironmentLoop, on_error: Callable[[str], Any]) -> None:
+        """Запустить чтение: кадры обрабатываются командами loop (очередь loop ограничивает потоки чтения)"""
+        assert loop.env is self._env
+
+        self._sink = lambda item: loop.submit(lambda _: self._handle(item, on_error))
+        self.start()
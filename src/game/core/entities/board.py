@@ -5,16 +5,20 @@ from enum import StrEnum
 from enum import auto
 from typing import ClassVar
 from typing import Final
+from typing import Iterator
 from typing import Mapping
 from typing import Optional
+from typing import Sequence
 
 from game.core.entities.player import Player
+from game.core.entities.player import PlayerChange
+from game.core.entities.player import Team
 from game.core.entities.rules import ScoreRules
 from rs.lina.vector import Vector2D
 from rs.misc.subject import Subject
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Cell:
     """Ячейка игрового поля"""
 
@@ -38,22 +42,213 @@ class Cell:
 
 type Pos = Vector2D[int]
 
+type _NeighborTable = tuple[tuple[int, ...], ...]
+"""Индексы соседей для каждой клетки поля"""
+
+
+def _buildNeighborTables(size: int) -> Mapping[ScoreRules.CellLookupMode, _NeighborTable]:
+    """Таблицы соседей поля size * size для каждого сочетания режимов просмотра (size * size - за пределами)"""
+    outside = size * size
+
+    def _neighbor(x: int, y: int) -> int:
+        return y * size + x if 0 <= x < size and 0 <= y < size else outside
+
+    def _build(mode: ScoreRules.CellLookupMode) -> _NeighborTable:
+        offsets = list[tuple[int, int]]()
+
+        if ScoreRules.CellLookupMode.Orthogonal in mode:
+            offsets.extend(((1, 0), (-1, 0), (0, 1), (0, -1)))
+
+        if ScoreRules.CellLookupMode.Diagonal in mode:
+            offsets.extend(((1, 1), (1, -1), (-1, 1), (-1, -1)))
+
+        return tuple(
+            tuple(_neighbor(index % size + dx, index // size + dy) for dx, dy in offsets)
+            for index in range(outside)
+        )
+
+    return {
+        mode: _build(mode)
+        for mode in map(ScoreRules.CellLookupMode, range(ScoreRules.CellLookupMode.Full + 1))
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class NeighborCounts:
+    """Соседи клетки с точки зрения команды (за пределами поля - пустые)"""
+
+    empty: int
+    friends: int
+    enemies: int
+
+
+def _buildPositions(size: int) -> tuple[Pos, ...]:
+    """Позиции клеток поля size * size по индексу в плоском хранилище"""
+    return tuple(Vector2D(index % size, index // size) for index in range(size * size))
+
+
+_PARTS: Final = (ScoreRules.CellLookupMode.Orthogonal, ScoreRules.CellLookupMode.Diagonal)
+"""Базовые режимы, по которым ведутся счётчики соседей"""
+
+_PART_SIZE: Final = 4
+"""Соседей клетки в базовом режиме (с учётом выхода за поле)"""
+
+
+def _buildCounterLayout(
+        tables: Mapping[ScoreRules.CellLookupMode, _NeighborTable],
+        outside: int
+) -> tuple[_NeighborTable, Mapping[ScoreRules.CellLookupMode, tuple[int, ...]]]:
+    """
+    Раскладка счётчиков соседей: по outside ячеек на каждый базовый режим в одном списке.
+    Возвращает ячейки счётчиков соседей каждой клетки (без выхода за поле)
+    и смещения базовых режимов для каждого сочетания
+    """
+    slots = tuple(
+        tuple(
+            part * outside + neighbor
+            for part, mode in enumerate(_PARTS)
+            for neighbor in tables[mode][index]
+            if neighbor != outside
+        )
+        for index in range(outside)
+    )
+
+    offsets = {
+        mode: tuple(part * outside for part, base in enumerate(_PARTS) if base in mode)
+        for mode in tables
+    }
+
+    return slots, offsets
+
+
+class _BoardState(Mapping[Pos, Cell]):
+    """Представление клеток поля только для чтения (совместимо с прежним dict[Pos, Cell])"""
+
+    def __init__(self, board: Board) -> None:
+        self._board: Final = board
+
+    def __getitem__(self, pos: Pos) -> Cell:
+        cell = self.get(pos)
+
+        if cell is None:
+            raise KeyError(pos)
+
+        return cell
+
+    def get(self, pos: Pos, default: Optional[Cell] = None) -> Optional[Cell]:
+        index = Board.indexOf(pos)
+
+        if index is None:
+            return default
+
+        # noinspection PyProtectedMember
+        return self._board._owners[self._board._cells[index]] or default
+
+    def __contains__(self, pos: object) -> bool:
+        return isinstance(pos, Vector2D) and self.get(pos) is not None
+
+    def __iter__(self) -> Iterator[Pos]:
+        positions = Board.getPositions()
+
+        # noinspection PyProtectedMember
+        for index, owner in enumerate(self._board._cells[:-1]):
+            if owner != 0:
+                yield positions[index]
+
+    def __len__(self) -> int:
+        # noinspection PyProtectedMember
+        return self._board._occupied
+
 
 class Board:
-    """Сведения об игровом поле"""
+    """
+    Сведения об игровом поле.
+
+    Клетки хранятся плоским списком индексов владельцев (0 - пусто) на всё поле max_size * max_size,
+    соседи каждой клетки для каждого режима просмотра рассчитаны заранее:
+    выход за поле указывает на последнюю, всегда пустую ячейку списка.
+
+    Для каждой клетки и каждого базового режима (по прямой, по диагонали) ведутся счётчики
+    занятых соседей - всего и по командам. Они обновляются за O(соседей) при ходе и смене команды
+    владельца, поэтому счёт хода для любой команды считается за O(1) при любом режиме правил.
+    """
 
     max_size: ClassVar = 20
 
+    _OUTSIDE: ClassVar = max_size * max_size
+    """Индекс ячейки за пределами поля"""
+
+    _NEIGHBORS: ClassVar = _buildNeighborTables(max_size)
+    """Таблицы соседей для каждого сочетания режимов просмотра"""
+
+    _COUNTER_SLOTS, _MODE_OFFSETS = _buildCounterLayout(_NEIGHBORS, _OUTSIDE)
+
+    _POSITIONS: ClassVar = _buildPositions(max_size)
+    """Общие объекты позиций клеток хранилища"""
+
+    _INTERN_SIZE: ClassVar = 1024
+    """Сторона области общих позиций вне хранилища (не зависит от max_size)"""
+
+    _INTERNED: ClassVar = dict[int, Pos]()
+    """Общие позиции вне хранилища по индексу y * _INTERN_SIZE + x (заполняются по первому запросу)"""
+
     def __init__(self, size: Pos, score_rules: ScoreRules) -> None:
         self._score_rules: Final = score_rules
 
         self._size = size
-        self._state = dict[Pos, Cell]()
+
+        self._cells: Final = [0] * (self._OUTSIDE + 1)
+        """Индекс владельца для каждой клетки (последняя ячейка - за пределами поля)"""
+        self._owners: Final = list[Optional[Cell]]((None,))
+        """Клетка владельца по индексу (0 - пусто)"""
+        self._owner_indices: Final = dict[Player, int]()
+        self._owner_teams: Final = list[Optional[Team]]((None,))
+        """Команда владельца, по которой учтены его клетки"""
+        self._owner_cells: Final = list[list[int]](([],))
+        """Клетки владельца"""
+        self._occupied = 0
+
+        self._busy_neighbors: Final = [0] * (self._OUTSIDE * len(_PARTS))
+        """Занятые соседи клетки для каждого базового режима"""
+        self._team_neighbors: Final = dict[Team, list[int]]()
+        """Соседи клетки, занятые командой, для каждого базового режима"""
+        self._state: Final = _BoardState(self)
 
         self.size_subject: Final[Subject[Pos]] = Subject()
         self.move_subject: Final[Subject[tuple[Player, Pos]]] = Subject()
         self.update_subject: Final[Subject[Mapping[Pos, Cell]]] = Subject()
 
+    @classmethod
+    def indexOf(cls, pos: Pos) -> Optional[int]:
+        """Индекс клетки в плоском хранилище (None - вне хранилища)"""
+        if 0 <= pos.x < cls.max_size and 0 <= pos.y < cls.max_size:
+            return pos.y * cls.max_size + pos.x
+
+        return None
+
+    @classmethod
+    def internPos(cls, x: int, y: int) -> Pos:
+        """Позиция клетки: общий объект в пределах _INTERN_SIZE * _INTERN_SIZE, дальше - новый"""
+        if 0 <= x < cls.max_size and 0 <= y < cls.max_size:
+            return cls._POSITIONS[y * cls.max_size + x]
+
+        if 0 <= x < cls._INTERN_SIZE and 0 <= y < cls._INTERN_SIZE:
+            key = y * cls._INTERN_SIZE + x
+            pos = cls._INTERNED.get(key)
+
+            if pos is None:
+                # setdefault: при гонке потоков все получат один объект
+                pos = cls._INTERNED.setdefault(key, Vector2D(x, y))
+
+            return pos
+
+        return Vector2D(x, y)
+
+    @classmethod
+    def getPositions(cls) -> Sequence[Pos]:
+        """Общие позиции всех клеток хранилища по индексу (см. indexOf)"""
+        return cls._POSITIONS
+
     @property
     def size(self) -> Pos:
         """Размер поля"""
@@ -69,7 +264,7 @@ class Board:
         self.size = size
 
     def getState(self) -> Mapping[Pos, Cell]:
-        """Получить состояние поля"""
+        """Получить состояние поля (представление только для чтения)"""
         return self._state
 
     class MakeMoveResult(StrEnum):
@@ -83,55 +278,158 @@ class Board:
 
     def reset(self) -> None:
         """Сбросить значения поля"""
-        self._state.clear()
-        self.notifyUpdate()
+        with Subject.batch():
+            for player in self._owner_indices:
+                player.subject_change.removeListener(self._onOwnerChange)
+
+            self._cells[:] = (0,) * len(self._cells)
+            del self._owners[1:]
+            del self._owner_teams[1:]
+            del self._owner_cells[1:]
+            self._owner_indices.clear()
+            self._occupied = 0
+
+            self._busy_neighbors[:] = (0,) * len(self._busy_neighbors)
+            self._team_neighbors.clear()
+            self.notifyUpdate()
 
     def notifyUpdate(self) -> None:
         """Уведомить об обновлении"""
         self.update_subject.notify(self.getState())
 
+    def _ownerIndex(self, player: Player) -> int:
+        index = self._owner_indices.get(player)
+
+        if index is None:
+            index = self._owner_indices[player] = len(self._owners)
+            self._owners.append(Cell(player))
+            self._owner_teams.append(player.team)
+            self._owner_cells.append([])
+            player.subject_change.addListener(self._onOwnerChange)
+
+        return index
+
+    def _teamNeighbors(self, team: Team) -> list[int]:
+        counts = self._team_neighbors.get(team)
+
+        if counts is None:
+            counts = self._team_neighbors[team] = [0] * len(self._busy_neighbors)
+
+        return counts
+
+    def _onOwnerChange(self, change: PlayerChange) -> None:
+        owner = self._owner_indices.get(change.player)
+
+        if change.attribute != Player.Attribute.Team or owner is None:
+            return
+
+        self._syncOwnerTeam(owner)
+
+    def _syncOwnerTeam(self, owner: int) -> Team:
+        """
+        Перенести счётчики клеток владельца в его текущую команду.
+        Уведомление о смене команды может быть отложено (Subject.batch), поэтому ход сверяет команду сам:
+        счётчики не зависят от момента доставки, а запоздавшее уведомление ничего не меняет
+        """
+        team = self._owners[owner].owner.team
+        old_team = self._owner_teams[owner]
+
+        if team is old_team:
+            return team
+
+        self._owner_teams[owner] = team
+
+        old_counts = self._teamNeighbors(old_team)
+        new_counts = self._teamNeighbors(team)
+
+        for index in self._owner_cells[owner]:
+            for slot in self._COUNTER_SLOTS[index]:
+                old_counts[slot] -= 1
+                new_counts[slot] += 1
+
+        return team
+
     def makeMove(self, player: Player, pos: Pos) -> MakeMoveResult:
         """Совершить ход"""
 
         if not (0 <= pos.x < self.size.x) or not (0 <= pos.y < self.size.y):
             return Board.MakeMoveResult.OutOfBounds
 
-        cell: Optional[Cell] = self._state.get(pos)
+        index = self.indexOf(pos)
+
+        if index is None:
+            return Board.MakeMoveResult.OutOfBounds
 
-        if cell is not None:
+        if self._cells[index] != 0:
             return Board.MakeMoveResult.CellNotEmpty
 
-        self._state[pos] = cell = Cell(player)
-        score = self._calcScore(cell, pos)
+        owner = self._ownerIndex(player)
+        team = self._syncOwnerTeam(owner)
+
+        score = self._calcScore(team, index)
+
+        self._cells[index] = owner
+        self._owner_cells[owner].append(index)
+        self._occupied += 1
+
+        busy = self._busy_neighbors
+        friendly = self._teamNeighbors(team)
+
+        for slot in self._COUNTER_SLOTS[index]:
+            busy[slot] += 1
+            friendly[slot] += 1
 
         player.score += score
 
         self.move_subject.notify((player, pos))
         return Board.MakeMoveResult.Ok
 
-    def _calcScore(self, cell: Cell, pos: Pos) -> int:
-        dy = Vector2D(0, 1)
-        dx = Vector2D(1, 0)
-
-        lookup = list()
-
-        if self._score_rules.mode in ScoreRules.CellLookupMode.Orthogonal:
-            lookup.extend((
-                pos + dx,
-                pos - dx,
-                pos + dy,
-                pos - dy,
-            ))
-
-        if self._score_rules.mode in ScoreRules.CellLookupMode.Diagonal:
-            lookup.extend((
-                pos + dx + dy,
-                pos + dx - dy,
-                pos - dx + dy,
-                pos - dx - dy,
-            ))
-
-        return sum(
-            cell.calcScore(self._score_rules, other)
-            for other in map(self._state.get, lookup)
-        )
+    def _calcScore(self, team: Team, index: int) -> int:
+        rules = self._score_rules
+        busy = self._busy_neighbors
+        friendly = self._team_neighbors.get(team)
+
+        score = 0
+
+        for offset in self._MODE_OFFSETS[rules.mode]:
+            occupied = busy[offset + index]
+            friends = 0 if friendly is None else friendly[offset + index]
+
+            score += (
+                (_PART_SIZE - occupied) * rules.empty_cell
+                + friends * rules.friend_cell
+                + (occupied - friends) * rules.enemy_cell
+            )
+
+        return score
+
+    def _boardIndex(self, pos: Pos) -> Optional[int]:
+        """Индекс клетки в пределах текущего размера поля"""
+        if not (0 <= pos.x < self.size.x) or not (0 <= pos.y < self.size.y):
+            return None
+
+        return self.indexOf(pos)
+
+    def getNeighborCounts(self, team: Team, pos: Pos) -> Optional[NeighborCounts]:
+        """Соседи клетки в текущем режиме правил с точки зрения команды (None - вне поля)"""
+        index = self._boardIndex(pos)
+
+        if index is None:
+            return None
+
+        friendly = self._team_neighbors.get(team)
+        offsets = self._MODE_OFFSETS[self._score_rules.mode]
+
+        occupied = sum(self._busy_neighbors[offset + index] for offset in offsets)
+        friends = 0 if friendly is None else sum(friendly[offset + index] for offset in offsets)
+
+        return NeighborCounts(len(offsets) * _PART_SIZE - occupied, friends, occupied - friends)
+
+    def calcMoveScore(self, team: Team, pos: Pos) -> Optional[int]:
+        """Счёт, который получил бы игрок команды за ход в клетку (без проверки занятости; None - вне поля)"""
+        index = self._boardIndex(pos)
+
+        if index is None:
+            return None
+
+        return self._calcScore(team, index)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from enum import StrEnum
+from enum import auto
 from typing import AbstractSet
 from typing import ClassVar
 from typing import Final
@@ -14,11 +17,37 @@ from rs.misc.log import Logger
 from rs.misc.subject import Subject
 
 
+@dataclass(frozen=True, slots=True)
+class PlayerChange:
+    """Изменение игрока"""
+
+    player: Player
+    attribute: Player.Attribute
+    """Изменённое свойство (новое значение - в самом игроке)"""
+
+
+@dataclass(frozen=True, slots=True)
+class TeamChange:
+    """Изменение команды"""
+
+    team: Team
+    attribute: Team.Attribute
+    """Изменённое свойство (новое значение - в самой команде)"""
+
+
 class Player:
     """Сведения об игроке"""
 
+    class Attribute(StrEnum):
+        """Свойство игрока"""
+        Name = auto()
+        Team = auto()
+        Score = auto()
+
+    __slots__ = ("subject_change", "mac", "_name", "__current_team", "_score", "last_send_secs")
+
     def __init__(self, mac: Mac, name: str) -> None:
-        self.subject_change: Final[Subject[Player]] = Subject()
+        self.subject_change: Final[Subject[PlayerChange]] = Subject()
 
         self.mac: Final = mac
         self._name = name
@@ -35,7 +64,7 @@ class Player:
     @name.setter
     def name(self, new_username: str) -> None:
         self._name = new_username
-        self.subject_change.notify(self)
+        self.subject_change.notify(PlayerChange(self, Player.Attribute.Name))
 
     @property
     def team(self) -> Team:
@@ -52,7 +81,7 @@ class Player:
         new_team.addPlayer(self)
 
         self.__current_team = new_team
-        self.subject_change.notify(self)
+        self.subject_change.notify(PlayerChange(self, Player.Attribute.Team))
 
     @property
     def score(self) -> int:
@@ -61,8 +90,11 @@ class Player:
 
     @score.setter
     def score(self, new_score: int) -> None:
+        if new_score == self._score:
+            return
+
         self._score = new_score
-        self.subject_change.notify(self)
+        self.subject_change.notify(PlayerChange(self, Player.Attribute.Score))
 
     def reset(self) -> None:
         """Сбросить значения игрока"""
@@ -111,8 +143,19 @@ class PlayerRegistry:
 class Team:
     """Команда"""
 
+    class Attribute(StrEnum):
+        """Свойство команды"""
+        Name = auto()
+        Color = auto()
+        Score = auto()
+        """Общий счёт (в т.ч. после смены состава)"""
+        Players = auto()
+        """Состав команды"""
+
     _default_instance: ClassVar[Optional[Team]] = None
 
+    __slots__ = ("subject_change", "_name", "_color", "_total_score", "_players")
+
     @classmethod
     def default(cls):
         """Команда по умолчанию"""
@@ -122,12 +165,13 @@ class Team:
         return cls._default_instance
 
     def __init__(self, name: str, color: Color) -> None:
-        self.subject_change: Final[Subject[Team]] = Subject()
+        self.subject_change: Final[Subject[TeamChange]] = Subject()
 
         self._name = name
         self._color = color
         self._total_score: int = 0
-        self._players: Final[set[Player]] = set()
+        self._players: Final = dict[Player, int]()
+        """Участник и его счёт, учтённый в общем"""
 
     def __str__(self) -> str:
         return f"Команда '{self.name}'"
@@ -140,7 +184,7 @@ class Team:
     @name.setter
     def name(self, n: str) -> None:
         self._name = n
-        self.subject_change.notify(self)
+        self.subject_change.notify(TeamChange(self, Team.Attribute.Name))
 
     @property
     def color(self) -> Color:
@@ -150,7 +194,7 @@ class Team:
     @color.setter
     def color(self, c: Color) -> None:
         self._color = c
-        self.subject_change.notify(self)
+        self.subject_change.notify(TeamChange(self, Team.Attribute.Color))
 
     @property
     def score(self) -> int:
@@ -162,33 +206,43 @@ class Team:
         if member in self._players:
             return
 
-        self._players.add(member)
-        member.subject_change.addListener(self._updateTotalScore)
-        self._updateTotalScore()
+        self._players[member] = member.score
+        member.subject_change.addListener(self._onPlayerChange)
+        self._changeTotalScore(member.score)
+        self.subject_change.notify(TeamChange(self, Team.Attribute.Players))
 
     def removePlayer(self, player: Player) -> None:
         """Удалить участника из команды"""
         if player not in self._players:
             return
 
-        self._players.remove(player)
-        player.subject_change.removeListener(self._updateTotalScore)
-        self._updateTotalScore()
+        player.subject_change.removeListener(self._onPlayerChange)
+        self._changeTotalScore(-self._players.pop(player))
+        self.subject_change.notify(TeamChange(self, Team.Attribute.Players))
 
-    def _updateTotalScore(self, _=None) -> None:
-        self._total_score = self._calcTotalScore()
-        self.subject_change.notify(self)
+    def _onPlayerChange(self, change: PlayerChange) -> None:
+        player = change.player
+        counted = self._players.get(player)
 
-    def _calcTotalScore(self) -> int:
-        return sum(
-            p.score
-            for p in self._players
-        )
+        # Уведомление могло быть отложено (Subject.batch) и объединено с другими - берём текущий счёт
+        if change.attribute != Player.Attribute.Score or counted is None:
+            return
+
+        self._players[player] = player.score
+        self._changeTotalScore(player.score - counted)
+
+    def _changeTotalScore(self, delta: int) -> None:
+        """Общий счёт ведётся приращениями, без пересчёта по участникам"""
+        if delta == 0:
+            return
+
+        self._total_score += delta
+        self.subject_change.notify(TeamChange(self, Team.Attribute.Score))
 
     @property
     def players(self) -> AbstractSet[Player]:
         """Участники команды"""
-        return self._players
+        return self._players.keys()
 
 
 class TeamRegistry:
@@ -209,6 +263,7 @@ class TeamRegistry:
         self.on_team_add: Final[Subject[Team]] = Subject()
         self.on_team_delete: Final[Subject[Team]] = Subject()
         self.on_team_update: Final[Subject[Team]] = Subject()
+        """Изменение отображения команды (имя, цвет)"""
 
         # self._teams.add(Team.default())
 
@@ -224,7 +279,7 @@ class TeamRegistry:
         self.__last_team_index += 1
 
         self._teams.add(team)
-        team.subject_change.addListener(self.on_team_update.notify)
+        team.subject_change.addListener(self._onTeamChange)
 
         self.on_team_add.notify(team)
         self.on_team_update.notify(team)
@@ -241,17 +296,23 @@ class TeamRegistry:
             return
 
         # Удаляем команду из реестра до перевода игроков
-        team.subject_change.removeListener(self.on_team_update.notify)
+        team.subject_change.removeListener(self._onTeamChange)
         self._teams.remove(team)
         self.on_team_delete.notify(team)
 
         # Теперь безопасно переводим игроков
         default_team = Team.default()
-        for player in tuple(team.players):
-            player.setTeam(default_team)
+
+        with Subject.batch():
+            for player in tuple(team.players):
+                player.setTeam(default_team)
 
         self._log.write(f"unregistered: {team}")
 
+    def _onTeamChange(self, change: TeamChange) -> None:
+        if change.attribute in (Team.Attribute.Name, Team.Attribute.Color):
+            self.on_team_update.notify(change.team)
+
     def getAll(self) -> AbstractSet[Team]:
         """Получить существующие команды"""
         return self._teams
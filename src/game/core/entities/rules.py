@@ -68,6 +68,9 @@ class GameRules:
     move_available: bool
     """Ходы разрешены"""
 
+    win_line_length: int
+    """Длина линии клеток команды для победы"""
+
     def setMoveCooldown(self, cooldown_secs: float) -> None:
         """Установить кул-даун хода"""
         self.move_cooldown_secs = cooldown_secs
@@ -75,3 +78,7 @@ class GameRules:
     def setMoveAvailable(self, available: bool) -> None:
         """Установить разрешение совершать ходы"""
         self.move_available = available
+
+    def setWinLineLength(self, length: int) -> None:
+        """Установить длину победной линии"""
+        self.win_line_length = length
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+from typing import Iterable
+from typing import Optional
+
+from game.core.entities.player import Team
+from rs.lina.vector import Vector2D
+from rs.misc.subject import Subject
+
+type Pos = Vector2D[int]
+
+_DIRECTIONS: Final = ((1, 0), (0, 1), (1, 1), (1, -1))
+"""Горизонталь, вертикаль, диагонали"""
+
+
+@dataclass(frozen=True, slots=True)
+class Victory:
+    """Победа команды"""
+
+    team: Team
+    line: tuple[Pos, ...]
+    """Клетки победной линии по порядку (линия может быть длиннее требуемой)"""
+
+
+class VictoryDetector:
+    """
+    Поиск непрерывной линии из line_length клеток команды.
+
+    Для каждого направления хранится длина серии клеток одной команды на её концах:
+    новая клетка сшивает соседние серии за O(1), так что ход стоит O(1) независимо от размера поля.
+    Клетки хранятся разреженно (только занятые), поле не ограничено по размеру.
+    Клетки игроков без команды (Team.default) линий не образуют.
+    После победы детектор замораживается до reset.
+    """
+
+    def __init__(self, line_length: int) -> None:
+        self.line_length = line_length
+        """Длина победной линии"""
+
+        self._teams: Final = dict[tuple[int, int], Team]()
+        self._runs: Final = tuple(dict[tuple[int, int], int]() for _ in _DIRECTIONS)
+        """Длина серии в каждом направлении (верна на концах серии)"""
+        self._victory: Optional[Victory] = None
+
+        self.victory_subject: Final[Subject[Victory]] = Subject()
+
+    def getVictory(self) -> Optional[Victory]:
+        """Победа (None - игра продолжается)"""
+        return self._victory
+
+    def setLineLength(self, line_length: int) -> Optional[Victory]:
+        """Изменить длину победной линии: уже собранная серия новой длины сразу даёт победу"""
+        self.line_length = line_length
+
+        if self._victory is not None:
+            return self._victory
+
+        teams = self._teams
+
+        for (dx, dy), runs in zip(_DIRECTIONS, self._runs):
+            for (x, y), length in runs.items():
+                # Внутри серии может остаться устаревшая длина, но серия только растёт - она не короче
+                if length < line_length:
+                    continue
+
+                team = teams[x, y]
+
+                while teams.get((x - dx, y - dy)) is team:
+                    x, y = x - dx, y - dy
+
+                line = list[Pos]()
+
+                while teams.get((x, y)) is team:
+                    line.append(Vector2D(x, y))
+                    x, y = x + dx, y + dy
+
+                return self._win(team, tuple(line))
+
+        return None
+
+    def _win(self, team: Team, line: tuple[Pos, ...]) -> Victory:
+        self._victory = Victory(team, line)
+        self.victory_subject.notify(self._victory)
+        return self._victory
+
+    def place(self, pos: Pos, team: Team) -> Optional[Victory]:
+        """
+        Учесть занятую клетку (после победы и для игроков без команды игнорируется).
+        Уже учтённая клетка той же команды пропускается: ход может прийти после rebuild,
+        который его уже учёл (уведомления отложены Subject.batch)
+        """
+        if self._victory is not None:
+            return self._victory
+
+        if team is Team.default():
+            return None
+
+        x, y = pos.x, pos.y
+        teams = self._teams
+
+        if teams.get((x, y)) is team:
+            return None
+
+        teams[x, y] = team
+
+        for (dx, dy), runs in zip(_DIRECTIONS, self._runs):
+            before = (x - dx, y - dy)
+            after = (x + dx, y + dy)
+
+            left = runs[before] if teams.get(before) is team else 0
+            right = runs[after] if teams.get(after) is team else 0
+            length = left + 1 + right
+
+            start = (x - left * dx, y - left * dy)
+            runs[start] = runs[x + right * dx, y + right * dy] = runs[x, y] = length
+
+            if length >= self.line_length:
+                return self._win(team, tuple(Vector2D(start[0] + i * dx, start[1] + i * dy) for i in range(length)))
+
+        return None
+
+    def rebuild(self, cells: Iterable[tuple[Pos, Team]]) -> Optional[Victory]:
+        """Пересчитать серии по клеткам поля (после смены команд владельцев)"""
+        self.reset()
+
+        for pos, team in cells:
+            victory = self.place(pos, team)
+
+            if victory is not None:
+                return victory
+
+        return None
+
+    def reset(self) -> None:
+        """Сбросить серии и победу"""
+        self._teams.clear()
+
+        for runs in self._runs:
+            runs.clear()
+
+        self._victory = None
@@ -8,10 +8,14 @@ from typing import Optional
 
 from game.core.entities.board import Board
 from game.core.entities.mac import Mac
+from game.core.entities.player import Player
+from game.core.entities.player import PlayerChange
 from game.core.entities.player import PlayerRegistry
 from game.core.entities.player import Team
 from game.core.entities.player import TeamRegistry
 from game.core.entities.rules import GameRules
+from game.core.entities.victory import Victory
+from game.core.entities.victory import VictoryDetector
 from rs.lina.vector import Vector2D
 from rs.misc.log import Logger
 from rs.misc.subject import Subject
@@ -33,6 +37,13 @@ class Environment:
 
         self.board: Final = Board(Vector2D(Board.max_size, Board.max_size), self.rules.score)
 
+        self.victory: Final = VictoryDetector(self.rules.win_line_length)
+        self.victory.victory_subject.addListener(self._onVictory)
+        self.board.move_subject.addListener(self._onBoardMove)
+        self.board.update_subject.addListener(self._onBoardUpdate)
+        self.player_registry.player_add_subject.addListener(self._onPlayerAdd)
+        self.player_registry.player_remove_subject.addListener(self._onPlayerRemove)
+
         self.protocol_message_sender: Callable[[Mac, str], Any] = self._mockMessageSender
 
     def _mockMessageSender(self, mac: Mac, message: str) -> None:
@@ -48,6 +59,39 @@ class Environment:
         self._host_mac = mac
         self.host_mac_subject.notify(self._host_mac)
 
+    def setWinLineLength(self, length: int) -> None:
+        """Установить длину победной линии (уже собранная линия новой длины сразу даёт победу)"""
+        self.rules.setWinLineLength(length)
+        self.victory.setLineLength(length)
+
+    def _onBoardMove(self, move: tuple[Player, Vector2D[int]]) -> None:
+        player, pos = move
+        self.victory.place(pos, player.team)
+
+    def _onBoardUpdate(self, state) -> None:
+        if len(state) == 0:
+            self.victory.reset()
+
+    def _onPlayerAdd(self, player: Player) -> None:
+        player.subject_change.addListener(self._onPlayerChange)
+
+    def _onPlayerRemove(self, player: Player) -> None:
+        player.subject_change.removeListener(self._onPlayerChange)
+
+    def _onPlayerChange(self, change: PlayerChange) -> None:
+        # Смена команды владельца меняет серии его клеток - пересчёт по полю (до победы)
+        if change.attribute != Player.Attribute.Team or self.victory.getVictory() is not None:
+            return
+
+        self.victory.rebuild((pos, cell.owner.team) for pos, cell in self.board.getState().items())
+
+    def _onVictory(self, victory: Victory) -> None:
+        self.rules.setMoveAvailable(False)
+
+        s = f"Победа: {victory.team} ({len(victory.line)} клеток от {victory.line[0]} до {victory.line[-1]})"
+        self._log.write(s)
+        self.protocol_message_sender(Mac.broadcast(), s)
+
     def onPlayerMessage(self, mac: Mac, message: str) -> str:
         """Обработчик сообщения от игрока"""
         self._log.write(f"got player message from {mac} : '{message}'")
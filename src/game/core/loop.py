@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass
+from queue import Empty
+from queue import Queue
+from threading import Lock
+from threading import Thread
+from threading import get_ident
+from time import perf_counter
+from types import MappingProxyType
+from typing import Any
+from typing import Callable
+from typing import Final
+from typing import Mapping
+from typing import Optional
+
+from game.core.entities.board import Pos
+from game.core.entities.mac import Mac
+from game.core.entities.player import Player
+from game.core.entities.player import PlayerChange
+from game.core.entities.player import Team
+from game.core.entities.player import TeamChange
+from game.core.environment import Environment
+from rs.misc.color import Color
+from rs.misc.log import Logger
+from rs.misc.subject import Subject
+
+type Command[T] = Callable[[Environment], T]
+"""Изменение окружения (выполняется в потоке владельца)"""
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerSnapshot:
+    """Игрок в снимке окружения"""
+
+    mac: Mac
+    name: str
+    team: Team
+    """Команда - только ключ для teams и команд окружения: её поля читаются в потоке владельца"""
+    score: int
+
+    def __str__(self) -> str:
+        return f"Игрок {self.mac} '{self.name}'"
+
+
+@dataclass(frozen=True, slots=True)
+class TeamSnapshot:
+    """Команда в снимке окружения"""
+
+    team: Team
+    """Команда - только ключ для команд окружения: её поля читаются в потоке владельца"""
+    name: str
+    color: Color
+    score: int
+    players: int
+
+    def __str__(self) -> str:
+        return f"Команда '{self.name}'"
+
+
+@dataclass(frozen=True, slots=True)
+class EnvironmentSnapshot:
+    """Неизменяемый снимок окружения"""
+
+    version: int
+    """Количество выполненных команд на момент снимка"""
+    host_mac: Optional[Mac]
+    board_size: Pos
+    cells: Mapping[Pos, Mac]
+    """Занятые клетки и MAC владельца"""
+    players: Mapping[Mac, PlayerSnapshot]
+    teams: Mapping[Team, TeamSnapshot]
+    """Зарегистрированные команды (без команды по умолчанию)"""
+    move_available: bool
+    winner: Optional[str]
+    """Победившая команда"""
+
+    def getCellColor(self, pos: Pos) -> Optional[Color]:
+        """Цвет команды владельца клетки (None - клетка пуста)"""
+        mac = self.cells.get(pos)
+
+        if mac is None:
+            return None
+
+        player = self.players.get(mac)
+        team = None if player is None else self.teams.get(player.team)
+        return Team.default().color if team is None else team.color
+
+
+class EnvironmentLoop:
+    """
+    Единственный писатель окружения.
+
+    Потоки протокола, агентов и UI не меняют окружение сами, а отправляют команды (submit):
+    их по очереди выполняет поток владельца (run/start). Команда из самого потока владельца
+    выполняется сразу, так что команды могут вызывать друг друга.
+    Читатели берут снимок (getSnapshot, takeSnapshot) - неизменяемый и помеченный номером версии.
+
+    Снимок публикуется владельцем, когда очередь опустела, но не реже раза в snapshot_secs под нагрузкой.
+    Публикация пересобирает только изменившиеся записи (по уведомлениям окружения),
+    а коллекции снимка копируются при первом чтении после публикации.
+    """
+
+    def __init__(self, env: Environment, queue_size: int = 4096, snapshot_secs: float = 0.05) -> None:
+        self._log: Final = Logger("env-loop")
+        self._env: Final = env
+        self._snapshot_secs: Final = snapshot_secs
+
+        self._commands: Final = Queue[tuple[Command, Future]](queue_size)
+        self._version = 0
+        self._owner: Optional[int] = None
+        self._running = False
+        self._thread: Optional[Thread] = None
+
+        self.snapshot_subject: Final[Subject[int]] = Subject()
+        """Опубликован снимок новой версии (в потоке владельца, сам снимок - getSnapshot)"""
+
+        # Изменения с прошлой публикации (только поток владельца)
+        self._dirty_players: Final = set[Player]()
+        self._dirty_teams: Final = set[Team]()
+        self._dirty_cells: Final = set[Pos]()
+        self._all_cells_dirty = True
+        self._published_version = -1
+
+        # Записи снимка (под _lock: их копируют читатели)
+        self._lock: Final = Lock()
+        self._players: Final = dict[Mac, PlayerSnapshot]()
+        self._teams: Final = dict[Team, TeamSnapshot]()
+        self._cells: Final = dict[Pos, Mac]()
+        self._stale_players = self._stale_teams = self._stale_cells = True
+        self._players_view: Mapping[Mac, PlayerSnapshot] = MappingProxyType({})
+        self._teams_view: Mapping[Team, TeamSnapshot] = MappingProxyType({})
+        self._cells_view: Mapping[Pos, Mac] = MappingProxyType({})
+        """Коллекции последнего снимка (копируются заново, только если записи изменились)"""
+        self._snapshot: Optional[EnvironmentSnapshot] = None
+
+        env.player_registry.player_add_subject.addListener(self._onPlayerAdd)
+        env.player_registry.player_remove_subject.addListener(self._onPlayerRemove)
+        env.team_registry.on_team_add.addListener(self._onTeamAdd)
+        env.team_registry.on_team_delete.addListener(self._onTeamDelete)
+        env.board.move_subject.addListener(self._onBoardMove)
+        env.board.update_subject.addListener(self._onBoardUpdate)
+
+        for player in env.player_registry.getAll().values():
+            self._onPlayerAdd(player)
+
+        for team in env.team_registry.getAll():
+            self._onTeamAdd(team)
+
+        self._publish()
+
+    @property
+    def env(self) -> Environment:
+        """Окружение (менять только командами, читать - в потоке владельца или через снимок)"""
+        return self._env
+
+    def isOwner(self) -> bool:
+        """Текущий поток - владелец окружения?"""
+        return self._owner == get_ident()
+
+    def submit[T](self, command: Command[T]) -> Future[T]:
+        """Поставить команду в очередь (блокирует, если очередь заполнена)"""
+        future = Future[T]()
+
+        if self.isOwner():
+            self._execute(command, future)
+
+        else:
+            self._commands.put((command, future))
+
+        return future
+
+    def call[T](self, command: Command[T], timeout: Optional[float] = None) -> T:
+        """Выполнить команду и дождаться результата"""
+        return self.submit(command).result(timeout)
+
+    def bind(self, f: Callable[..., Any]) -> Callable[..., None]:
+        """Обёртка, выполняющая f(*args) командой (для обработчиков UI)"""
+
+        def _submit(*args: Any) -> None:
+            self.submit(lambda _: f(*args))
+
+        return _submit
+
+    def getSnapshot(self) -> EnvironmentSnapshot:
+        """Последний опубликованный снимок окружения"""
+        with self._lock:
+            previous = self._snapshot
+
+            if previous is not None and previous.version == self._published_version:
+                return previous
+
+            self._snapshot = EnvironmentSnapshot(
+                version=self._published_version,
+                host_mac=self._host_mac,
+                board_size=self._board_size,
+                cells=self._cells_view if not self._stale_cells else MappingProxyType(dict(self._cells)),
+                players=self._players_view if not self._stale_players else MappingProxyType(dict(self._players)),
+                teams=self._teams_view if not self._stale_teams else MappingProxyType(dict(self._teams)),
+                move_available=self._move_available,
+                winner=self._winner,
+            )
+            self._cells_view = self._snapshot.cells
+            self._players_view = self._snapshot.players
+            self._teams_view = self._snapshot.teams
+            self._stale_players = self._stale_teams = self._stale_cells = False
+            return self._snapshot
+
+    def takeSnapshot(self, timeout: Optional[float] = None) -> EnvironmentSnapshot:
+        """Снимок с учётом всех команд, поставленных до вызова (через очередь команд)"""
+
+        def _take(_) -> EnvironmentSnapshot:
+            self._publish()
+            return self.getSnapshot()
+
+        return self.call(_take, timeout)
+
+    def getVersion(self) -> int:
+        """Количество выполненных команд"""
+        return self._version
+
+    def _execute(self, command: Command, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+
+        # Версия учитывает и выполняемую команду: снимок внутри неё (takeSnapshot) уже актуален
+        self._version += 1
+
+        try:
+            result = command(self._env)
+
+        except Exception as e:
+            self._log.write(f"command failed: {e!r}")
+            future.set_exception(e)
+
+        else:
+            future.set_result(result)
+
+    def _onPlayerAdd(self, player: Player) -> None:
+        player.subject_change.addListener(self._onPlayerChange)
+        self._dirty_players.add(player)
+
+    def _onPlayerRemove(self, player: Player) -> None:
+        player.subject_change.removeListener(self._onPlayerChange)
+        self._dirty_players.add(player)
+
+    def _onPlayerChange(self, change: PlayerChange) -> None:
+        self._dirty_players.add(change.player)
+
+    def _onTeamAdd(self, team: Team) -> None:
+        team.subject_change.addListener(self._onTeamChange)
+        self._dirty_teams.add(team)
+
+    def _onTeamDelete(self, team: Team) -> None:
+        team.subject_change.removeListener(self._onTeamChange)
+        self._dirty_teams.add(team)
+
+    def _onTeamChange(self, change: TeamChange) -> None:
+        self._dirty_teams.add(change.team)
+
+    def _onBoardMove(self, move: tuple[Player, Pos]) -> None:
+        self._dirty_cells.add(move[1])
+
+    def _onBoardUpdate(self, _) -> None:
+        self._all_cells_dirty = True
+
+    def _publish(self) -> None:
+        """Опубликовать изменения с прошлой публикации: O(изменившихся записей)"""
+        if self._published_version == self._version:
+            return
+
+        env = self._env
+        registered = env.player_registry.getAll()
+        teams = env.team_registry.getAll()
+        state = env.board.getState()
+        victory = env.victory.getVictory()
+
+        with self._lock:
+            for player in self._dirty_players:
+                # По MAC: игрок мог быть удалён и зарегистрирован заново
+                current = registered.get(player.mac)
+
+                if current is None:
+                    self._players.pop(player.mac, None)
+
+                else:
+                    self._players[player.mac] = PlayerSnapshot(current.mac, current.name, current.team, current.score)
+
+            for team in self._dirty_teams:
+                if team in teams:
+                    self._teams[team] = TeamSnapshot(team, team.name, team.color, team.score, len(team.players))
+
+                else:
+                    self._teams.pop(team, None)
+
+            if self._all_cells_dirty:
+                self._cells.clear()
+                self._cells.update((pos, cell.owner.mac) for pos, cell in state.items())
+
+            else:
+                for pos in self._dirty_cells:
+                    cell = state.get(pos)
+
+                    if cell is None:
+                        self._cells.pop(pos, None)
+
+                    else:
+                        self._cells[pos] = cell.owner.mac
+
+            self._stale_players |= len(self._dirty_players) > 0
+            self._stale_teams |= len(self._dirty_teams) > 0
+            self._stale_cells |= self._all_cells_dirty or len(self._dirty_cells) > 0
+
+            self._host_mac = env.host_mac
+            self._board_size = env.board.size
+            self._move_available = env.rules.move_available
+            self._winner = None if victory is None else victory.team.name
+            self._published_version = self._version
+
+        self._dirty_players.clear()
+        self._dirty_teams.clear()
+        self._dirty_cells.clear()
+        self._all_cells_dirty = False
+
+        self.snapshot_subject.notify(self._version)
+
+    def run(self) -> None:
+        """Выполнять команды в текущем потоке до stop"""
+        assert self._owner is None, "loop is already running"
+
+        self._owner = get_ident()
+        self._running = True
+
+        try:
+            while self._running:
+                command, future = self._commands.get()
+                self._execute(command, future)
+                started = perf_counter()
+
+                while self._running and perf_counter() - started < self._snapshot_secs:
+                    try:
+                        command, future = self._commands.get_nowait()
+
+                    except Empty:
+                        break
+
+                    self._execute(command, future)
+
+                self._publish()
+
+        finally:
+            self._owner = None
+
+    def start(self) -> None:
+        """Запустить поток владельца"""
+        self._thread = Thread(target=self.run, name="env-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Выполнить уже поставленные команды и остановить поток владельца.
+        Из самого потока владельца (команда) - остановка после текущей команды, без ожидания
+        """
+
+        def _stop(_) -> None:
+            self._running = False
+
+        self.submit(_stop)
+
+        if self.isOwner():
+            return
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
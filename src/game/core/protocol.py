@@ -3,6 +3,7 @@ from typing import Final
 
 from bytelang.abc.stream import Stream
 from bytelang.core.protocol import Protocol
+from bytelang.exceptions import catch
 from bytelang.impl.serializer.array_ import ArraySerializer
 from bytelang.impl.serializer.arraystring import ArrayStringSerializer
 from bytelang.impl.serializer.bytearray_ import ByteArraySerializer
@@ -10,12 +11,12 @@ from bytelang.impl.serializer.bytevector import ByteVectorSerializer
 from bytelang.impl.serializer.primitive import u8
 from bytelang.impl.serializer.struct_ import StructSerializer
 from bytelang.impl.serializer.void import VoidSerializer
-from bytelang.impl.stream.byte import ByteBufferInputStream
-from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.byte import ByteViewInputStream
+from game.core.entities.board import Board
 from game.core.entities.mac import Mac
 from game.core.environment import Environment
-from rs.lina.vector import Vector2D
 from rs.misc.log import Logger
+from rs.misc.subject import Subject
 from rs.result import Result
 from rs.result import ok
 
@@ -43,15 +44,18 @@ class GameProtocol(Protocol):
     def __init__(self, stream: Stream, env: Environment) -> None:
         super().__init__(stream, u8, u8)
 
-        env.protocol_message_sender = self._sendEspnowServerMessage
+        env.protocol_message_sender = self.sendMessage
 
         self._log = Logger("protocol")
         self._esp_log = Logger("device")
 
         self.env: Final = env
 
-        self.request_mac: Ins[None] = self.addSender(VoidSerializer())
-        self.send_espnow_packet: Ins[tuple[bytes, bytes]] = self.addSender(self.espnow_packet)
+        self.peer_subject: Final[Subject[Mac]] = Subject()
+        """Отправитель принятого пакета ESP-NOW (для маршрутизации ответов между мостами)"""
+
+        self.request_mac: Ins[None] = self.addSender(VoidSerializer(), "request_mac")
+        self.send_espnow_packet: Ins[tuple[bytes, bytes]] = self.addSender(self.espnow_packet, "send_espnow_packet")
 
         self.addReceiver(self.mac, self._onMac, "read_mac")
         self.addReceiver(self.log_message, self._onLog, "read_log")
@@ -81,32 +85,40 @@ class GameProtocol(Protocol):
         size = len(data)
 
         mac = Mac(raw_mac)
+        self.peer_subject.notify(mac)
 
-        stream = ByteBufferInputStream(data)
+        stream = ByteViewInputStream(data)
 
         if size == 32:
             return (
                 self.player_message.read(stream)
-                .and_then(lambda message: self._sendEspnowServerMessage(mac, self.env.onPlayerMessage(mac, message)))
+                .and_then(lambda message: self.sendMessage(mac, self.env.onPlayerMessage(mac, message)))
                 .map_err(lambda e: f"player message err: {e}")
             )
 
         if size == 2:
             return (
                 self.player_move.read(stream)
-                .and_then(lambda move: self._sendEspnowServerMessage(mac, self.env.onPlayerMove(mac, Vector2D(*move))))
+                .and_then(lambda move: self.sendMessage(mac, self.env.onPlayerMove(mac, Board.internPos(*move))))
                 .map_err(lambda e: f"player move err: {e}")
             )
 
-        return self._sendEspnowServerMessage(mac, f"Клиент {mac} отправил непредвиденный пакет: ({size} Байт)")
+        return self.sendMessage(mac, f"Клиент {mac} отправил непредвиденный пакет: ({size} Байт)")
+
+    @classmethod
+    def fitMessage(cls, message: str) -> str:
+        """Обрезать сообщение до поля log_message по границе символа UTF-8 (ответы бывают длиннее поля)"""
+        return message.encode()[:cls.log_message.getLength()].decode(errors="ignore")
 
-    def _sendEspnowServerMessage(self, mac: Mac, message: str):
+    def sendMessage(self, mac: Mac, message: str):
         """Отправить сообщение адресату"""
 
         self._log.write(f"send to {mac} : '{message}'")
 
-        stream = ByteBufferOutputStream()
+        message = self.fitMessage(message)
+
+        # Готовая дополненная кодировка сразу уходит полезной нагрузкой пакета, без промежуточного буфера
         return (
-            self.log_message.write(stream, message)
-            .and_then(lambda _: self.send_espnow_packet((mac.value, stream.buffer)))
+            catch(self.log_message.encode_raw, message)
+            .and_then(lambda payload: self.send_espnow_packet((mac.value, payload)))
         )
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import heapq
+import os
+import tty
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import count
+from random import Random
+from threading import Condition
+from threading import Lock
+from threading import Thread
+from time import perf_counter
+from time import sleep
+from typing import Callable
+from typing import Final
+from typing import Iterator
+
+from bytelang.abc.stream import OutputStream
+from bytelang.abc.stream import Stream
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.serializer.void import VoidSerializer
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.fd import FdStream
+from game.core.entities.mac import Mac
+from game.core.protocol import GameProtocol
+from rs.misc.subject import Subject
+from rs.result import Result
+from rs.result import ok
+
+_BITS_PER_BYTE: Final = 10
+"""Старт, 8 бит данных, стоп"""
+
+
+@dataclass(frozen=True, kw_only=True)
+class EmulatorConfig:
+    """Параметры эмулируемого моста"""
+
+    mac: Mac = Mac(bytes((0x24, 0x6F, 0x28, 0x00, 0x00, 0x01)))
+    """MAC моста (ответ на request_mac)"""
+    baud: int = 115200
+    """Скорость UART: ограничивает обмен с хостом в обе стороны"""
+    radio_latency_secs: float = 0.002
+    """Время в эфире одного пакета ESP-NOW (пакеты передаются по очереди)"""
+    delivery_failure_rate: float = 0.0
+    """Доля пакетов хоста, не доставленных игроку (статус доставки - Fail)"""
+    uplink_loss_rate: float = 0.0
+    """Доля пакетов игроков, потерянных по пути к мосту"""
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class EmulatorStats:
+    """Метрики эмулятора"""
+
+    uplink_packets: int
+    """Передано хосту пакетов игроков"""
+    uplink_lost: int
+    """Потеряно пакетов игроков"""
+    downlink_packets: int
+    """Принято пакетов от хоста"""
+    delivery_failures: int
+    """Не доставлено пакетов хоста"""
+
+
+class _PacedStream(Stream):
+    """Поток с ограничением скорости UART: каждое направление не быстрее baud"""
+
+    def __init__(self, stream: Stream, baud: int) -> None:
+        self._stream: Final = stream
+        self._secs_per_byte: Final = _BITS_PER_BYTE / baud
+
+        self._rx_ready = 0.0
+        self._tx_ready = 0.0
+
+    def _pace(self, ready: float, size: int) -> float:
+        """Дождаться окончания передачи size байт, начатой не раньше ready"""
+        now = perf_counter()
+        ready = max(ready, now) + size * self._secs_per_byte
+
+        if ready > now:
+            sleep(ready - now)
+
+        return ready
+
+    def read_some_raw(self, max_size: int) -> bytes:
+        data = self._stream.read_some_raw(max_size)
+        self._rx_ready = self._pace(self._rx_ready, len(data))
+        return data
+
+    def read_raw(self, size: int) -> bytes:
+        data = self._stream.read_raw(size)
+        self._rx_ready = self._pace(self._rx_ready, len(data))
+        return data
+
+    def available(self) -> int:
+        return self._stream.available()
+
+    @contextmanager
+    def frame(self) -> Iterator[OutputStream]:
+        buffer = ByteBufferOutputStream()
+        yield buffer
+        self.write_raw(bytes(buffer.buffer))
+
+    def write_raw(self, data: bytes) -> None:
+        self._tx_ready = self._pace(self._tx_ready, len(data))
+        self._stream.write_raw(data)
+
+
+class BridgeEmulator:
+    """
+    Программный мост ESP32: сторона моста GameProtocol поверх псевдотерминала Linux.
+
+    Хост открывает getPort() обычным SerialStream. Эмулятор отвечает на request_mac,
+    принимает send_espnow_packet и через время в эфире отвечает read_delivery_status,
+    а пакеты эмулируемых игроков (transmit) отдаёт хосту как read_espnow_packet.
+    Всё, что уходит хосту, пишет один поток эфира - в порядке очереди пакетов.
+    """
+
+    def __init__(self, config: EmulatorConfig = EmulatorConfig()) -> None:
+        self._config: Final = config
+        self._random: Final = Random(config.seed)
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self._port: Final = os.ttyname(self._slave)
+
+        self._protocol: Final = Protocol(_PacedStream(FdStream(self._master), config.baud), u8, u8)
+
+        # Зеркально GameProtocol: его приёмники - наши отправители и наоборот
+        self._send_mac: Final = self._protocol.addSender(GameProtocol.mac, "read_mac")
+        self._send_log: Final = self._protocol.addSender(GameProtocol.log_message, "read_log")
+        self._send_packet: Final = self._protocol.addSender(GameProtocol.espnow_packet, "read_espnow_packet")
+        self._send_status: Final = self._protocol.addSender(GameProtocol.espnow_delivery_status, "read_delivery_status")
+
+        self._protocol.addReceiver(VoidSerializer(), self._onRequestMac, "request_mac")
+        self._protocol.addReceiver(GameProtocol.espnow_packet, self._onHostPacket, "send_espnow_packet")
+
+        self.downlink_subject: Final[Subject[tuple[Mac, bytes]]] = Subject()
+        """Пакет хоста, доставленный игроку (вызывается из потока эфира)"""
+
+        self._air: Final = list[tuple[float, int, Callable[[], None]]]()
+        """Очередь эфира: момент отправки, порядковый номер, действие"""
+        self._air_order: Final = count()
+        self._air_ready = 0.0
+        """Момент освобождения эфира"""
+        self._air_condition: Final = Condition()
+
+        self._stats_lock: Final = Lock()
+        """Счётчики меняют потоки эфира и хоста"""
+        self._uplink_packets = 0
+        self._uplink_lost = 0
+        self._downlink_packets = 0
+        self._delivery_failures = 0
+
+        self._running = True
+        self._threads: Final = (
+            Thread(target=self._hostLoop, name="emulator-host", daemon=True),
+            Thread(target=self._airLoop, name="emulator-air", daemon=True),
+        )
+
+        for thread in self._threads:
+            thread.start()
+
+    def getPort(self) -> str:
+        """Путь псевдотерминала для SerialStream"""
+        return self._port
+
+    def getStats(self) -> EmulatorStats:
+        """Получить метрики эмулятора"""
+        with self._stats_lock:
+            return EmulatorStats(self._uplink_packets, self._uplink_lost, self._downlink_packets, self._delivery_failures)
+
+    # Эфир
+
+    def _schedule(self, action: Callable[[], None], on_air: bool) -> None:
+        """Поставить действие в очередь эфира (on_air - пакет занимает эфир на radio_latency_secs)"""
+        with self._air_condition:
+            due = perf_counter()
+
+            if on_air:
+                due = self._air_ready = max(self._air_ready, due) + self._config.radio_latency_secs
+
+            heapq.heappush(self._air, (due, next(self._air_order), action))
+            self._air_condition.notify()
+
+    def _airLoop(self) -> None:
+        while True:
+            with self._air_condition:
+                while self._running:
+                    if len(self._air) > 0:
+                        delay = self._air[0][0] - perf_counter()
+
+                        if delay <= 0:
+                            break
+
+                        self._air_condition.wait(delay)
+
+                    else:
+                        self._air_condition.wait()
+
+                if not self._running:
+                    return
+
+                _, _, action = heapq.heappop(self._air)
+
+            action()
+
+    def transmit(self, mac: Mac, data: bytes) -> None:
+        """Пакет эмулируемого игрока: дойдёт до хоста через время в эфире (или потеряется)"""
+
+        def _deliver() -> None:
+            if self._random.random() < self._config.uplink_loss_rate:
+                with self._stats_lock:
+                    self._uplink_lost += 1
+
+                return
+
+            with self._stats_lock:
+                self._uplink_packets += 1
+
+            self._send_packet((mac.value, data))
+
+        self._schedule(_deliver, on_air=True)
+
+    # Обработчики хоста
+
+    def _hostLoop(self) -> None:
+        while self._running:
+            result = self._protocol.pull()
+
+            if result.is_err() and self._running:
+                self._schedule(lambda e=result.err().unwrap(): self._send_log(GameProtocol.fitMessage(f"emulator: {e}")), on_air=False)
+
+    def _onRequestMac(self, _) -> Result[None, str]:
+        self._schedule(lambda: self._send_mac(self._config.mac.value), on_air=False)
+        return ok(None)
+
+    def _onHostPacket(self, packet: tuple[bytes, bytes]) -> Result[None, str]:
+        raw_mac, data = packet
+        mac = Mac(bytes(raw_mac))
+        data = bytes(data)
+
+        with self._stats_lock:
+            self._downlink_packets += 1
+
+        def _deliver() -> None:
+            # Широковещательные пакеты ESP-NOW всегда сообщают об успехе
+            failed = mac != Mac.broadcast() and self._random.random() < self._config.delivery_failure_rate
+
+            if failed:
+                with self._stats_lock:
+                    self._delivery_failures += 1
+
+            else:
+                self.downlink_subject.notify((mac, data))
+
+            self._send_status((mac.value, int(failed)))
+
+        self._schedule(_deliver, on_air=True)
+        return ok(None)
+
+    def close(self) -> None:
+        """Остановить эмулятор и закрыть псевдотерминал"""
+        with self._air_condition:
+            self._running = False
+            self._air_condition.notify()
+
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+
+            except OSError:
+                pass
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}<{self._port}>"
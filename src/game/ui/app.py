@@ -1,22 +1,28 @@
+from typing import Callable
+from typing import Sequence
+
 from kf_dpg.core.app import App
 from kf_dpg.impl.containers import Tab
 from kf_dpg.impl.containers import TabBar
 from kf_dpg.impl.containers import Window
-from game.core.environment import Environment
+from bytelang.core.protocol import Protocol
+from game.core.loop import EnvironmentLoop
 from game.assets import Assets
 from game.ui.gamecontrol import GameControlPanel
 from game.ui.gameview import GameView
 from game.ui.logview import LogView
+from game.ui.protocolview import ProtocolView
 
 
 class GameApp(App):
 
-    def __init__(self, env: Environment) -> None:
+    def __init__(self, loop: EnvironmentLoop, bridges: Callable[[], Sequence[Protocol]] = tuple) -> None:
         super().__init__(Window().withFont(Assets.default_font))
 
         self.window.add(
             TabBar()
-            .add(Tab("Игра").add(GameView(env)))
-            .add(Tab("Управление").add(GameControlPanel(env)))
+            .add(Tab("Игра").add(GameView(loop)))
+            .add(Tab("Управление").add(GameControlPanel(loop)))
             .add(Tab("Журнал").add(LogView()))
+            .add(Tab("Протокол").add(ProtocolView(bridges)))
         )
@@ -1,7 +1,7 @@
 from itertools import product
+from threading import Lock
 from typing import Dict
 from typing import Final
-from typing import Mapping
 from typing import Optional
 from typing import Set
 from typing import Tuple
@@ -16,9 +16,9 @@ from kf_dpg.impl.containers import VBox
 from kf_dpg.impl.misc import Spacer
 from kf_dpg.impl.sliders import FloatSlider
 from game.core.entities.board import Board
-from game.core.entities.board import Cell
-from game.core.entities.player import Player
 from game.core.entities.player import Team
+from game.core.loop import EnvironmentLoop
+from game.core.loop import EnvironmentSnapshot
 from rs.lina.vector import Vector2D
 from rs.misc.color import Color
 from rs.misc.log import Logger
@@ -27,7 +27,10 @@ type Pos = Vector2D[int]
 
 
 class BoardView(CustomWidget):
-    """Визуализация игрового поля с сохранением всех клеток и правильным управлением видимостью"""
+    """
+    Визуализация игрового поля с сохранением всех клеток и правильным управлением видимостью.
+    Клетки рисуются только по снимкам окружения: после каждой публикации перекрашиваются изменившиеся
+    """
 
     empty_cell_border_color: Final[Color] = Team.default().color.darker(0.58)
 
@@ -35,18 +38,20 @@ class BoardView(CustomWidget):
     base_rounding_ratio: Final[float] = 0.25
     default_scale: Final[float] = 1.0
 
-    def __init__(self, board: Board) -> None:
+    def __init__(self, loop: EnvironmentLoop) -> None:
         self._log = Logger("game-board-view")
-        self._board = board
+        self._loop: Final = loop
         self._scale: float = self.default_scale
         self._grid: Dict[Pos, Rectangle] = {}
+        self._colors: Dict[Pos, Optional[Color]] = {}
+        """Цвет, которым нарисована клетка"""
         self._visible_cells: Set[Pos] = set()
         self._last_window_size: Optional[Tuple[int, int]] = None
-        self._last_board_size: Vector2D[int] = board.size
+        self._last_board_size: Vector2D[int] = loop.getSnapshot().board_size
+        self._lock: Final = Lock()
+        """Перерисовка идёт из потока владельца (публикация) и из потока UI (масштаб, кнопка)"""
 
-        board.size_subject.addListener(self._handleBoardResize)
-        board.move_subject.addListener(lambda args: self._handlePlayerMove(*args))
-        board.update_subject.addListener(self._handleBoardUpdate)
+        loop.snapshot_subject.addListener(self._handleSnapshot)
 
         self._canvas = DpgCanvas(2000, 2000)
         self._canvas_window = ChildWindow(scrollable_y=True, scrollable_x=True).add(self._canvas)
@@ -58,7 +63,7 @@ class BoardView(CustomWidget):
                 .add(
                     Button()
                     .withLabel("Обновить")
-                    .withHandler(board.notifyUpdate)
+                    .withHandler(self._redrawAll)
                 )
                 .add(
                     Spacer()
@@ -86,30 +91,33 @@ class BoardView(CustomWidget):
 
     def _initializeBoard(self) -> None:
         """Инициализирует доску при создании виджета"""
-        self._createAllCells()
-        self._updateVisibility(self._board.size)
-        self._log.write(f"Доска инициализирована: {self._board.size}")
+        with self._lock:
+            snapshot = self._loop.getSnapshot()
+            self._createAllCells(snapshot)
+            self._updateVisibility(snapshot.board_size)
 
-    def _createAllCells(self) -> None:
+        self._log.write(f"Доска инициализирована: {snapshot.board_size}")
+
+    def _createAllCells(self, snapshot: EnvironmentSnapshot) -> None:
         """Создает все возможные клетки для максимального размера доски"""
         max_size = Board.max_size
 
         for x, y in product(range(max_size), range(max_size)):
-            pos = Vector2D(x, y)
+            pos = Board.internPos(x, y)
             if pos not in self._grid:
-                rect = self._createCell(pos)
+                rect = self._createCell(pos, snapshot.getCellColor(pos))
                 rect.hide()  # Скрываем при создании
                 self._grid[pos] = rect
 
         self._log.write(f"Создано клеток: {len(self._grid)}")
 
-    def _createCell(self, pos: Pos) -> Rectangle:
+    def _createCell(self, pos: Pos, color: Optional[Color]) -> Rectangle:
         """Создает новую клетку с заданной позицией"""
         rect = Rectangle(
             _fill_color=Color.none(),
             _contour_color=self._prepareColor(pos, self.empty_cell_border_color)
         )
-        self._applyCellStyle(pos, rect, self._board.getState().get(pos))
+        self._applyCellStyle(pos, rect, color)
         self._applyCellTransform(pos, rect)
         self._canvas.add(rect)
         return rect
@@ -118,11 +126,11 @@ class BoardView(CustomWidget):
         """Рассчитывает размер клетки с учетом масштаба и размеров окна"""
         return 100 * self._scale
 
-    def _applyCellStyle(self, pos: Pos, rect: Rectangle, cell: Optional[Cell] = None) -> None:
-        """Применяет стиль клетки на основе её состояния"""
+    def _applyCellStyle(self, pos: Pos, rect: Rectangle, team_color: Optional[Color]) -> None:
+        """Применяет стиль клетки по цвету команды владельца (None - пустая клетка)"""
+        self._colors[pos] = team_color
 
-        if cell:
-            team_color = cell.owner.team.color
+        if team_color is not None:
             rect.fill_color = team_color
             contour = team_color.darker(0.4)
 
@@ -164,7 +172,7 @@ class BoardView(CustomWidget):
         # Показываем клетки в пределах новой доски
         for x in range(board_size.x):
             for y in range(board_size.y):
-                pos = Vector2D(x, y)
+                pos = Board.internPos(x, y)
                 new_visible.add(pos)
 
                 if rect := self._grid.get(pos):
@@ -174,41 +182,39 @@ class BoardView(CustomWidget):
         self._last_board_size = board_size
         self._log.write(f"Обновлена видимость: видимых {len(new_visible)}")
 
-    def _updateAllCells(self) -> None:
+    def _updateAllCells(self, snapshot: EnvironmentSnapshot) -> None:
         """Обновляет все видимые клетки"""
         for pos in self._visible_cells:
-            self._updateCell(pos)
+            if rect := self._grid.get(pos):
+                self._applyCellStyle(pos, rect, snapshot.getCellColor(pos))
+                self._applyCellTransform(pos, rect)
+
+    def _redrawAll(self) -> None:
+        """Перерисовать все видимые клетки по последнему снимку"""
+        with self._lock:
+            self._updateAllCells(self._loop.getSnapshot())
 
-    def _updateCell(self, pos: Pos) -> None:
-        """Обновляет конкретную клетку с актуальным состоянием из доски"""
-        if rect := self._grid.get(pos):
-            # Всегда получаем актуальное состояние из доски
-            cell_state = self._board.getState().get(pos)
-            self._applyCellStyle(pos, rect, cell_state)
-            self._applyCellTransform(pos, rect)
+        self._log.write("Полное обновление доски выполнено")
 
     def _handleScaleChange(self, scale: float) -> None:
         """Обработчик изменения масштаба"""
         self._scale = scale
-        self._updateAllCells()
+        self._redrawAll()
         self._log.write(f"Масштаб изменен: {scale}")
 
-    def _handleBoardResize(self, board_size: Vector2D[int]) -> None:
-        """Обработчик изменения размера доски"""
-        self._updateVisibility(board_size)
-        self._updateAllCells()
-        self._log.write(f"Размер доски изменен: {board_size}")
-
-    def _handlePlayerMove(self, player: Player, position: Vector2D[int]) -> None:
-        """Обработчик хода игрока"""
-        if position in self._visible_cells:
-            self._updateCell(position)
-            self._log.write(f"Отображен ход игрока '{player}' на позиции {position}")
-
-    def _handleBoardUpdate(self, state: Mapping[Pos, Cell]) -> None:
-        """Обработчик полного обновления доски (включая сброс)"""
-        # Обновляем ВСЕ видимые клетки, независимо от содержимого события
-        for pos in self._visible_cells:
-            self._updateCell(pos)
+    def _handleSnapshot(self, _) -> None:
+        """Обработчик публикации снимка: размер поля и перекраска изменившихся клеток"""
+        with self._lock:
+            snapshot = self._loop.getSnapshot()
 
-        self._log.write("Полное обновление доски выполнено")
+            if snapshot.board_size != self._last_board_size:
+                self._updateVisibility(snapshot.board_size)
+                self._updateAllCells(snapshot)
+                self._log.write(f"Размер доски изменен: {snapshot.board_size}")
+                return
+
+            for pos in self._visible_cells:
+                color = snapshot.getCellColor(pos)
+
+                if color != self._colors.get(pos) and (rect := self._grid.get(pos)):
+                    self._applyCellStyle(pos, rect, color)
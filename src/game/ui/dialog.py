@@ -144,10 +144,17 @@ class EditDialog[T](ModalDialog, ABC):
         self._window.setLabel(f"Редактирование: {self._getTitle(value)}")
 
     @final
-    def createEditButton(self, value: T) -> Button:
-        """Создать кнопку для открытия диалога редактирования данного игрока"""
+    def createEditButton(self, provider: Callable[[], Optional[T]]) -> Button:
+        """Создать кнопку, открывающую диалог для значения provider() на момент нажатия (None - не открывать)"""
+
+        def _begin() -> None:
+            value = provider()
+
+            if value is not None:
+                self.begin(value)
+
         return (
             Button()
             .withLabel("···")
-            .withHandler(lambda: self.begin(value))
+            .withHandler(_begin)
         )
@@ -15,19 +15,36 @@ from kf_dpg.impl.text import Text
 from game.core.entities.board import Board
 from game.core.entities.player import Player
 from game.core.entities.player import Team
-from game.core.environment import Environment
+from game.core.loop import EnvironmentLoop
 from game.assets import Assets
 from game.ui.input2d import Int2DInput
 from rs.misc.color import Color
+from rs.misc.subject import Subject
 
 
 class GameControlPanel(CustomWidget):
     """Панель управления игрой"""
 
-    def __init__(self, env: Environment):
+    def __init__(self, loop: EnvironmentLoop):
+        env = loop.env
+
         def _forEachPlayer(f: Callable[[Player], Any]):
-            for p in env.player_registry.getAll().values():
-                f(p)
+            def _command(_) -> None:
+                # Наблюдатели команд и списков получают по одному уведомлению на всю операцию
+                with Subject.batch():
+                    for p in env.player_registry.getAll().values():
+                        f(p)
+
+            loop.submit(_command)
+
+        move_available = (
+            CheckBox(_value=env.rules.move_available)
+            .withLabel("Разрешить ходы")
+            .withHandler(loop.bind(env.rules.setMoveAvailable))
+        )
+
+        # Победа замораживает ходы
+        env.victory.victory_subject.addListener(lambda _: move_available.setValue(False))
 
         super().__init__(
             VBox()
@@ -46,7 +63,7 @@ class GameControlPanel(CustomWidget):
                         Button()
                         .withWidth(-1)
                         .withLabel("Сбросить доску")
-                        .withHandler(env.board.reset)
+                        .withHandler(loop.bind(env.board.reset))
                     )
 
                     .add(
@@ -83,7 +100,7 @@ class GameControlPanel(CustomWidget):
                             units="сек",
                             interval=(0, 10)
                         )
-                        .withHandler(env.rules.setMoveCooldown)
+                        .withHandler(loop.bind(env.rules.setMoveCooldown))
                     )
 
                     .add(Spacer().withHeight(20))
@@ -105,7 +122,7 @@ class GameControlPanel(CustomWidget):
                             step_fast=10,
                         )
                         .withLabel("Пусто")
-                        .withHandler(env.rules.score.setEmptyCell)
+                        .withHandler(loop.bind(env.rules.score.setEmptyCell))
                     )
                     .add(
                         IntInput(
@@ -113,7 +130,7 @@ class GameControlPanel(CustomWidget):
                             step_fast=10,
                         )
                         .withLabel("Союзник")
-                        .withHandler(env.rules.score.setFriendCell)
+                        .withHandler(loop.bind(env.rules.score.setFriendCell))
                     )
                     .add(
                         IntInput(
@@ -121,7 +138,7 @@ class GameControlPanel(CustomWidget):
                             step_fast=10,
                         )
                         .withLabel("Враг")
-                        .withHandler(env.rules.score.setEnemyCell)
+                        .withHandler(loop.bind(env.rules.score.setEnemyCell))
                     )
 
                 )
@@ -133,16 +150,20 @@ class GameControlPanel(CustomWidget):
 
                 .add(
                     VBox()
+                    .add(move_available)
                     .add(
-                        CheckBox(_value=env.rules.move_available)
-                        .withLabel("Разрешить ходы")
-                        .withHandler(env.rules.setMoveAvailable)
+                        IntInput(
+                            env.rules.win_line_length,
+                        )
+                        .withLabel("Линия победы")
+                        .withInterval((1, Board.max_size))
+                        .withHandler(loop.bind(env.setWinLineLength))
                     )
                     .add(
                         Int2DInput(
                             "Размер доски",
                             (1, Board.max_size),
-                            on_change=env.board.setSize,
+                            on_change=loop.bind(env.board.setSize),
                             default=env.board.size,
                         )
                     )
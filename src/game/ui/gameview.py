@@ -6,7 +6,7 @@ from kf_dpg.impl.containers import Tab
 from kf_dpg.impl.containers import TabBar
 from kf_dpg.impl.containers import VBox
 from kf_dpg.impl.misc import Separator
-from game.core.environment import Environment
+from game.core.loop import EnvironmentLoop
 from game.assets import Assets
 from game.ui.boardview import BoardView
 from game.ui.playerlist import PlayerList
@@ -15,7 +15,8 @@ from game.ui.teamlist import TeamList
 
 class GameView(CustomWidget):
 
-    def __init__(self, env: Environment) -> None:
+    def __init__(self, loop: EnvironmentLoop) -> None:
+        env = loop.env
         host_mac_display = TextDisplay("Хост", default="Ожидание...")
 
         env.host_mac_subject.addListener(host_mac_display.setValue)
@@ -31,10 +32,10 @@ class GameView(CustomWidget):
                 .add(
                     TabBar()
                     .add(
-                        Tab("Игроки").add(PlayerList(env.player_registry, env.team_registry))
+                        Tab("Игроки").add(PlayerList(loop))
                     )
                     .add(
-                        Tab("Команды").add(TeamList(env.team_registry))
+                        Tab("Команды").add(TeamList(loop))
                     )
                 )
             )
@@ -47,7 +48,7 @@ class GameView(CustomWidget):
                     .withLabel("MAC адрес хоста")
                 )
                 .add(Separator())
-                .add(BoardView(env.board))
+                .add(BoardView(loop))
             )
         )
 
@@ -11,31 +11,32 @@ from kf_dpg.impl.containers import HBox
 from kf_dpg.impl.containers import VBox
 from kf_dpg.impl.text import Text
 from game.core.entities.player import Player
-from game.core.entities.player import PlayerRegistry
+from game.core.entities.player import PlayerChange
 from game.core.entities.player import Team
-from game.core.entities.player import TeamRegistry
+from game.core.entities.player import TeamChange
+from game.core.environment import Environment
+from game.core.loop import EnvironmentLoop
+from game.core.loop import PlayerSnapshot
+from game.core.loop import TeamSnapshot
 from game.ui.dialog import ConfirmDialog
 from game.ui.dialog import EditDialog
 from rs.misc.color import Color
 from rs.misc.log import Logger
 
 
-class PlayerEditDialog(EditDialog[Player]):
-    """Модальный диалог редактирования игрока"""
+class PlayerEditDialog(EditDialog[PlayerSnapshot]):
+    """Модальный диалог редактирования игрока (значения - из снимка окружения)"""
 
-    def __init__(self, team_registry: TeamRegistry) -> None:
+    def __init__(self, loop: EnvironmentLoop) -> None:
+        self._loop: Final = loop
         self._name_input: Final = TextInput()
         self._score_input: Final = IntInput(step=10, step_fast=100)
 
-        self._team_combo: Final[ComboBox[Team]] = ComboBox(
+        self._team_combo: Final[ComboBox[TeamSnapshot]] = ComboBox(
             _value=None,
-            _items_provider=team_registry.getAll
+            _items_provider=lambda: loop.getSnapshot().teams.values()
         )
 
-        team_registry.on_team_add.addListener(self._updateTeamList)
-        team_registry.on_team_update.addListener(self._updateTeamList)
-        team_registry.on_team_delete.addListener(self._updateTeamList)
-
         super().__init__(
             (
                 VBox()
@@ -56,23 +57,37 @@ class PlayerEditDialog(EditDialog[Player]):
         )
 
     @classmethod
-    def _getTitle(cls, value: Player) -> str:
+    def _getTitle(cls, value: PlayerSnapshot) -> str:
         return value.name
 
-    def apply(self, player: Player) -> None:
-        player.name = self._name_input.getValue()
-        player.score = self._score_input.getValue()
-        t = self._team_combo.getValue()
-        player.setTeam(t)
+    def apply(self, snapshot: PlayerSnapshot) -> None:
+        name = self._name_input.getValue()
+        score = self._score_input.getValue()
+        team = self._team_combo.getValue()
+
+        def _apply(env: Environment) -> None:
+            player = env.player_registry.getAll().get(snapshot.mac)
+
+            if player is None:
+                return
+
+            player.name = name
+            player.score = score
+
+            # Команда могла быть удалена, пока диалог был открыт
+            if team is not None and team.team in env.team_registry.getAll():
+                player.setTeam(team.team)
 
-    def begin(self, player: Player) -> None:
-        super().begin(player)
-        self._score_input.setValue(player.score)
-        self._name_input.setValue(player.name)
-        self._team_combo.setValue(player.team)
+        self._loop.submit(_apply)
 
-    def _updateTeamList(self, _=None) -> None:
+    def begin(self, snapshot: PlayerSnapshot) -> None:
+        super().begin(snapshot)
+        self._score_input.setValue(snapshot.score)
+        self._name_input.setValue(snapshot.name)
+
+        # Список команд и выбранная - из одного снимка
         self._team_combo.update()
+        self._team_combo.setValue(self._loop.getSnapshot().teams.get(snapshot.team))
 
 
 class PlayerCard(CustomWidget):
@@ -122,18 +137,27 @@ class PlayerCard(CustomWidget):
             )
         )
 
-    def _updatePlayer(self, player: Player) -> None:
-        self._name_display.setValue(player.name)
-        self._score_display.setValue(player.score)
+    def _updatePlayer(self, change: PlayerChange) -> None:
+        player = change.player
+
+        if change.attribute == Player.Attribute.Name:
+            self._name_display.setValue(player.name)
+
+        elif change.attribute == Player.Attribute.Score:
+            self._score_display.setValue(player.score)
 
-        if player.team != self._current_team:
+        elif change.attribute == Player.Attribute.Team and player.team != self._current_team:
             self._current_team.subject_change.removeListener(self._updateTeam)
             self._current_team = player.team
             self._current_team.subject_change.addListener(self._updateTeam)
 
-            self._updateTeam(self._current_team)
+            self._showTeam(self._current_team)
 
-    def _updateTeam(self, team: Team) -> None:
+    def _updateTeam(self, change: TeamChange) -> None:
+        if change.attribute in (Team.Attribute.Name, Team.Attribute.Color):
+            self._showTeam(change.team)
+
+    def _showTeam(self, team: Team) -> None:
         self._team_name_display.setValue(team.name)
         self._team_name_display.setColor(team.color)
 
@@ -146,12 +170,13 @@ class PlayerCard(CustomWidget):
 class PlayerList(CustomWidget):
     """Список игроков"""
 
-    def __init__(self, player_registry: PlayerRegistry, team_registry: TeamRegistry) -> None:
+    def __init__(self, loop: EnvironmentLoop) -> None:
         self._log: Final = Logger('player-list')
 
-        self._player_registry: Final = player_registry
+        self._loop: Final = loop
+        self._player_registry: Final = loop.env.player_registry
 
-        self._player_edit_dialog: Final = PlayerEditDialog(team_registry)
+        self._player_edit_dialog: Final = PlayerEditDialog(loop)
         self._player_delete_dialog: Final = ConfirmDialog(ok_button_label="Скатертью дорожка!").withLabel("Отправить погулять?")
         self._player_list: Final = ChildWindow(scrollable_y=True)
 
@@ -163,8 +188,11 @@ class PlayerList(CustomWidget):
         self._player_registry.player_add_subject.addListener(self._addPlayerCard)
 
     def _addPlayerCard(self, player: Player) -> None:
-        card = PlayerCard(player, self._player_edit_dialog.createEditButton(player), self._player_delete_dialog)
-        card.attachDeleteObserver(lambda _: self._player_registry.unregister(player.mac))
+        mac = player.mac
+        edit_button = self._player_edit_dialog.createEditButton(lambda: self._loop.getSnapshot().players.get(mac))
+
+        card = PlayerCard(player, edit_button, self._player_delete_dialog)
+        card.attachDeleteObserver(lambda _: self._loop.submit(lambda env: env.player_registry.unregister(player.mac)))
         self._player_list.add(card)
 
         self._log.write(f"add {player}")
@@ -0,0 +1,68 @@
+from typing import Callable
+from typing import Sequence
+
+from kf_dpg.core.custom import CustomWidget
+from kf_dpg.impl.buttons import Button
+from kf_dpg.impl.buttons import CheckBox
+from kf_dpg.impl.containers import ChildWindow
+from kf_dpg.impl.containers import HBox
+from kf_dpg.impl.containers import VBox
+from kf_dpg.impl.text import Text
+from bytelang.core.protocol import Protocol
+from game.assets import Assets
+
+
+class ProtocolView(CustomWidget):
+    """Метрики инструкций протоколов мостов"""
+
+    def __init__(self, bridges: Callable[[], Sequence[Protocol]]) -> None:
+        self._bridges = bridges
+        self._timings = False
+        self._text = Text().withFont(Assets.log_font)
+
+        super().__init__(
+            ChildWindow(
+                background=True
+            )
+            .add(
+                VBox()
+                .add(
+                    HBox()
+                    .add(
+                        Button()
+                        .withLabel("Обновить")
+                        .withHandler(self._update)
+                    )
+                    .add(
+                        CheckBox(
+                            _value=self._timings
+                        )
+                        .withLabel("Замерять время (замедляет приём)")
+                        .withHandler(self._onTimings)
+                    )
+                )
+                .add(
+                    ChildWindow(
+                        scrollable_y=True
+                    )
+                    .add(self._text)
+                )
+            )
+        )
+
+    def _onTimings(self, enabled: bool) -> None:
+        self._timings = enabled
+        self._update()
+
+    def _update(self) -> None:
+        lines = list[str]()
+
+        for i, bridge in enumerate(self._bridges()):
+            metrics = bridge.getMetrics()
+            # Мосты подключаются в фоне - флаг применяется и к появившимся позже
+            metrics.timings = self._timings
+
+            lines.append(f"Мост {i}:")
+            lines.extend(f"  {stats}" for stats in metrics.getAll())
+
+        self._text.setValue('\n'.join(lines) if len(lines) > 0 else "Мосты не подключены")
@@ -10,20 +10,23 @@ from kf_dpg.impl.containers import HBox
 from kf_dpg.impl.containers import VBox
 from kf_dpg.impl.text import Text
 from game.core.entities.player import Team
-from game.core.entities.player import TeamRegistry
+from game.core.entities.player import TeamChange
+from game.core.loop import EnvironmentLoop
+from game.core.loop import TeamSnapshot
 from game.ui.dialog import ConfirmDialog
 from game.ui.dialog import EditDialog
 from rs.misc.color import Color
 
 
-class TeamEditDialog(EditDialog[Team]):
-    """Диалог редактирования команды"""
+class TeamEditDialog(EditDialog[TeamSnapshot]):
+    """Диалог редактирования команды (значения - из снимка окружения)"""
 
     @classmethod
-    def _getTitle(cls, team: Team) -> str:
+    def _getTitle(cls, team: TeamSnapshot) -> str:
         return team.__str__()
 
-    def __init__(self) -> None:
+    def __init__(self, loop: EnvironmentLoop) -> None:
+        self._loop: Final = loop
         self._name: Final = TextInput()
         self._color = ColorInput(
             _value=Color.none(),
@@ -40,14 +43,20 @@ class TeamEditDialog(EditDialog[Team]):
             )
         )
 
-    def apply(self, team: Team) -> None:
-        team.name = self._name.getValue()
-        team.color = self._color.getValue()
+    def apply(self, snapshot: TeamSnapshot) -> None:
+        name = self._name.getValue()
+        color = self._color.getValue()
 
-    def begin(self, team: Team) -> None:
-        super().begin(team)
-        self._name.setValue(team.name)
-        self._color.setValue(team.color)
+        def _apply(_) -> None:
+            snapshot.team.name = name
+            snapshot.team.color = color
+
+        self._loop.submit(_apply)
+
+    def begin(self, snapshot: TeamSnapshot) -> None:
+        super().begin(snapshot)
+        self._name.setValue(snapshot.name)
+        self._color.setValue(snapshot.color)
 
 
 class TeamCard(CustomWidget):
@@ -91,10 +100,17 @@ class TeamCard(CustomWidget):
 
         super().__init__(base)
 
-    def _update(self, team: Team) -> None:
-        self._name_display.setValue(team.name)
-        self._name_display.setColor(team.color)
-        self._score_display.setValue(team.score)
+    def _update(self, change: TeamChange) -> None:
+        team = change.team
+
+        if change.attribute == Team.Attribute.Name:
+            self._name_display.setValue(team.name)
+
+        elif change.attribute == Team.Attribute.Color:
+            self._name_display.setColor(team.color)
+
+        elif change.attribute == Team.Attribute.Score:
+            self._score_display.setValue(team.score)
 
     def delete(self) -> None:
         self._team.subject_change.removeListener(self._update)
@@ -104,13 +120,14 @@ class TeamCard(CustomWidget):
 class TeamList(CustomWidget):
     """Список команд"""
 
-    def __init__(self, team_registry: TeamRegistry) -> None:
-        self._team_registry: Final = team_registry
+    def __init__(self, loop: EnvironmentLoop) -> None:
+        self._loop: Final = loop
+        self._team_registry: Final = loop.env.team_registry
         self._team_list: Final = ChildWindow(scrollable_y=True)
-        self._team_edit_dialog: Final = TeamEditDialog()
+        self._team_edit_dialog: Final = TeamEditDialog(loop)
         self._team_delete_dialog: Final = ConfirmDialog(ok_button_label="Отправить в испепелитесь").withLabel("Удалить команду?")
 
-        for team in team_registry.getAll():
+        for team in self._team_registry.getAll():
             self._addTeamCard(team)
 
         self._team_registry.on_team_add.addListener(self._addTeamCard)
@@ -121,14 +138,16 @@ class TeamList(CustomWidget):
                 Button()
                 .withLabel("Добавить")
                 .withWidth(-1)
-                .withHandler(self._team_registry.register)
+                .withHandler(loop.bind(self._team_registry.register))
             )
             .add(self._team_list)
         )
 
     def _addTeamCard(self, team: Team) -> TeamCard:
-        card = TeamCard(team, self._team_edit_dialog.createEditButton(team), self._team_delete_dialog)
-        card.attachDeleteObserver(lambda _: self._team_registry.unregister(team))
+        edit_button = self._team_edit_dialog.createEditButton(lambda: self._loop.getSnapshot().teams.get(team))
+
+        card = TeamCard(team, edit_button, self._team_delete_dialog)
+        card.attachDeleteObserver(lambda _: self._loop.submit(lambda env: env.team_registry.unregister(team)))
 
         self._team_list.add(card)
         return card
@@ -1,13 +1,24 @@
+from datetime import datetime
+from pathlib import Path
 from threading import Thread
 from time import sleep
 from typing import Callable
-
+from typing import Final
+from typing import Optional
+from typing import Sequence
+
+from bytelang.abc.stream import Stream
+from bytelang.impl.stream.buffered import BufferedStream
+from bytelang.impl.stream.capture import CaptureStream
+from bytelang.impl.stream.coalescing import CoalescingStream
 from bytelang.impl.stream.serials import SerialStream
 from game.assets import Assets
+from game.core.bridges import BridgeHub
 from game.core.entities.mac import Mac
 from game.core.entities.rules import GameRules
 from game.core.entities.rules import ScoreRules
 from game.core.environment import Environment
+from game.core.loop import EnvironmentLoop
 from game.core.protocol import GameProtocol
 from game.impl.valuegen.color import ColorGenerator
 from game.impl.valuegen.loopstep import RingStepGenerator
@@ -16,16 +27,23 @@ from game.impl.valuegen.teamname import TeamNameGenerator
 from game.ui.app import GameApp
 from rs.lina.vector import Vector2D
 from rs.misc.log import Logger
+from rs.misc.subject import Subject
+
+_CAPTURE_FOLDER: Final[Optional[Path]] = None
+"""Папка для записи обмена с мостом (None - не записывать), см. test/bench_replay.py"""
 
+_EXTRA_PORTS: Final[Sequence[str]] = ()
+"""Порты, не видимые getPorts (например, псевдотерминалы src/emulate_bridge.py)"""
 
-def _create_task[T](f: Callable[[T], None], arg: T) -> Thread:
-    return Thread(target=f, args=(arg,), daemon=True)
 
+def _create_task(f: Callable[..., None], *args) -> Thread:
+    return Thread(target=f, args=args, daemon=True)
 
-def _protocol_task(env: Environment):
+
+def _protocol_task(loop: EnvironmentLoop, bridges: list[GameProtocol], captures: list[CaptureStream]):
     log = Logger("protocol-task")
 
-    ports = SerialStream.getPorts()
+    ports = (*SerialStream.getPorts(), *_EXTRA_PORTS)
 
     if not ports:
         log.write("Нет доступных портов, завершение")
@@ -33,39 +51,70 @@ def _protocol_task(env: Environment):
 
     log.write(f"Найдены порты: {ports}")
 
-    stream = SerialStream(ports[0], 115200)
-    protocol = GameProtocol(stream, env)
+    started = datetime.now()
+    streams = list[Stream]()
+
+    for i, port in enumerate(ports):
+        # Порт, который не удалось открыть, не должен мешать остальным мостам
+        try:
+            serial = SerialStream(port, 115200)
 
-    protocol.request_mac(None)
+            if _CAPTURE_FOLDER is not None:
+                path = _CAPTURE_FOLDER / f"{started:%Y%m%d-%H%M%S}-{i}.blcap"
+                log.write(f"Запись обмена {port}: {path}")
+                serial = CaptureStream(serial, path)
+                captures.append(serial)
 
-    while True:
-        result = protocol.pull()
+        except Exception as e:
+            log.write(f"Не удалось открыть {port}: {e}")
+            continue
+
+        streams.append(CoalescingStream(BufferedStream(serial), on_error=log.write))
+
+    if not streams:
+        log.write("Ни один порт не открыт, завершение")
+        return
 
-        if result.is_err():
-            log.write(result.err().unwrap())
+    def _connect(env: Environment) -> BridgeHub:
+        hub = BridgeHub(env)
 
+        for stream in streams:
+            hub.addBridge(stream).request_mac(None)
 
-def _agents_task(env: Environment):
+        # Метрики мостов читает вкладка протокола
+        bridges.extend(hub.getBridges())
+        return hub
+
+    # Кадры мостов разбираются потоками чтения, а обрабатываются в потоке владельца окружения
+    loop.call(_connect).runOn(loop, log.write)
+
+
+def _agents_task(loop: EnvironmentLoop):
     sleep(0.1)
+    loop.call(_seed_agents)
 
+
+def _seed_agents(env: Environment):
     x = env.board.size.x // 2
     y = env.board.size.y
 
-    for i in range(255):
+    # Уведомления затравки доставляются одним пакетом в конце
+    with Subject.batch():
+        for i in range(255):
 
-        team = env.team_registry.register()
+            team = env.team_registry.register()
 
-        for j in range(1):
-            mac = Mac(bytes((0, 0, 0, 0, j % 255, i % 255)))
+            for j in range(1):
+                mac = Mac(bytes((0, 0, 0, 0, j % 255, i % 255)))
 
-            env.onPlayerMessage(mac, f"User-{i}-{j}")
+                env.onPlayerMessage(mac, f"User-{i}-{j}")
 
-            player = env.player_registry.getAll().get(mac)
-            player.setTeam(team)
+                player = env.player_registry.getAll().get(mac)
+                player.setTeam(team)
 
-            k = i * x + j
+                k = i * x + j
 
-            env.onPlayerMove(mac, Vector2D(k % x, k // x))
+                env.onPlayerMove(mac, Vector2D(k % x, k // x))
 
     return
 
@@ -100,15 +149,24 @@ def _main():
         ),
         move_cooldown_secs=5.0,
         move_available=True,
+        win_line_length=5,
     )
 
-    env = Environment(rules)
+    loop = EnvironmentLoop(Environment(rules))
+    loop.start()
+
+    bridges = list[GameProtocol]()
+    captures = list[CaptureStream]()
 
-    GameApp(env).run("Game", 1280, 720, user_tasks=(
-        _create_task(_agents_task, env),
-        _create_task(_protocol_task, env),
+    GameApp(loop, lambda: tuple(bridges)).run("Game", 1280, 720, user_tasks=(
+        _create_task(_agents_task, loop),
+        _create_task(_protocol_task, loop, bridges, captures),
     ))
 
+    # Записи обмена дописываются до конца при выходе
+    for capture in captures:
+        capture.close()
+
 
 if __name__ == "__main__":
     _main()
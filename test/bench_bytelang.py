@@ -0,0 +1,252 @@
+"""
+Набор замеров пропускной способности bytelang.
+
+Каждый сериализатор из bytelang.impl.serializer кодируется и декодируется в памяти,
+а кадры GameProtocol проходят полный путь send -> pull через пару VirtualStream.
+Результат (кадров/с, байт/с, байт временных выделений на кадр) печатается
+и при необходимости сохраняется в JSON или сравнивается с сохранённым:
+
+    python test/bench_bytelang.py --save test/baselines/bytelang.json
+    python test/bench_bytelang.py --compare test/baselines/bytelang.json
+"""
+
+import json
+import platform
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from dataclasses import asdict
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+from bytelang.abc.serializer import Serializer
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.array_ import ArraySerializer
+from bytelang.impl.serializer.arraystring import ArrayStringSerializer
+from bytelang.impl.serializer.bytearray_ import ByteArraySerializer
+from bytelang.impl.serializer.bulk import BulkArraySerializer
+from bytelang.impl.serializer.bulk import BulkVectorSerializer
+from bytelang.impl.serializer.bytevector import ByteVectorSerializer
+from bytelang.impl.serializer.primitive import f32
+from bytelang.impl.serializer.primitive import f64
+from bytelang.impl.serializer.primitive import i16
+from bytelang.impl.serializer.primitive import i32
+from bytelang.impl.serializer.primitive import i64
+from bytelang.impl.serializer.primitive import i8
+from bytelang.impl.serializer.primitive import u16
+from bytelang.impl.serializer.primitive import u32
+from bytelang.impl.serializer.primitive import u64
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.serializer.struct_ import StructSerializer
+from bytelang.impl.serializer.vector import VectorSerializer
+from bytelang.impl.serializer.void import VoidSerializer
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.byte import ByteViewInputStream
+from bytelang.impl.stream.virtual import VirtualStream
+from game.core.protocol import GameProtocol
+from rs.result import ok
+
+_ALLOC_SAMPLE = 1000
+"""Кадров в выборке для замера выделений"""
+
+
+@dataclass(frozen=True)
+class Measure:
+    """Результат одного замера"""
+
+    frames_per_sec: float
+    bytes_per_sec: float
+    alloc_bytes_per_frame: float
+    """Пик временных выделений (tracemalloc) в среднем на кадр"""
+    frame_bytes: int
+
+
+def _measure(run: Callable[[], Any], frames: int, frame_bytes: int, repeats: int) -> Measure:
+    """Замерить run (выполняет один кадр): лучшее время из repeats, затем выделения"""
+    best = float("inf")
+
+    for _ in range(repeats):
+        start = perf_counter()
+
+        for _ in range(frames):
+            run()
+
+        best = min(best, perf_counter() - start)
+
+    peaks = 0
+    tracemalloc.start()
+
+    try:
+        for _ in range(_ALLOC_SAMPLE):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks += peak - current
+
+    finally:
+        tracemalloc.stop()
+
+    return Measure(
+        frames_per_sec=frames / best,
+        bytes_per_sec=frames * frame_bytes / best,
+        alloc_bytes_per_frame=peaks / _ALLOC_SAMPLE,
+        frame_bytes=frame_bytes
+    )
+
+
+def _serializerCases() -> Iterable[tuple[str, Serializer, Any]]:
+    primitives = (
+        ("u8", u8, 200), ("u16", u16, 60000), ("u32", u32, 4_000_000_000), ("u64", u64, 2 ** 63),
+        ("i8", i8, -100), ("i16", i16, -30000), ("i32", i32, -2_000_000_000), ("i64", i64, -2 ** 62),
+        ("f32", f32, 1.5), ("f64", f64, 3.25),
+    )
+
+    yield from primitives
+
+    yield "bytearray[6]", ByteArraySerializer(6), bytes(range(6))
+    yield "bytevector[u8] 32", ByteVectorSerializer(u8), bytes(32)
+    yield "arraystring[32]", ArrayStringSerializer(32), "player 7"
+    yield "arraystring[128]", ArrayStringSerializer(128), "log " * 24
+    yield "array[2]u8", ArraySerializer(u8, 2), [3, 4]
+    yield "array[4]{u8 [8]str}", ArraySerializer(StructSerializer((u8, ArrayStringSerializer(8))), 4), [[i, "x"] for i in range(4)]
+    yield "vector[u8]u16 16", VectorSerializer(u16, u8), list(range(16))
+    yield "vector[u8]u16 255", VectorSerializer(u16, u8), list(range(255))
+    yield "bulkvector[u8]u16 255", BulkVectorSerializer(u16, u8), list(range(255))
+    yield "bulkarray[400]u8", BulkArraySerializer(u8, 400), bytes(400)
+    yield "vector[u8][6]bytes 4", VectorSerializer(ByteArraySerializer(6), u8), [bytes(6)] * 4
+    yield "struct{mac u8}", GameProtocol.espnow_delivery_status, [bytes(6), 0]
+    yield "struct{mac [u8]bytes}", GameProtocol.espnow_packet, [bytes(6), bytes(2)]
+    yield "void", VoidSerializer(), None
+
+
+def _benchSerializers(frames: int, repeats: int) -> Iterable[tuple[str, Measure]]:
+    for name, serializer, value in _serializerCases():
+        out = ByteBufferOutputStream()
+        serializer.write_raw(out, value)
+        data = bytes(out.buffer)
+        size = len(data)
+
+        # Запись каждый раз в новый буфер: иначе замер включает рост одного bytearray
+        def _encode():
+            serializer.write_raw(ByteBufferOutputStream(), value)
+
+        def _decode():
+            serializer.read_raw(ByteViewInputStream(data))
+
+        yield f"encode {name}", _measure(_encode, frames, size, repeats)
+        yield f"decode {name}", _measure(_decode, frames, size, repeats)
+
+
+def _makeProtocols() -> tuple[Protocol, Protocol]:
+    """Хост (как GameProtocol) и устройство-мост с зеркальным набором инструкций"""
+    host_stream, device_stream = VirtualStream.create_pair()
+
+    host = Protocol(host_stream, u8, u8)
+    device = Protocol(device_stream, u8, u8)
+
+    def _handler(_):
+        return ok(None)
+
+    host.addReceiver(GameProtocol.mac, _handler, "read_mac")
+    host.addReceiver(GameProtocol.log_message, _handler, "read_log")
+    host.addReceiver(GameProtocol.espnow_packet, _handler, "read_espnow_packet")
+    host.addReceiver(GameProtocol.espnow_delivery_status, _handler, "read_delivery_status")
+
+    device.addReceiver(VoidSerializer(), _handler, "request_mac")
+    device.addReceiver(GameProtocol.espnow_packet, _handler, "send_espnow_packet")
+
+    return host, device
+
+
+def _benchRoundTrips(frames: int, repeats: int) -> Iterable[tuple[str, Measure]]:
+    host, device = _makeProtocols()
+
+    host.addSender(VoidSerializer(), "request_mac")
+    send_reply = host.addSender(GameProtocol.espnow_packet, "send_espnow_packet")
+
+    device.addSender(GameProtocol.mac, "read_mac")
+    device.addSender(GameProtocol.log_message, "read_log")
+    send_packet = device.addSender(GameProtocol.espnow_packet, "read_espnow_packet")
+
+    mac = bytes(range(6))
+
+    cases = (
+        ("move 2 B", send_packet, host, (mac, bytes((3, 4)))),
+        ("name 32 B", send_packet, host, (mac, "player 7".encode().ljust(32, b"\x00"))),
+        ("log reply 128 B", send_reply, device, (mac, "Ход принят".encode().ljust(128, b"\x00"))),
+    )
+
+    for name, send, receiver, value in cases:
+        # Код инструкции + mac + длина + полезная нагрузка
+        size = 1 + len(value[0]) + 1 + len(value[1])
+
+        def _roundTrip():
+            send(value).unwrap()
+            receiver.pull().unwrap()
+
+        yield f"roundtrip {name}", _measure(_roundTrip, frames, size, repeats)
+
+
+def _compare(results: dict[str, Measure], path: str, tolerance: float) -> bool:
+    """Сравнить с сохранённым замером, вернуть False при регрессии"""
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    passed = True
+
+    for name, measure in results.items():
+        if name not in baseline:
+            print(f"{name:>32}: new")
+            continue
+
+        ratio = measure.frames_per_sec / baseline[name]["frames_per_sec"]
+        alloc_delta = measure.alloc_bytes_per_frame - baseline[name]["alloc_bytes_per_frame"]
+        regression = ratio < 1 - tolerance
+
+        passed &= not regression
+
+        print(f"{name:>32}: x{ratio:.2f} speed, {alloc_delta:+.0f} B alloc/frame{' REGRESSION' if regression else ''}")
+
+    return passed
+
+
+def _main() -> int:
+    parser = ArgumentParser(description="bytelang throughput benchmarks")
+    parser.add_argument("--frames", type=int, default=20_000, help="кадров на замер")
+    parser.add_argument("--repeats", type=int, default=3, help="повторов замера (берётся лучший)")
+    parser.add_argument("--save", help="сохранить результат в JSON")
+    parser.add_argument("--compare", help="сравнить с JSON, сохранённым ранее")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="допустимое падение скорости при сравнении")
+    args = parser.parse_args()
+
+    results = dict[str, Measure]()
+
+    for name, measure in (*_benchSerializers(args.frames, args.repeats), *_benchRoundTrips(args.frames, args.repeats)):
+        results[name] = measure
+        print(
+            f"{name:>32}: {measure.frames_per_sec:>12,.0f} frames/s"
+            f" {measure.bytes_per_sec / 1e6:>8.2f} MB/s"
+            f" {measure.alloc_bytes_per_frame:>8.0f} B alloc/frame"
+        )
+
+    if args.save is not None:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "machine": platform.machine(),
+                "frames": args.frames,
+                "results": {name: asdict(measure) for name, measure in results.items()},
+            }, f, indent=2, ensure_ascii=False)
+
+    if args.compare is not None and not _compare(results, args.compare, args.tolerance):
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,54 @@
+from time import perf_counter
+from typing import Callable
+
+from bytelang.abc.serializer import Serializer
+from bytelang.abc.stream import InputStream
+from bytelang.core.compiler import CompiledCodec
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.serializer.struct_ import StructSerializer
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.byte import ByteViewInputStream
+from game.core.protocol import GameProtocol
+
+
+def _makeData[T](serializer: Serializer[T], value: T, frames: int) -> bytes:
+    out = ByteBufferOutputStream()
+
+    for _ in range(frames):
+        serializer.write_raw(out, value)
+
+    return bytes(out.buffer)
+
+
+def _measure(read: Callable[[InputStream], object], data: bytes, frames: int) -> float:
+    stream = ByteViewInputStream(data)
+    start = perf_counter()
+
+    for _ in range(frames):
+        read(stream)
+
+    return frames / (perf_counter() - start)
+
+
+def _bench[T](name: str, serializer: Serializer[T], value: T, frames: int) -> None:
+    codec = CompiledCodec.compile(serializer)
+    data = _makeData(serializer, value, frames)
+
+    # Скомпилированный код обязан читать то же, что и интерпретатор
+    assert codec.read_raw(ByteViewInputStream(data)) == serializer.read_raw(ByteViewInputStream(data))
+
+    interpreted = _measure(serializer.read_raw, data, frames)
+    compiled = _measure(codec.read_raw, data, frames)
+
+    print(f"{name:>24}: interpreted {interpreted:>12,.0f} f/s, compiled {compiled:>12,.0f} f/s, x{compiled / interpreted:.2f}")
+
+
+_bench("espnow_packet", GameProtocol.espnow_packet, (bytes(6), bytes(range(2))), 200_000)
+_bench("espnow_packet (32 B)", GameProtocol.espnow_packet, (bytes(6), bytes(32)), 200_000)
+_bench("espnow_delivery_status", GameProtocol.espnow_delivery_status, (bytes(6), 1), 200_000)
+_bench("log_message", GameProtocol.log_message, "log " * 16, 200_000)
+_bench("player_move", GameProtocol.player_move, (1, 2), 200_000)
+_bench("{str32 u8} (static)", StructSerializer((GameProtocol.player_message, u8)), ("Игрок", 3), 200_000)
+
+print()
+print(CompiledCodec.compile(GameProtocol.espnow_packet).source)
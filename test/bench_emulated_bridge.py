@@ -0,0 +1,146 @@
+"""
+Сквозная пропускная способность хоста с эмулируемыми мостами ESP32 (только Linux).
+
+Каждый мост - BridgeEmulator на псевдотерминале, хост открывает его обычным SerialStream
+и обслуживает через BridgeHub, как в launch.py. Эмулируемые игроки регистрируются
+и ходят; замеряется время от передачи пакета игроком до ответа хоста, доставленного игроку:
+
+    python test/bench_emulated_bridge.py --bridges 2 --players 64 --moves 20 --baud 115200 --latency 0.002
+"""
+
+from argparse import ArgumentParser
+from collections import deque
+from random import Random
+from threading import Event
+from threading import Lock
+from threading import Thread
+from time import perf_counter
+
+from bytelang.impl.stream.buffered import BufferedStream
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.serials import SerialStream
+from game.core.bridges import BridgeHub
+from game.core.entities.board import Board
+from game.core.entities.mac import Mac
+from game.core.environment import Environment
+from game.core.protocol import GameProtocol
+from game.impl.emulator import BridgeEmulator
+from game.impl.emulator import EmulatorConfig
+from testenv import createTeamedEnvironment
+
+
+_TEAMS = 8
+
+
+def _createEnvironment() -> Environment:
+    return createTeamedEnvironment(_TEAMS)
+
+
+def _payload(serializer, value) -> bytes:
+    stream = ByteBufferOutputStream()
+    serializer.write(stream, value).unwrap()
+    return bytes(stream.buffer)
+
+
+def _main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bridges", type=int, default=1)
+    parser.add_argument("--players", type=int, default=32)
+    parser.add_argument("--moves", type=int, default=10, help="ходов на игрока")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--latency", type=float, default=0.002, help="время в эфире пакета, с")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="доля недоставленных ответов")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    emulators = tuple(
+        BridgeEmulator(EmulatorConfig(
+            mac=Mac(bytes((0x24, 0x6F, 0x28, 0, 0, i))),
+            baud=args.baud,
+            radio_latency_secs=args.latency,
+            delivery_failure_rate=args.failure_rate,
+            seed=args.seed + i,
+        ))
+        for i in range(args.bridges)
+    )
+
+    hub = BridgeHub(_createEnvironment())
+
+    for emulator in emulators:
+        hub.addBridge(BufferedStream(SerialStream(emulator.getPort(), args.baud))).request_mac(None)
+
+    errors = list[str]()
+    Thread(target=hub.run, args=(errors.append,), daemon=True).start()
+
+    # Игроки распределены по мостам; ответ на каждый пакет - одно сообщение хоста
+    random = Random(args.seed)
+    macs = tuple(Mac(bytes((2, 0, 0, 0, i >> 8, i & 0xFF))) for i in range(args.players))
+    home = {mac: emulators[i % len(emulators)] for i, mac in enumerate(macs)}
+
+    expected = args.players * (1 + args.moves)
+    pending = {mac: deque[float]() for mac in macs}
+    latencies = list[float]()
+    lock = Lock()
+    done = Event()
+
+    def _onReply(reply: tuple[Mac, bytes]) -> None:
+        mac, _ = reply
+
+        with lock:
+            if mac in pending and len(pending[mac]) > 0:
+                latencies.append(perf_counter() - pending[mac].popleft())
+
+            if len(latencies) + sum(e.getStats().delivery_failures for e in emulators) >= expected:
+                done.set()
+
+    for emulator in emulators:
+        emulator.downlink_subject.addListener(_onReply)
+
+    start = perf_counter()
+
+    def _transmit(mac: Mac, data: bytes) -> None:
+        with lock:
+            pending[mac].append(perf_counter())
+
+        home[mac].transmit(mac, data)
+
+    for i, mac in enumerate(macs):
+        _transmit(mac, _payload(GameProtocol.player_message, f"player-{i}"))
+
+    for _ in range(args.moves):
+        for mac in macs:
+            move = (random.randrange(Board.max_size), random.randrange(Board.max_size))
+            _transmit(mac, _payload(GameProtocol.player_move, move))
+
+    completed = done.wait(timeout=60.0)
+    elapsed = perf_counter() - start
+
+    latencies.sort()
+    replies = len(latencies)
+
+    print(
+        f"{args.bridges} bridge(s), {args.players} players, {args.baud} baud, {args.latency * 1e3:.1f} ms on air:"
+        f" {replies}/{expected} replies in {elapsed:.3f} s ({replies / elapsed:,.0f}/s)"
+        f"{'' if completed else ' (timeout)'}"
+    )
+
+    if replies > 0:
+        print(
+            f"  round trip: p50 {latencies[replies // 2] * 1e3:.1f} ms,"
+            f" p99 {latencies[min(replies - 1, int(replies * 0.99))] * 1e3:.1f} ms,"
+            f" max {latencies[-1] * 1e3:.1f} ms"
+        )
+
+    for emulator in emulators:
+        print(f"  {emulator}: {emulator.getStats()}")
+
+    print(f"  host errors: {len(errors)}")
+
+    hub.stop()
+
+    for emulator in emulators:
+        emulator.close()
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,86 @@
+"""
+Замер памяти сущностей: 10k игроков в командах, доска и позиции поля 1000 x 1000.
+Проход видимости сравнивает новые ключи Vector2D с общими из Board.internPos.
+Запуск из корня: python test/bench_memory.py
+"""
+
+import tracemalloc
+from time import perf_counter
+from typing import Callable
+
+from game.core.entities.board import Board
+from game.core.entities.board import Cell
+from game.core.entities.mac import Mac
+from game.core.entities.player import Player
+from game.core.entities.player import Team
+from game.core.entities.rules import ScoreRules
+from rs.lina.vector import Vector2D
+from rs.misc.color import Color
+
+_PLAYERS = 10_000
+_TEAMS = 16
+_SIDE = 1000
+
+
+def _measure[T](name: str, count: int, build: Callable[[], T]) -> T:
+    tracemalloc.start()
+    start = perf_counter()
+    result = build()
+    elapsed = perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<32} {size / 2 ** 20:8.2f} MiB  {size / count:7.1f} B/obj  {elapsed * 1e3:8.1f} ms")
+    return result
+
+
+def _buildPlayers() -> tuple[tuple[Team, ...], tuple[Player, ...]]:
+    teams = tuple(Team(f"team-{i}", Color.fromHex("#ff8800")) for i in range(_TEAMS))
+    players = tuple(Player(Mac(i.to_bytes(6, "big")), f"player-{i}") for i in range(_PLAYERS))
+
+    for i, player in enumerate(players):
+        player.setTeam(teams[i % _TEAMS])
+
+    return teams, players
+
+
+def _buildCells(players: tuple[Player, ...]) -> tuple[Cell, ...]:
+    return tuple(Cell(p) for p in players)
+
+
+def _buildBoard(players: tuple[Player, ...]) -> Board:
+    rules = ScoreRules(mode=ScoreRules.CellLookupMode.Full, empty_cell=10, friend_cell=50, enemy_cell=-25)
+    board = Board(Vector2D(Board.max_size, Board.max_size), rules)
+
+    for i in range(Board.max_size * Board.max_size):
+        board.makeMove(players[i], Vector2D(i % Board.max_size, i // Board.max_size))
+
+    return board
+
+
+def _buildPositions() -> tuple[Vector2D[int], ...]:
+    return tuple(Board.internPos(i % _SIDE, i // _SIDE) for i in range(_SIDE * _SIDE))
+
+
+def _visibilityPass(key: Callable[[int, int], Vector2D[int]]) -> float:
+    """Проход видимости BoardView: ключи всех клеток поля _SIDE x _SIDE"""
+    start = perf_counter()
+    visible = set()
+
+    for x in range(_SIDE):
+        for y in range(_SIDE):
+            visible.add(key(x, y))
+
+    return perf_counter() - start
+
+
+teams, players = _measure(f"{_PLAYERS} players", _PLAYERS, _buildPlayers)
+_measure(f"{_PLAYERS} cells", _PLAYERS, lambda: _buildCells(players))
+_measure(f"{Board.max_size}x{Board.max_size} full board", Board.max_size ** 2, lambda: _buildBoard(players))
+positions = _measure(f"{_SIDE}x{_SIDE} interned positions", _SIDE * _SIDE, _buildPositions)
+
+print(f"visibility pass (new keys):      {_visibilityPass(Vector2D) * 1e3:8.1f} ms")
+print(f"visibility pass (internPos):     {_visibilityPass(Board.internPos) * 1e3:8.1f} ms")
+
+assert Board.internPos(3, 4) is Board.internPos(3, 4) is Board.getPositions()[Board.indexOf(Vector2D(3, 4))]
+assert Board.internPos(_SIDE - 1, _SIDE - 1) is positions[-1]
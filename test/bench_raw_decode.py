@@ -0,0 +1,64 @@
+from time import perf_counter
+
+from rs.result import Result
+from rs.result import ok
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.byte import ByteViewInputStream
+from game.core.protocol import GameProtocol
+
+_results_created = 0
+_result_init = Result.__init__
+
+
+def _countingInit(self, *args, **kwargs):
+    global _results_created
+    _results_created += 1
+    _result_init(self, *args, **kwargs)
+
+
+def _makeStream(frames: int) -> ByteViewInputStream:
+    out = ByteBufferOutputStream()
+
+    for i in range(frames):
+        u8.write(out, 2)
+        GameProtocol.espnow_packet.write(out, (bytes((0, 0, 0, 0, 0, i % 255)), bytes((i % 20, i % 20))))
+        u8.write(out, 3)
+        GameProtocol.espnow_delivery_status.write(out, (bytes((0, 0, 0, 0, 0, i % 255)), 0))
+
+    return ByteViewInputStream(bytes(out.buffer))
+
+
+def _bench(frames: int) -> None:
+    global _results_created
+
+    stream = _makeStream(frames // 2)
+    protocol = Protocol(stream, u8, u8)
+
+    protocol.addReceiver(GameProtocol.mac, lambda _: ok(None), "read_mac")
+    protocol.addReceiver(GameProtocol.log_message, lambda _: ok(None), "read_log")
+    protocol.addReceiver(GameProtocol.espnow_packet, lambda _: ok(None), "read_espnow_packet")
+    protocol.addReceiver(GameProtocol.espnow_delivery_status, lambda _: ok(None), "read_delivery_status")
+
+    Result.__init__ = _countingInit
+    _results_created = 0
+    start = perf_counter()
+
+    try:
+        for _ in range(frames):
+            protocol.pull().unwrap()
+
+    finally:
+        Result.__init__ = _result_init
+
+    elapsed = perf_counter() - start
+    per_frame = _results_created / frames
+
+    print(f"pull: {frames} frames, {frames / elapsed:,.0f} frames/sec, {per_frame:.2f} Result/frame (handler)")
+
+    # Единственный Result на кадр создаёт сам обработчик
+    assert per_frame <= 1.0
+
+
+_bench(100_000)
@@ -0,0 +1,125 @@
+"""
+Воспроизведение записи обмена с мостом через GameProtocol без подключённого ESP32.
+
+Запись делается CaptureStream (см. _CAPTURE_FOLDER в launch.py) или генерируется здесь:
+
+    python test/bench_replay.py game.blcap --generate --players 64 --moves 200
+    python test/bench_replay.py game.blcap
+    python test/bench_replay.py game.blcap --realtime --speed 4
+
+Игроки из записи раскладываются по командам, кул-даун ходов отключён,
+так что ходы доходят до доски, как в живой игре.
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from random import Random
+from time import perf_counter
+
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.stream.buffered import BufferedStream
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.capture import CaptureReader
+from bytelang.impl.stream.capture import CaptureStream
+from bytelang.impl.stream.capture import ReplayStream
+from bytelang.impl.stream.virtual import VirtualStream
+from game.core.entities.board import Board
+from game.core.entities.mac import Mac
+from game.core.environment import Environment
+from game.core.protocol import GameProtocol
+from testenv import createTeamedEnvironment
+
+_TEAMS = 8
+
+
+def _createEnvironment() -> Environment:
+    return createTeamedEnvironment(_TEAMS)
+
+
+def _generate(path: Path, players: int, moves: int, seed: int) -> None:
+    """Записать синтетическую игру: регистрация игроков, затем ходы вразнобой"""
+    random = Random(seed)
+
+    host_stream, bridge_stream = VirtualStream.create_pair(timeout=1.0)
+    capture = CaptureStream(host_stream, path)
+
+    bridge = Protocol(bridge_stream, u8, u8)
+    bridge.addSender(GameProtocol.mac, "read_mac")
+    bridge.addSender(GameProtocol.log_message, "read_log")
+    send_packet = bridge.addSender(GameProtocol.espnow_packet, "read_espnow_packet")
+
+    macs = tuple(bytes((2, 0, 0, 0, i >> 8, i & 0xFF)) for i in range(players))
+
+    def _send(mac: bytes, serializer, value) -> None:
+        payload = ByteBufferOutputStream()
+        serializer.write(payload, value).unwrap()
+        send_packet((mac, bytes(payload.buffer))).unwrap()
+
+        # Хост забирает байты так же, как BufferedStream у порта
+        while capture.available() > 0:
+            capture.read_some_raw(4096)
+
+    for i, mac in enumerate(macs):
+        _send(mac, GameProtocol.player_message, f"player-{i}")
+
+    for _ in range(moves):
+        move = (random.randrange(Board.max_size), random.randrange(Board.max_size))
+        _send(random.choice(macs), GameProtocol.player_move, move)
+
+    capture.close()
+
+
+def _main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--generate", action="store_true", help="записать синтетическую игру в capture")
+    parser.add_argument("--players", type=int, default=64)
+    parser.add_argument("--moves", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--realtime", action="store_true", help="исходный темп вместо наибольшей скорости")
+    parser.add_argument("--speed", type=float, default=1.0, help="множитель темпа для --realtime")
+    args = parser.parse_args()
+
+    if args.generate:
+        _generate(args.capture, args.players, args.moves, args.seed)
+
+    reader = CaptureReader(args.capture)
+    summary = reader.getSummary()
+    reader.close()
+    print(f"{args.capture.name}: {summary}")
+
+    replay = ReplayStream(args.capture, realtime=args.realtime, speed=args.speed)
+    protocol = GameProtocol(BufferedStream(replay), _createEnvironment())
+    protocol.getMetrics().timings = True
+
+    frames = 0
+    errors = 0
+    start = perf_counter()
+
+    while True:
+        if replay.available() == 0 and not args.realtime:
+            break
+
+        result = protocol.pull_many()
+
+        if result.is_err():
+            if "replay finished" in result.err().unwrap():
+                break
+
+            errors += 1
+
+        else:
+            frames += result.ok().unwrap().frames
+
+    elapsed = perf_counter() - start
+    replay.close()
+
+    print(f"{frames} frames in {elapsed:.3f} s: {frames / elapsed:,.0f} frames/s, errors {errors}, {replay.getStats()}")
+
+    for stats in protocol.getMetrics().getAll():
+        print(f"  {stats}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,48 @@
+from bytelang.impl.serializer.arraystring import ArrayStringSerializer
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.byte import ByteViewInputStream
+
+serializer = ArrayStringSerializer(32, cache_size=4)
+
+# Кодирование и чтение: дополнение нулями и обратно
+stream = ByteBufferOutputStream()
+serializer.write(stream, "Ход принят").unwrap()
+assert len(stream.buffer) == 32
+assert serializer.read(ByteViewInputStream(bytes(stream.buffer))).unwrap() == "Ход принят"
+
+# Постоянные ответы попадают в кэш со второго раза
+for _ in range(100):
+    for text in ("ok", "ход принят", "нет хода"):
+        serializer.encode_raw(text)
+
+stats = serializer.getCacheStats()
+assert stats.size == 3 and stats.getHitRate() > 0.9, stats
+
+# Поток разовых строк не вытесняет постоянные
+for i in range(1000):
+    serializer.encode_raw(f"игрок {i} вошёл")
+
+before = serializer.getCacheStats()
+
+for text in ("ok", "ход принят", "нет хода"):
+    serializer.encode_raw(text)
+
+after = serializer.getCacheStats()
+assert after.hits - before.hits == 3 and after.misses == before.misses, (before, after)
+assert after.size <= after.capacity
+
+# Вытесняется дольше всех не использованная строка, а не первая попавшая в кэш
+lru = ArrayStringSerializer(8, cache_size=2)
+
+for text in ("a", "a", "b", "b", "a", "c", "c"):
+    lru.encode_raw(text)
+
+hits = lru.getCacheStats().hits
+lru.encode_raw("a")
+assert lru.getCacheStats().hits == hits + 1, lru.getCacheStats()
+
+# Ошибки кодирования
+assert serializer.write(ByteBufferOutputStream(), "x" * 33).is_err()
+assert serializer.write(ByteBufferOutputStream(), None).is_err()
+
+print(f"arraystring ok: {after}")
@@ -0,0 +1,56 @@
+import asyncio
+
+from rs.result import ok
+from bytelang.core.asyncprotocol import AsyncProtocol
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.arraystring import ArrayStringSerializer
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.serializer.array_ import ArraySerializer
+from bytelang.impl.stream.asyncvirtual import AsyncVirtualStream
+
+
+async def _main() -> None:
+    host_stream, device_stream = AsyncVirtualStream.create_pair()
+
+    host = Protocol(host_stream.asStream(), u8, u8)
+    host.addReceiver(ArraySerializer(u8, 2), lambda move: ok(print(f"move {move}")), "move")
+    host.addReceiver(ArrayStringSerializer(32), lambda name: ok(print(f"name {name!r}")), "name")
+    reply = host.addSender(ArrayStringSerializer(32), "reply")
+
+    device = Protocol(device_stream.asStream(), u8, u8)
+    send_move = AsyncProtocol(device, device_stream).awaitable(device.addSender(ArraySerializer(u8, 2), "move"))
+    send_name = device.addSender(ArrayStringSerializer(32), "name")
+    device.addReceiver(ArrayStringSerializer(32), lambda text: ok(print(f"device got {text!r}")), "reply")
+
+    host_driver = AsyncProtocol(host, host_stream)
+    device_driver = AsyncProtocol(device, device_stream)
+
+    # Кадры из другого потока и из цикла событий
+    await asyncio.to_thread(send_name, "Игрок")
+    await send_move((3, 4))
+
+    received = 0
+
+    async for message in host_driver:
+        host_driver.handle(message).unwrap()
+        reply(f"ok {message.instruction.name}")
+        received += 1
+
+        if received == 2:
+            break
+
+    for _ in range(2):
+        device_driver.handle(await anext(device_driver)).unwrap()
+
+    # Кадры, разрезанные на мелкие куски: накопленный буфер сдвигается без потерь
+    split_driver = AsyncProtocol(host, host_stream, chunk_size=5)
+
+    for i in range(100):
+        await send_move((i, 255 - i))
+
+    for i in range(100):
+        message = await anext(split_driver)
+        assert message.value == [i, 255 - i], message
+
+
+asyncio.run(_main())
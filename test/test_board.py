@@ -0,0 +1,149 @@
+from random import Random
+from time import perf_counter
+
+from game.core.entities.board import Board
+from game.core.entities.board import Cell
+from game.core.entities.board import NeighborCounts
+from game.core.entities.mac import Mac
+from game.core.entities.player import Player
+from game.core.entities.player import Team
+from game.core.entities.player import TeamChange
+from game.core.entities.rules import ScoreRules
+from rs.lina.vector import Vector2D
+from rs.misc.color import Color
+from rs.misc.subject import Subject
+
+Mode = ScoreRules.CellLookupMode
+
+
+def _referenceScore(state: dict, rules: ScoreRules, player: Player, pos: Vector2D) -> int:
+    """Прежний подсчёт: перебор соседей через словарь клеток"""
+    offsets = list[tuple[int, int]]()
+
+    if Mode.Orthogonal in rules.mode:
+        offsets.extend(((1, 0), (-1, 0), (0, 1), (0, -1)))
+
+    if Mode.Diagonal in rules.mode:
+        offsets.extend(((1, 1), (1, -1), (-1, 1), (-1, -1)))
+
+    score = 0
+
+    for dx, dy in offsets:
+        other = state.get(Vector2D(pos.x + dx, pos.y + dy))
+
+        if other is None:
+            score += rules.empty_cell
+
+        elif other.team == player.team:
+            score += rules.friend_cell
+
+        else:
+            score += rules.enemy_cell
+
+    return score
+
+
+random = Random(1)
+rules = ScoreRules(mode=Mode.Orthogonal, empty_cell=10, friend_cell=50, enemy_cell=-25)
+board = Board(Vector2D(Board.max_size, Board.max_size), rules)
+
+teams = tuple(Team(f"team-{i}", Color.grey()) for i in range(4))
+players = tuple(Player(Mac(bytes((0, 0, 0, 0, 0, i))), f"p{i}") for i in range(16))
+
+for i, player in enumerate(players):
+    player.setTeam(teams[i % len(teams)])
+
+team_changes = list[TeamChange]()
+
+for team in teams:
+    team.subject_change.addListener(team_changes.append)
+
+reference = dict[Vector2D, Player]()
+expected = {player: 0 for player in players}
+
+for step in range(2000):
+    # Правила, команды и размер меняются посреди игры
+    if step % 97 == 0:
+        rules.mode = random.choice((Mode.Orthogonal, Mode.Diagonal, Mode.Full))
+
+    if step % 131 == 0:
+        random.choice(players).setTeam(random.choice(teams))
+
+    if step % 250 == 0:
+        board.size = Vector2D(random.randint(5, Board.max_size), random.randint(5, Board.max_size))
+
+    player = random.choice(players)
+    pos = Vector2D(random.randint(-1, Board.max_size), random.randint(-1, Board.max_size))
+
+    # Счёт хода для любой команды - из счётчиков соседей
+    probe = Vector2D(random.randrange(board.size.x), random.randrange(board.size.y))
+    prober = random.choice(players)
+    assert board.calcMoveScore(prober.team, probe) == _referenceScore(reference, rules, prober, probe), step
+    counts = board.getNeighborCounts(prober.team, probe)
+    assert counts.empty * rules.empty_cell + counts.friends * rules.friend_cell + counts.enemies * rules.enemy_cell == board.calcMoveScore(prober.team, probe)
+
+    result = board.makeMove(player, pos)
+
+    if not (0 <= pos.x < board.size.x and 0 <= pos.y < board.size.y):
+        assert result == Board.MakeMoveResult.OutOfBounds
+
+    elif pos in reference:
+        assert result == Board.MakeMoveResult.CellNotEmpty
+
+    else:
+        assert result == Board.MakeMoveResult.Ok
+        expected[player] += _referenceScore(reference, rules, player, pos)
+        reference[pos] = player
+
+    assert player.score == expected[player], (step, player.score, expected[player])
+
+state = board.getState()
+assert len(state) == len(reference)
+assert set(state) == set(reference)
+assert all(state[pos] == Cell(owner) for pos, owner in reference.items())
+assert state.get(Vector2D(-1, 0)) is None and Vector2D(Board.max_size, 0) not in state
+
+# Счёт команд ведётся приращениями и совпадает с суммой по участникам
+assert all(team.score == sum(p.score for p in team.players) for team in teams)
+assert all(c.attribute in (Team.Attribute.Score, Team.Attribute.Players) for c in team_changes)
+
+team_changes.clear()
+players[0].name = "renamed"
+assert len(team_changes) == 0
+
+board.reset()
+assert len(board.getState()) == 0
+
+# Смена команды и ход внутри batch: счётчики не ждут отложенного уведомления
+rules.mode = Mode.Orthogonal
+mover, neighbor = players[0], players[1]
+mover.setTeam(teams[0])
+neighbor.setTeam(teams[1])
+board.makeMove(mover, Vector2D(5, 5))
+board.makeMove(neighbor, Vector2D(7, 5))
+
+with Subject.batch():
+    mover.setTeam(teams[1])
+    board.makeMove(mover, Vector2D(6, 4))
+    assert board.getNeighborCounts(teams[1], Vector2D(6, 5)) == NeighborCounts(empty=1, friends=3, enemies=0)
+
+assert board.getNeighborCounts(teams[1], Vector2D(6, 5)) == NeighborCounts(empty=1, friends=3, enemies=0)
+assert board.getNeighborCounts(teams[0], Vector2D(6, 5)) == NeighborCounts(empty=1, friends=0, enemies=3)
+
+board.reset()
+print(f"board ok: {len(reference)} cells")
+
+# Замер: заполнение всего поля
+rules.mode = Mode.Full
+rounds = 200
+start = perf_counter()
+
+for _ in range(rounds):
+    board.reset()
+
+    for y in range(Board.max_size):
+        for x in range(Board.max_size):
+            board.makeMove(players[(x + y) % len(players)], Vector2D(x, y))
+
+elapsed = perf_counter() - start
+print(f"makeMove: {rounds * Board.max_size ** 2 / elapsed:,.0f} moves/s")
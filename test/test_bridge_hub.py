@@ -0,0 +1,149 @@
+from bytelang.core.protocol import Protocol
+from bytelang.exceptions import BytelangError
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.serializer.void import VoidSerializer
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.byte import ByteViewInputStream
+from bytelang.impl.stream.mock import MockStream
+from bytelang.impl.stream.virtual import VirtualStream
+from game.core.bridges import BridgeHub
+from game.core.entities.mac import Mac
+from game.core.environment import Environment
+from game.core.loop import EnvironmentLoop
+from game.core.protocol import GameProtocol
+from rs.result import ok
+from testenv import createRules
+
+env = Environment(createRules(win_line_length=5))
+
+
+class Bridge:
+    """Мост ESP32 с зеркальным GameProtocol набором инструкций"""
+
+    def __init__(self, stream: VirtualStream) -> None:
+        self.protocol = Protocol(stream, u8, u8)
+        self.send_mac = self.protocol.addSender(GameProtocol.mac, "read_mac")
+        self.protocol.addSender(GameProtocol.log_message, "read_log")
+        self.send_packet = self.protocol.addSender(GameProtocol.espnow_packet, "read_espnow_packet")
+
+        self.messages = list[tuple[Mac, str]]()
+        self.protocol.addReceiver(VoidSerializer(), lambda _: ok(None), "request_mac")
+        self.protocol.addReceiver(GameProtocol.espnow_packet, self._onPacket, "send_espnow_packet")
+
+    def _onPacket(self, packet: tuple[bytes, bytes]):
+        mac, data = packet
+        text = GameProtocol.log_message.read(ByteViewInputStream(data)).unwrap()
+        return ok(self.messages.append((Mac(bytes(mac)), text)))
+
+    def sendName(self, mac: Mac, name: str) -> None:
+        payload = ByteBufferOutputStream()
+        GameProtocol.player_message.write(payload, name).unwrap()
+        self.send_packet((mac.value, bytes(payload.buffer))).unwrap()
+
+    def receive(self) -> tuple[Mac, str]:
+        self.protocol.pull().unwrap()
+        return self.messages[-1]
+
+
+hub = BridgeHub(env)
+bridges = list[Bridge]()
+
+for i in range(3):
+    host_stream, device_stream = VirtualStream.create_pair(timeout=5.0)
+    hub.addBridge(host_stream)
+    bridges.append(Bridge(device_stream))
+
+errors = list[str]()
+hub.start()
+
+
+def handle(frames: int) -> None:
+    handled = 0
+
+    while handled < frames:
+        handled += hub.poll(errors.append, timeout=1.0)
+
+
+alice = Mac(bytes((2, 0, 0, 0, 0, 1)))
+bob = Mac(bytes((2, 0, 0, 0, 0, 2)))
+
+# Адрес хоста от каждого моста
+for i, bridge in enumerate(bridges):
+    bridge.send_mac(bytes((0x24, 0, 0, 0, 0, i))).unwrap()
+
+handle(3)
+assert env.host_mac is not None
+
+# Игроки на разных мостах: ответ уходит туда, откуда пришёл пакет
+bridges[0].sendName(alice, "Alice")
+bridges[1].sendName(bob, "Bob")
+handle(2)
+
+assert bridges[0].receive()[0] == alice
+assert bridges[1].receive()[0] == bob
+assert hub.getRoute(alice) is hub.getBridges()[0]
+
+# Сообщение окружения - через последний мост адресата
+env.protocol_message_sender(bob, "ход разрешён").unwrap()
+assert bridges[1].receive() == (bob, "ход разрешён")
+
+# Игрок перешёл к другому мосту
+bridges[2].sendName(alice, "Alice")
+handle(1)
+bridges[2].receive()
+
+env.protocol_message_sender(alice, "снова здесь").unwrap()
+assert bridges[2].receive() == (alice, "снова здесь")
+
+# Широковещательное сообщение - через все мосты
+env.protocol_message_sender(Mac.broadcast(), "всем").unwrap()
+assert all(bridge.receive() == (Mac.broadcast(), "всем") for bridge in bridges)
+
+hub.stop()
+
+print(f"routes ok, errors: {errors}")
+assert len(errors) == 0
+
+
+class _UnpluggedStream(MockStream):
+    """Порт пропал: каждое чтение - ошибка"""
+
+    def read_raw(self, size: int) -> bytes:
+        raise BytelangError("device unplugged")
+
+
+# Пропавший мост не крутит чтение вхолостую: пауза между ошибками и отключение после серии
+failing_hub = BridgeHub(env, retry_secs=0.001, max_failures=5)
+failing_hub.addBridge(_UnpluggedStream())
+failing_hub.start()
+
+failures = list[str]()
+
+while len(failures) < 5:
+    failing_hub.poll(failures.append, timeout=1.0)
+
+assert failing_hub.poll(failures.append, timeout=0.1) == 0 and len(failures) == 5, failures
+assert "отключён" in failures[-1], failures
+failing_hub.stop()
+
+# Кадры через единственного писателя окружения
+loop = EnvironmentLoop(env)
+loop.start()
+
+host_stream, device_stream = VirtualStream.create_pair(timeout=5.0)
+loop_hub = loop.call(lambda e: BridgeHub(e))
+loop.call(lambda _: loop_hub.addBridge(host_stream))
+device = Bridge(device_stream)
+loop_hub.runOn(loop, errors.append)
+
+carol = Mac(bytes((2, 0, 0, 0, 0, 3)))
+device.sendName(carol, "Carol")
+assert device.receive()[0] == carol
+
+assert loop.takeSnapshot().players[carol].name == "Carol"
+
+loop_hub.stop()
+loop.stop(timeout=5.0)
+
+print(f"loop routes ok, errors: {errors}")
+assert len(errors) == 0
@@ -0,0 +1,38 @@
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.serializer.struct_ import StructSerializer
+from bytelang.impl.serializer.bytearray_ import ByteArraySerializer
+from bytelang.impl.stream.buffered import BufferedStream
+from bytelang.impl.stream.virtual import VirtualStream
+
+
+class _CountingStream(VirtualStream):
+    """Считает обращения к источнику"""
+
+    calls = 0
+
+    def read_raw(self, size):
+        self.calls += 1
+        return super().read_raw(size)
+
+    def read_some_raw(self, max_size):
+        self.calls += 1
+        return super().read_some_raw(max_size)
+
+
+host, device = _CountingStream.create_pair()
+buffered = BufferedStream(host, capacity=64)
+
+status = StructSerializer((ByteArraySerializer(6), u8))
+frames = 20
+
+# Пачка кадров приходит разом, как сразу после разрешения ходов
+for i in range(frames):
+    device.write(bytes((0,)))
+    status.write(device, (bytes((0, 0, 0, 0, 0, i)), i % 2))
+
+for i in range(frames):
+    assert u8.read(buffered).unwrap() == 0
+    mac, ok = status.read(buffered).unwrap()
+    assert mac[-1] == i and ok == i % 2
+
+print(f"frames: {frames}, source calls: {host.calls}, buffered: {buffered.available()}")
@@ -0,0 +1,86 @@
+from array import array
+
+from bytelang.core.compiler import CompiledCodec
+from bytelang.impl.serializer.bulk import BulkArraySerializer
+from bytelang.impl.serializer.bulk import BulkVectorSerializer
+from bytelang.impl.serializer.primitive import f64
+from bytelang.impl.serializer.primitive import i16
+from bytelang.impl.serializer.primitive import i32
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.serializer.primitive import u16
+from bytelang.impl.serializer.vector import VectorSerializer
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.byte import ByteViewInputStream
+
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+
+def _roundTrip(serializer, value) -> tuple[bytes, object]:
+    """Записать значение и прочитать его обратно: напрямую и через скомпилированный кодек"""
+    out = ByteBufferOutputStream()
+    serializer.write(out, value).unwrap()
+    data = bytes(out.buffer)
+
+    codec = CompiledCodec.compile(serializer)
+    compiled = ByteBufferOutputStream()
+    assert codec.write_raw(compiled, value) == len(data)
+    assert bytes(compiled.buffer) == data
+
+    result = serializer.read(ByteViewInputStream(data)).unwrap()
+    assert list(codec.read_raw(ByteViewInputStream(data))) == list(result)
+    return data, result
+
+
+# Массив фиксированной длины: значения и байты совпадают с поэлементной записью
+cases = (
+    (BulkArraySerializer(u8, 400), bytes(range(200)) * 2),
+    (BulkArraySerializer(u16, 4), [0, 1, 0x1234, 0xFFFF]),
+    (BulkArraySerializer(i32, 3), [-2 ** 31, -1, 2 ** 31 - 1]),
+    (BulkArraySerializer(f64, 2), [1.5, -3.25]),
+    (BulkVectorSerializer(u16, u8), list(range(0, 65535, 257))),
+    (BulkVectorSerializer(i16, u8), [-32768, 0, 32767]),
+    (BulkVectorSerializer(u8, u8), []),
+)
+
+for serializer, value in cases:
+    data, result = _roundTrip(serializer, value)
+    assert isinstance(result, array), type(result)
+    assert list(result) == list(value), (serializer, result)
+
+# Формат тот же, что у поэлементного VectorSerializer
+values = list(range(255))
+bulk, _ = _roundTrip(BulkVectorSerializer(u16, u8), values)
+plain = ByteBufferOutputStream()
+VectorSerializer(u16, u8).write(plain, values).unwrap()
+assert bulk == bytes(plain.buffer)
+
+# Готовый array.array того же типа записывается без преобразования
+assert _roundTrip(BulkArraySerializer(u16, 3), array("H", (1, 2, 3)))[1] == array("H", (1, 2, 3))
+
+# Ошибки: длина массива, переполнение элемента, оборванный кадр
+assert BulkArraySerializer(u8, 4).write(ByteBufferOutputStream(), [1, 2, 3]).is_err()
+assert BulkArraySerializer(u8, 2).write(ByteBufferOutputStream(), [1, 256]).is_err()
+assert BulkVectorSerializer(u16, u8).read(ByteViewInputStream(bytes((3, 0, 0)))).is_err()
+
+if numpy is None:
+    print("bulk ok (numpy is not installed: numpy path skipped)")
+
+else:
+    for serializer, value in (
+            (BulkArraySerializer(u16, 4, use_numpy=True), numpy.array([0, 1, 0x1234, 0xFFFF], "<u2")),
+            (BulkArraySerializer(f64, 2, use_numpy=True), [1.5, -3.25]),
+            (BulkVectorSerializer(i16, u8, use_numpy=True), numpy.arange(-100, 100, dtype="<i2")),
+    ):
+        data, result = _roundTrip(serializer, value)
+        assert isinstance(result, numpy.ndarray), type(result)
+        assert numpy.array_equal(result, numpy.asarray(value)), (serializer, result)
+
+        # Байты совпадают с путём array.array
+        plain = type(serializer)(*(getattr(serializer, f) for f in ("item", "length")))
+        assert _roundTrip(plain, list(value))[0] == data
+
+    print("bulk ok (array and numpy)")
@@ -0,0 +1,101 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from time import sleep
+
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.stream.capture import CaptureDirection
+from bytelang.impl.stream.capture import CaptureReader
+from bytelang.impl.stream.capture import CaptureStream
+from bytelang.impl.stream.capture import ReplayStream
+from bytelang.impl.stream.virtual import VirtualStream
+from game.core.protocol import GameProtocol
+from rs.result import ok
+
+
+def _host(stream, received: list) -> Protocol:
+    host = Protocol(stream, u8, u8)
+    host.addReceiver(GameProtocol.espnow_packet, lambda packet: ok(received.append(bytes(packet[1]))), "read_espnow_packet")
+    return host
+
+
+with TemporaryDirectory() as folder:
+    path = Path(folder) / "game.blcap"
+
+    # Запись: мост шлёт пакеты с паузами, хост отвечает
+    host_stream, device_stream = VirtualStream.create_pair(timeout=1.0)
+    capture = CaptureStream(host_stream, path)
+
+    live = list[bytes]()
+    host = _host(capture, live)
+    reply = host.addSender(GameProtocol.espnow_packet, "send_espnow_packet")
+
+    device = Protocol(device_stream, u8, u8)
+    send_packet = device.addSender(GameProtocol.espnow_packet, "read_espnow_packet")
+
+    frames = 20
+    pause = 0.01
+
+    for i in range(frames):
+        send_packet((bytes(6), bytes((i,)) * (i % 5))).unwrap()
+        host.pull().unwrap()
+        reply((bytes(6), b"ok")).unwrap()
+        sleep(pause)
+
+    capture.close()
+
+    reader = CaptureReader(path)
+    summary = reader.getSummary()
+    print(summary)
+
+    assert summary.records == sum(1 for _ in reader.iterRecords())
+    assert summary.tx_bytes == frames * (1 + 6 + 1 + 2)
+    assert all(r.direction == CaptureDirection.TX for r in reader.iterRecords(CaptureDirection.TX))
+    reader.close()
+
+    # Обрезанный хвост (запись прервана) не мешает чтению
+    path.write_bytes(path.read_bytes() + b"\x00\x01")
+
+    # Воспроизведение с наибольшей скоростью
+    replayed = list[bytes]()
+    replay = ReplayStream(path)
+    host = _host(replay, replayed)
+
+    while replay.available() > 0:
+        host.pull_many().unwrap()
+
+    print(replay.getStats())
+    assert replayed == live
+    assert host.pull().is_err()
+    replay.close()
+
+    # Воспроизведение в исходном темпе (вдвое быстрее)
+    replayed.clear()
+    replay = ReplayStream(path, realtime=True, speed=2.0)
+    host = _host(replay, replayed)
+
+    start = perf_counter()
+
+    for _ in range(frames):
+        host.pull().unwrap()
+
+    elapsed = perf_counter() - start
+    print(f"realtime x2: {elapsed:.3f} s, {replay.getStats()}")
+
+    assert replayed == live
+    assert elapsed >= (frames - 1) * pause / 2 * 0.9
+    replay.close()
+
+    # Затихший обмен всё равно попадает в файл: сброс по таймеру, а не по следующей записи
+    quiet_path = Path(folder) / "quiet.blcap"
+    host_stream, device_stream = VirtualStream.create_pair(timeout=1.0)
+    capture = CaptureStream(host_stream, quiet_path, flush_secs=0.02)
+
+    capture.write_raw(b"last words")
+    sleep(0.2)
+
+    reader = CaptureReader(quiet_path)
+    assert reader.getSummary().tx_bytes == len(b"last words")
+    reader.close()
+    capture.close()
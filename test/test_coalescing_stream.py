@@ -0,0 +1,81 @@
+from threading import Event
+
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.stream.coalescing import CoalescingStream
+from bytelang.impl.stream.mock import MockStream
+
+
+class _RecordingStream(MockStream):
+    """Запоминает записи; запись может упасть или ждать разрешения"""
+
+    def __init__(self) -> None:
+        self.writes = list[bytes]()
+        self.fail_next = False
+        self.release = Event()
+        self.release.set()
+
+    def write_raw(self, data: bytes) -> None:
+        self.release.wait()
+
+        if self.fail_next:
+            self.fail_next = False
+            raise OSError("device unplugged")
+
+        self.writes.append(bytes(data))
+
+
+sink = _RecordingStream()
+errors = list[str]()
+stream = CoalescingStream(sink, latency_secs=0.05, max_batch_bytes=1024, on_error=errors.append)
+
+# Кадры, поставленные в пределах задержки, уходят одной записью
+sink.release.clear()
+
+for i in range(10):
+    u8.write(stream, i)
+
+sink.release.set()
+stream.flush()
+
+assert b"".join(sink.writes) == bytes(range(10)), sink.writes
+assert len(sink.writes) == 1, sink.writes
+stats = stream.getStats()
+assert stats.frames == 10 and stats.flushes == 1 and stats.pending_bytes == 0, stats
+
+# Недописанный кадр не попадает в поток
+try:
+    with stream.frame() as out:
+        out.write_raw(b"\xff")
+        raise ValueError("serialize error")
+
+except ValueError:
+    pass
+
+stream.flush()
+assert b"\xff" not in b"".join(sink.writes)
+
+# Ошибка записи (не BytelangError) не останавливает писателя и не вешает flush
+sink.fail_next = True
+u8.write(stream, 100)
+stream.flush()
+
+assert len(errors) == 1 and "device unplugged" in errors[0], errors
+assert stream.getStats().errors == 1
+
+u8.write(stream, 101)
+stream.flush()
+assert sink.writes[-1] == bytes((101,)), sink.writes
+
+# close записывает остаток очереди
+u8.write(stream, 102)
+stream.close()
+assert sink.writes[-1] == bytes((102,)), sink.writes
+
+try:
+    u8.write(stream, 103)
+    raise AssertionError("closed stream accepted a frame")
+
+except Exception as e:
+    assert "closed" in str(e), e
+
+print(f"coalescing ok: {stream.getStats()}")
@@ -0,0 +1,142 @@
+from random import Random
+from threading import Thread
+from time import perf_counter
+
+from game.core.entities.board import Board
+from game.core.entities.mac import Mac
+from game.core.entities.rules import ScoreRules
+from game.core.environment import Environment
+from game.core.loop import EnvironmentLoop
+from game.core.loop import EnvironmentSnapshot
+from rs.lina.vector import Vector2D
+from testenv import createRules
+
+loop = EnvironmentLoop(Environment(createRules(ScoreRules.CellLookupMode.Full)), snapshot_secs=0.01)
+
+loop.start()
+
+_WRITERS = 4
+_PLAYERS = 8
+_MOVES = 2000
+
+
+def _register(env: Environment) -> None:
+    teams = tuple(env.team_registry.register() for _ in range(3))
+
+    for i in range(_WRITERS * _PLAYERS):
+        mac = Mac(bytes((0, 0, 0, 0, 0, i)))
+        env.onPlayerMessage(mac, f"p{i}")
+        env.player_registry.getAll()[mac].setTeam(teams[i % len(teams)])
+
+
+loop.call(_register)
+
+
+def _writer(index: int) -> None:
+    random = Random(index)
+
+    for _ in range(_MOVES):
+        mac = Mac(bytes((0, 0, 0, 0, 0, index * _PLAYERS + random.randrange(_PLAYERS))))
+        pos = Vector2D(random.randrange(Board.max_size), random.randrange(Board.max_size))
+        loop.submit(lambda env: env.onPlayerMove(mac, pos))
+
+        # Изменения правил из другого потока - тоже командами
+        if random.random() < 0.01:
+            loop.submit(lambda env: env.board.reset())
+
+
+snapshots = list[EnvironmentSnapshot]()
+
+
+def _reader(until: list[bool]) -> None:
+    while not until:
+        snapshot = loop.getSnapshot()
+
+        if len(snapshots) == 0 or snapshots[-1] is not snapshot:
+            snapshots.append(snapshot)
+
+
+def _check(snapshot: EnvironmentSnapshot) -> None:
+    """Снимок согласован: счёт команд равен сумме счёта её игроков"""
+    for team in snapshot.teams.values():
+        assert team.score == sum(p.score for p in snapshot.players.values() if p.team is team.team), snapshot.version
+
+
+done = list[bool]()
+reader = Thread(target=_reader, args=(done,))
+writers = tuple(Thread(target=_writer, args=(i,)) for i in range(_WRITERS))
+
+start = perf_counter()
+reader.start()
+
+for thread in writers:
+    thread.start()
+
+for thread in writers:
+    thread.join()
+
+loop.call(lambda _: None)
+elapsed = perf_counter() - start
+done.append(True)
+reader.join()
+
+loop.stop(timeout=5.0)
+
+versions = tuple(s.version for s in snapshots)
+assert versions == tuple(sorted(versions)), "versions must grow"
+
+for snapshot in snapshots:
+    _check(snapshot)
+
+final = loop.getSnapshot()
+_check(final)
+assert final.version == loop.getVersion()
+assert len(final.cells) == len(loop.env.board.getState())
+assert all(final.cells[pos] == cell.owner.mac for pos, cell in loop.env.board.getState().items())
+
+print(
+    f"loop ok: {_WRITERS * _MOVES / elapsed:,.0f} commands/s, "
+    f"{len(snapshots)} snapshots, version {final.version}, {len(final.cells)} cells"
+)
+
+# Публикация пересобирает только изменившееся: неизменные коллекции снимка общие
+big = EnvironmentLoop(loop.env)
+big.start()
+
+
+def _registerMany(env: Environment) -> None:
+    team = env.team_registry.register()
+
+    for i in range(10_000):
+        mac = Mac(i.to_bytes(6, "big"))
+        env.onPlayerMessage(mac, f"bulk-{i}")
+        env.player_registry.getAll()[mac].setTeam(team)
+
+
+big.call(_registerMany)
+before = big.takeSnapshot()
+first_mac = Mac((0).to_bytes(6, "big"))
+big.call(lambda env: env.onPlayerMessage(first_mac, "renamed"))
+after = big.takeSnapshot()
+
+assert after.players[first_mac].name == "renamed" and before.players[first_mac].name != "renamed"
+assert after.teams is before.teams and after.cells is before.cells
+
+rounds = 200
+start = perf_counter()
+
+for i in range(rounds):
+    big.call(lambda env: env.onPlayerMessage(first_mac, f"renamed-{i}"))
+    assert big.takeSnapshot().players[first_mac].name == f"renamed-{i}"
+
+published = (perf_counter() - start) / rounds
+big.stop(timeout=5.0)
+
+# Остановка из команды (поток владельца) не ждёт сам себя
+big = EnvironmentLoop(loop.env)
+big.start()
+big.call(lambda _: big.stop())
+big._thread.join(timeout=5.0)
+assert not big._thread.is_alive()
+
+print(f"publish with {len(after.players)} players: {published * 1e3:.3f} ms per command and snapshot read")
@@ -0,0 +1,99 @@
+from binascii import crc_hqx
+from random import Random
+
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.stream.byte import ByteBufferOutputStream
+from bytelang.impl.stream.coalescing import CoalescingStream
+from bytelang.impl.stream.framed import FramedStream
+from bytelang.impl.stream.framed import cobsDecode
+from bytelang.impl.stream.framed import cobsEncode
+from bytelang.impl.stream.virtual import VirtualStream
+from game.core.protocol import GameProtocol
+from rs.result import ok
+
+random = Random(1)
+
+# COBS: нулей в кодировке нет, раскодирование обратно кодированию (в т.ч. блоки по 254 байта)
+for size in (*range(600), 1000):
+    data = bytes(random.choice((0, 0xFF, random.randrange(256))) for _ in range(size))
+    encoded = cobsEncode(data)
+
+    assert 0 not in encoded
+    assert cobsDecode(encoded) == data
+
+# Кадры моста пишутся в память, на "линии" портятся и теряются байты
+wire = ByteBufferOutputStream()
+bridge = Protocol(FramedStream(wire), u8, u8)
+send_packet = bridge.addSender(GameProtocol.espnow_packet, "read_espnow_packet")
+
+frames = 1000
+
+for i in range(frames):
+    send_packet((bytes(6), bytes((i % 256,)) * (i % 40))).unwrap()
+
+noisy = bytearray(wire.buffer)
+corruptions = 50
+
+for _ in range(corruptions):
+    index = random.randrange(len(noisy))
+
+    if random.random() < 0.5:
+        del noisy[index]
+
+    else:
+        noisy[index] ^= 0x5A
+
+host_stream, line = VirtualStream.create_pair(timeout=0.5)
+line.write_raw(bytes(noisy))
+
+framed = FramedStream(host_stream)
+host = Protocol(framed, u8, u8)
+
+received = list[bytes]()
+host.addReceiver(GameProtocol.espnow_packet, lambda packet: ok(received.append(packet[1])), "read_espnow_packet")
+
+while framed.available() > 0:
+    host.pull_many().unwrap()
+
+stats = framed.getStats()
+print(f"received {len(received)}/{frames}, {stats}")
+
+# Каждое повреждение стоит не больше двух кадров (если задет разделитель), а не всего хвоста
+assert len(received) >= frames - 2 * corruptions
+assert stats.bad_frames <= corruptions
+assert all(data == bytes((data[0],)) * len(data) for data in received if len(data) > 0)
+
+# Хвост целого кадра после разобранной инструкции отбрасывается, а не читается как следующий код
+host_stream, line = VirtualStream.create_pair(timeout=0.5)
+framed = FramedStream(host_stream)
+coalesced = CoalescingStream(framed)
+host = Protocol(coalesced, u8, u8)
+
+acks = list[int]()
+host.addReceiver(u8, lambda value: ok(acks.append(value)), "ack")
+
+for payload in (bytes((0, 7, 0xEE)), bytes((0, 8))):
+    line.write_raw(cobsEncode(payload + crc_hqx(payload, 0xFFFF).to_bytes(2, "big")) + b"\x00")
+
+assert host.pull().is_ok()
+assert host.pull().is_ok()
+assert acks == [7, 8]
+
+stats = framed.getStats()
+assert stats.bad_frames == 0, stats
+assert stats.discarded_bytes == 1, stats
+
+# Ошибка разбора выравнивает поток и через обёртку: остаток кадра отбрасывается целиком
+for payload in (bytes((0xEE, 1, 2)), bytes((0, 9))):
+    line.write_raw(cobsEncode(payload + crc_hqx(payload, 0xFFFF).to_bytes(2, "big")) + b"\x00")
+
+assert host.pull().is_err()
+assert host.pull().is_ok()
+assert acks == [7, 8, 9]
+
+stats = framed.getStats()
+assert stats.bad_frames == 1, stats
+assert stats.discarded_bytes == 3, stats
+
+coalesced.close()
@@ -0,0 +1,85 @@
+from game.core.entities.mac import Mac
+from game.core.entities.player import Player
+from game.core.entities.player import Team
+from game.core.entities.player import TeamChange
+from rs.misc.color import Color
+from rs.misc.subject import Subject
+
+# Отложенная доставка, объединение одинаковых и порядок
+first = Subject[int]()
+second = Subject[list]()
+got = list()
+first.addListener(lambda v: got.append(("first", v)))
+second.addListener(lambda v: got.append(("second", v)))
+
+with Subject.batch():
+    first.notify(1)
+    second.notify([1])
+    first.notify(2)
+
+    with Subject.batch():
+        first.notify(1)
+
+    second.notify([1])
+    assert got == []
+
+assert got == [("first", 1), ("second", [1]), ("first", 2), ("second", [1])], got
+
+# Уведомления доставки объединяются с ещё не доставленными
+team = Team("team", Color.grey())
+players = tuple(Player(Mac(bytes((0, 0, 0, 0, 0, i))), f"p{i}") for i in range(10))
+changes = list[TeamChange]()
+team.subject_change.addListener(changes.append)
+
+with Subject.batch():
+    for player in players:
+        player.setTeam(team)
+
+    for i, player in enumerate(players):
+        player.score = i
+        player.score += 100
+
+assert team.score == sum(p.score for p in players) == 45 + 1000, team.score
+assert [c.attribute for c in changes] == [Team.Attribute.Players, Team.Attribute.Score], changes
+
+# Исключение внутри транзакции не теряет уведомления
+got.clear()
+
+try:
+    with Subject.batch():
+        first.notify(3)
+        raise ValueError
+
+except ValueError:
+    pass
+
+assert got == [("first", 3)]
+first.notify(4)
+assert got == [("first", 3), ("first", 4)]
+
+# Исключение наблюдателя не теряет остальные уведомления: выбрасывается первое после доставки
+def fail(value: int) -> None:
+    raise RuntimeError(value)
+
+
+failing = Subject[int]()
+failing.addListener(fail)
+got.clear()
+
+try:
+    with Subject.batch():
+        failing.notify(5)
+        first.notify(5)
+        failing.notify(6)
+        first.notify(6)
+
+    assert False, "batch must re-raise"
+
+except RuntimeError as e:
+    assert e.args == (5,), e
+
+assert got == [("first", 5), ("first", 6)], got
+first.notify(7)
+assert got[-1] == ("first", 7)
+
+print("subject ok")
@@ -0,0 +1,103 @@
+from random import Random
+from time import perf_counter
+from typing import Optional
+
+from game.core.entities.player import Team
+from game.core.entities.victory import VictoryDetector
+from rs.lina.vector import Vector2D
+from rs.misc.color import Color
+
+
+def _referenceWinner(cells: dict[tuple[int, int], Team], line_length: int) -> Optional[Team]:
+    """Прежний способ: полный перебор поля"""
+    for (x, y), team in cells.items():
+        for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            if all(cells.get((x + i * dx, y + i * dy)) is team for i in range(line_length)):
+                return team
+
+    return None
+
+
+random = Random(2)
+teams = tuple(Team(f"team-{i}", Color.grey()) for i in range(3))
+
+wins = 0
+
+for game in range(300):
+    line_length = random.randint(3, 5)
+    size = random.randint(line_length, 12)
+    detector = VictoryDetector(line_length)
+    events = list()
+    detector.victory_subject.addListener(events.append)
+
+    cells = dict[tuple[int, int], Team]()
+    free = [(x, y) for x in range(size) for y in range(size)]
+    random.shuffle(free)
+
+    for x, y in free:
+        team = random.choice(teams)
+        cells[x, y] = team
+
+        # Смена команды владельца: пересчёт по всему полю
+        if random.random() < 0.02:
+            changed = random.choice(tuple(cells))
+            cells[changed] = random.choice(teams)
+            victory = detector.rebuild((Vector2D(*pos), t) for pos, t in cells.items())
+
+        else:
+            victory = detector.place(Vector2D(x, y), team)
+
+        winner = _referenceWinner(cells, line_length)
+        assert (victory is None) == (winner is None), (game, x, y)
+
+        if victory is not None:
+            assert len(victory.line) >= line_length
+            assert all(cells[p.x, p.y] is victory.team for p in victory.line)
+            assert events == [victory]
+
+            # Заморожен до сброса
+            assert detector.place(Vector2D(-5, -5), teams[0]) is victory and len(events) == 1
+            wins += 1
+            break
+
+# Ход, уже учтённый пересчётом (отложенное уведомление), не удлиняет серию
+detector = VictoryDetector(3)
+detector.place(Vector2D(0, 0), teams[0])
+detector.rebuild(((Vector2D(0, 0), teams[0]), (Vector2D(1, 0), teams[0])))
+assert detector.place(Vector2D(1, 0), teams[0]) is None and detector.getVictory() is None
+assert detector.place(Vector2D(2, 0), teams[0]) is not None
+
+# Игроки без команды линий не образуют
+detector = VictoryDetector(3)
+detector.rebuild((Vector2D(x, 0), Team.default()) for x in range(3))
+assert detector.getVictory() is None
+
+# Укороченная линия сразу проверяется по уже собранным сериям
+detector = VictoryDetector(5)
+
+for pos in ((0, 0), (1, 1), (2, 2), (3, 3)):
+    detector.place(Vector2D(*pos), teams[1])
+
+assert detector.setLineLength(5) is None
+victory = detector.setLineLength(4)
+assert victory is not None and victory.team is teams[1] and victory.line == tuple(Vector2D(i, i) for i in range(4))
+
+print(f"victory ok: {wins} wins")
+
+# Замер: разреженные ходы на поле 100000 x 100000 и линия в конце
+detector = VictoryDetector(10)
+moves = 200_000
+positions = [Vector2D(random.randrange(100_000), random.randrange(100_000)) for _ in range(moves)]
+
+start = perf_counter()
+
+for i, pos in enumerate(positions):
+    detector.place(pos, teams[i % len(teams)])
+
+elapsed = perf_counter() - start
+
+for x in range(10):
+    detector.place(Vector2D(-1000 + x, -1000), teams[0])
+
+assert detector.getVictory() is not None and len(detector.getVictory().line) == 10
+print(f"place: {moves / elapsed:,.0f} moves/s")
@@ -0,0 +1,60 @@
+from threading import Thread
+from time import perf_counter
+
+from bytelang.core.protocol import Protocol
+from bytelang.impl.serializer.primitive import u8
+from bytelang.impl.stream.virtual import VirtualStream
+from game.core.protocol import GameProtocol
+from rs.result import ok
+
+frames = 50_000
+
+# Маленький буфер: мост обгоняет хост и упирается в обратное давление
+host_stream, device_stream = VirtualStream.create_pair(capacity=1024, timeout=5.0)
+
+host = Protocol(host_stream, u8, u8)
+device = Protocol(device_stream, u8, u8)
+
+received = list[bytes]()
+
+host.addReceiver(GameProtocol.espnow_packet, lambda packet: ok(received.append(packet[1])), "read_espnow_packet")
+send_packet = device.addSender(GameProtocol.espnow_packet, "read_espnow_packet")
+
+
+def _bridge():
+    for i in range(frames):
+        send_packet((bytes(6), bytes((i % 256, i // 256 % 256)))).unwrap()
+
+
+bridge = Thread(target=_bridge)
+start = perf_counter()
+bridge.start()
+
+while len(received) < frames:
+    host.pull_many().unwrap()
+
+elapsed = perf_counter() - start
+bridge.join()
+
+# Порядок и содержимое кадров не нарушены
+assert all(data == bytes((i % 256, i // 256 % 256)) for i, data in enumerate(received))
+
+stats = host_stream.getRxStats()
+print(f"{frames / elapsed:,.0f} frames/sec, {stats}")
+
+assert stats.high_water <= stats.capacity
+# Код + mac + длина + 2 байта нагрузки
+assert stats.total_bytes == frames * 10
+assert host_stream.read_available(16) == b""
+
+# Счётчики метрик ведутся всегда, замеры времени - только после включения
+metrics = host.getMetrics().getStats("read_espnow_packet")
+assert metrics.frames_in == frames and metrics.bytes_in == frames * 10, metrics
+assert metrics.decode.count == 0 and metrics.handler.count == 0, metrics
+
+host.getMetrics().timings = True
+send_packet((bytes(6), bytes(2))).unwrap()
+host.pull().unwrap()
+
+metrics = host.getMetrics().getStats("read_espnow_packet")
+assert metrics.decode.count == 1 and metrics.handler.count == 1, metrics
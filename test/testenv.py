@@ -0,0 +1,57 @@
+"""Общие правила и окружения для тестов и замеров (запуск из корня репозитория)"""
+
+from pathlib import Path
+
+from game.core.entities.board import Board
+from game.core.entities.mac import Mac
+from game.core.entities.rules import GameRules
+from game.core.entities.rules import ScoreRules
+from game.core.environment import Environment
+from game.impl.valuegen.color import ColorGenerator
+from game.impl.valuegen.loopstep import RingStepGenerator
+from game.impl.valuegen.phasedamplitude import PhasedAmplitudeGenerator
+from game.impl.valuegen.teamname import TeamNameGenerator
+
+
+def createRules(
+        mode: ScoreRules.CellLookupMode = ScoreRules.CellLookupMode.Orthogonal,
+        *,
+        win_line_length: int = Board.max_size + 1
+) -> GameRules:
+    """Правила без кул-дауна; по умолчанию линия победы длиннее поля - игра не завершается"""
+    return GameRules(
+        score=ScoreRules(mode=mode, empty_cell=10, friend_cell=50, enemy_cell=-25),
+        team_color_generator=ColorGenerator(
+            hue=RingStepGenerator(start=15, step=200, loop=360),
+            saturation=PhasedAmplitudeGenerator(scale=1.618, base=0.7, amplitude=0.2),
+            light=PhasedAmplitudeGenerator(scale=0.618, base=0.6, amplitude=0.2)
+        ),
+        team_name_generator=TeamNameGenerator(team_name_folder=Path("res/texts/team-name")),
+        move_cooldown_secs=0.0,
+        move_available=True,
+        win_line_length=win_line_length,
+    )
+
+
+class TeamedEnvironment(Environment):
+    """Окружение, раскладывающее новых игроков по командам, чтобы ходы доходили до доски"""
+
+    def onPlayerMessage(self, mac: Mac, message: str) -> str:
+        result = super().onPlayerMessage(mac, message)
+        player = self.player_registry.getAll().get(mac)
+
+        if player is not None and player.team == player.team.default():
+            teams = tuple(self.team_registry.getAll())
+            player.setTeam(teams[hash(mac.value) % len(teams)])
+
+        return result
+
+
+def createTeamedEnvironment(teams: int = 8) -> Environment:
+    """TeamedEnvironment с зарегистрированными командами"""
+    env = TeamedEnvironment(createRules())
+
+    for _ in range(teams):
+        env.team_registry.register()
+
+    return env